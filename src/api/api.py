@@ -1,29 +1,49 @@
 import uvicorn
 import os
+import asyncio
+import json
 import threading
-from fastapi import APIRouter, FastAPI, Depends, HTTPException
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from email.utils import formatdate
+from functools import partial
+from typing import Annotated, Any, Callable, Literal, Optional
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
 from src.utils.hub_client import init_hub_client_with_client, get_node_id_by_client
 from src.utils.other import extract_hub_envs
-from src.api.oauth import valid_access_token
+from src.api.oauth import valid_access_token, get_token_cache_stats
+from src.api.status_stream import StatusBroadcaster, format_sse
+from src.api.operations import OperationTracker
+from src.api.responses import encode_json
 from src.resources.database.entity import Database
-from src.resources.analysis.entity import CreateAnalysis
-from src.resources.log.entity import CreateLogEntity, AnalysisStoppedLog
+from src.resources.analysis.entity import AnalysisQuery, CreateAnalysis, HistoryQuery
+from src.resources.log.entity import CreateLogEntity, AnalysisStoppedLog, LogQuery
+from src.resources.log.progress_buffer import ProgressBuffer
 from src.resources.utils import (create_analysis,
+                                 create_analyses,
                                  retrieve_history,
                                  retrieve_logs,
+                                 open_log_stream,
                                  get_status_and_progress,
                                  get_pods,
                                  stop_analysis,
                                  delete_analysis,
                                  cleanup,
-                                 stream_logs)
+                                 stream_logs,
+                                 stream_logs_batch)
 from src.utils.po_logging import get_logger
 
 logger = get_logger()
 
+_LOG_BATCH_MAX_SIZE = int(os.getenv('PO_LOG_BATCH_MAX_SIZE', '10000'))  # Max. number of log entities per batch
+_log_batch_adapter = TypeAdapter(list[CreateLogEntity])
+
+
 class PodOrchestrationAPI:
     """FastAPI application exposing the Pod Orchestration REST endpoints.
 
@@ -38,6 +58,20 @@ class PodOrchestrationAPI:
         node_id: This node's id in the FLAME Hub, resolved from the client id.
         enable_hub_logging: Whether logs are forwarded to the Hub.
         namespace: Kubernetes namespace the API operates within.
+        k8s_executor: Bounded thread pool for blocking orchestration work
+            (Kubernetes SDK, Keycloak).
+        db_executor: Bounded thread pool for blocking database-bound work
+            (SQLAlchemy, Hub status updates).
+        log_stream_executor: Bounded thread pool reading streamed pod logs;
+            its size caps the number of concurrent log streams.
+        boot_id: Random per-process nonce, part of every status ETag so that
+            state versions from before a restart never match.
+        status_broadcaster: Fan-out of database status/progress transitions
+            to ``/po/status/stream`` subscribers.
+        operation_tracker: Bounded background pool running stop/delete
+            requests, queried via ``/po/operations/{operation_id}``.
+        progress_buffer: Write-behind buffer coalescing the status/progress
+            reported with streamed logs; flushed on shutdown.
     """
 
     def __init__(self, database: Database, namespace: str = 'default'):
@@ -60,10 +94,34 @@ class PodOrchestrationAPI:
                                                           https_proxy)
         self.node_id = get_node_id_by_client(self.hub_client, client_id) if self.hub_client else None
         self.namespace = namespace
+
+        # separate bounded pools, so slow cluster operations cannot starve database reads (and vice versa),
+        # while cheap handlers like /po/healthz run directly on the event loop
+        self.k8s_executor = ThreadPoolExecutor(max_workers=int(os.getenv('PO_K8S_WORKERS', '8')),
+                                               thread_name_prefix='po-k8s')
+        self.db_executor = ThreadPoolExecutor(max_workers=int(os.getenv('PO_DB_WORKERS', '8')),
+                                              thread_name_prefix='po-db')
+        # log streams block a thread for as long as they are followed, so they get a pool of their own
+        self.log_stream_executor = ThreadPoolExecutor(max_workers=int(os.getenv('PO_LOG_STREAM_WORKERS', '16')),
+                                                      thread_name_prefix='po-logs')
+        self.boot_id = uuid.uuid4().hex[:12]
+        self.status_broadcaster = StatusBroadcaster()
+        self.database.add_status_listener(self.status_broadcaster.publish)
+        self.database.add_change_listener(self._publish_change)
+        self.operation_tracker = OperationTracker()
+        self.progress_buffer = ProgressBuffer(self.database, self.hub_client, self.node_id)
+        self.progress_buffer.start()
+
+        @asynccontextmanager
+        async def lifespan(_: FastAPI):
+            yield
+            self.progress_buffer.stop()
+
         app = FastAPI(title="FLAME PO",
                       docs_url="/api/docs",
                       redoc_url="/api/redoc",
-                      openapi_url="/api/v1/openapi.json")
+                      openapi_url="/api/v1/openapi.json",
+                      lifespan=lifespan)
 
         origins = [
             "http://localhost:8080",
@@ -82,6 +140,11 @@ class PodOrchestrationAPI:
                              dependencies=[Depends(valid_access_token)],
                              methods=["POST"],
                              response_class=JSONResponse)
+        router.add_api_route("/batch",
+                             self.create_analyses_call,
+                             dependencies=[Depends(valid_access_token)],
+                             methods=["POST"],
+                             response_class=JSONResponse)
         router.add_api_route("/history",
                              self.retrieve_all_history_call,
                              dependencies=[Depends(valid_access_token)],
@@ -107,6 +170,11 @@ class PodOrchestrationAPI:
                              dependencies=[Depends(valid_access_token)],
                              methods=["GET"],
                              response_class=JSONResponse)
+        router.add_api_route("/status/stream",
+                             self.stream_status_call,
+                             dependencies=[Depends(valid_access_token)],
+                             methods=["GET"],
+                             response_class=StreamingResponse)
         router.add_api_route("/status/{analysis_id}",
                              self.get_status_and_progress_call,
                              dependencies=[Depends(valid_access_token)],
@@ -142,6 +210,11 @@ class PodOrchestrationAPI:
                              dependencies=[Depends(valid_access_token)],
                              methods=["DELETE"],
                              response_class=JSONResponse)
+        router.add_api_route("/operations/{operation_id}",
+                             self.get_operation_call,
+                             dependencies=[Depends(valid_access_token)],
+                             methods=["GET"],
+                             response_class=JSONResponse)
         router.add_api_route("/cleanup/{cleanup_type}",
                              self.cleanup_call,
                              dependencies=[Depends(valid_access_token)],
@@ -152,6 +225,16 @@ class PodOrchestrationAPI:
                              dependencies=[Depends(valid_access_token)],
                              methods=["POST"],
                              response_class=JSONResponse)
+        router.add_api_route("/stream_logs/batch",
+                             self.stream_logs_batch_call,
+                             dependencies=[Depends(valid_access_token)],
+                             methods=["POST"],
+                             response_class=JSONResponse)
+        router.add_api_route("/metrics",
+                             self.metrics_call,
+                             dependencies=[Depends(valid_access_token)],
+                             methods=["GET"],
+                             response_class=JSONResponse)
         router.add_api_route("/healthz",
                              self.health_call,
                              methods=["GET"],
@@ -164,7 +247,146 @@ class PodOrchestrationAPI:
 
         uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
 
-    def create_analysis_call(self, body: CreateAnalysis):
+    async def _run_blocking(self, executor: ThreadPoolExecutor, func: Callable, *args) -> Any:
+        """Run a blocking call in one of the bounded executors without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args))
+
+    def _publish_change(self, analysis_id: str, operation: str) -> None:
+        """Change listener: broadcast the latest status/progress of a changed analysis to stream subscribers,
+        and let the broadcaster forget analyses that were deleted or archived.
+        """
+        if (operation != 'DELETE') and (self.status_broadcaster.subscriber_count() == 0):
+            return
+        deployment = self.database.get_latest_deployment_summary(analysis_id)
+        if deployment is None:
+            self.status_broadcaster.forget(analysis_id)
+        else:
+            self.status_broadcaster.publish(deployment.analysis_id, deployment.status, deployment.progress)
+
+    def _state_validators(self) -> dict[str, str]:
+        """Return the ``ETag``/``Last-Modified`` headers for the current database state version."""
+        version, changed_at = self.database.get_state_version()
+        return {'ETag': f'"{self.boot_id}-{version}"',
+                'Last-Modified': formatdate(changed_at, usegmt=True),
+                'Cache-Control': 'no-cache'}
+
+    async def _conditional_status(self,
+                                  request: Request,
+                                  analysis_id_str: str,
+                                  query: Optional[AnalysisQuery] = None) -> Response:
+        """Answer a status request, short-circuiting with ``304`` if the client's ETag is current.
+
+        The validators are read before the status is aggregated, so a write racing
+        the aggregation only ever makes the returned ETag stale (forcing a refetch),
+        never newer than the body.
+        """
+        headers = self._state_validators()
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            if '*' in candidates or headers['ETag'] in candidates:
+                return Response(status_code=304, headers=headers)
+
+        args = (analysis_id_str, self.database) if query is None else (analysis_id_str, self.database, query)
+        content = await self._run_blocking(self.db_executor, get_status_and_progress, *args)
+        return JSONResponse(content=content, headers=headers)
+
+    async def _stream_pod_log(self,
+                              analysis_id: str,
+                              source: str,
+                              follow: bool,
+                              tail: Optional[int],
+                              since_seconds: Optional[int]) -> StreamingResponse:
+        """Stream one pod log chunk by chunk, reading it on the log stream executor."""
+        try:
+            log_stream = await self._run_blocking(self.k8s_executor,
+                                                  open_log_stream,
+                                                  analysis_id,
+                                                  self.database,
+                                                  source,
+                                                  follow,
+                                                  tail,
+                                                  since_seconds)
+        except Exception as e:
+            logger.error(f"Error opening log stream: {repr(e)}")
+            raise HTTPException(status_code=500, detail=f"Error opening log stream (see po logs).")
+        if log_stream is None:
+            raise HTTPException(status_code=404, detail=f"No pod found to stream logs of analysis {analysis_id}.")
+
+        async def chunks():
+            iterator = iter(log_stream)
+            try:
+                while (chunk := await self._run_blocking(self.log_stream_executor, next, iterator, None)) is not None:
+                    yield chunk
+            finally:
+                # unblocks a worker still waiting for new lines if the client went away
+                log_stream.close()
+
+        return StreamingResponse(chunks(), media_type="text/plain; charset=utf-8")
+
+    async def _encoded_json(self,
+                            request: Request,
+                            executor: ThreadPoolExecutor,
+                            func: Callable,
+                            *args) -> Response:
+        """Fetch ``func(*args)`` and serialize/compress it on the same executor.
+
+        Large history and log payloads would otherwise be encoded on the event
+        loop by ``JSONResponse``; the body is compressed as negotiated through
+        the request's ``Accept-Encoding`` header.
+        """
+        accept_encoding = request.headers.get('accept-encoding')
+
+        def fetch_and_encode():
+            return encode_json(func(*args), accept_encoding)
+
+        body, headers = await self._run_blocking(executor, fetch_and_encode)
+        return Response(content=body, media_type='application/json', headers=headers)
+
+    def _stop_and_log(self, analysis_id_str: str) -> dict[str, str]:
+        """Stop one or all analyses and push a stop log per analysis to the Hub (blocking)."""
+        response = stop_analysis(analysis_id_str, self.database)
+        # one id per deployment row, so analyses with restarts would be logged repeatedly
+        analysis_ids = list(dict.fromkeys(self.database.get_analysis_ids())) if analysis_id_str == 'all' \
+            else [analysis_id_str]
+        for analysis_id in analysis_ids:
+            stream_logs(AnalysisStoppedLog(analysis_id),
+                        self.node_id,
+                        self.enable_hub_logging,
+                        self.database,
+                        self.hub_client)
+        return response
+
+    def _stop_single(self, analysis_id: str) -> Optional[str]:
+        """Stop one analysis and return its final status (blocking, runs on the operation pool)."""
+        return self._stop_and_log(analysis_id).get(analysis_id)
+
+    def _delete_single(self, analysis_id: str) -> None:
+        """Delete one analysis (blocking, runs on the operation pool)."""
+        delete_analysis(analysis_id, self.database)
+
+    async def _submit_operation(self,
+                                kind: str,
+                                analysis_id_str: str,
+                                func: Callable[[str], Any]) -> JSONResponse:
+        """Queue ``func`` for one or all analyses and answer ``202`` with the operation snapshot.
+
+        Deleting ``'all'`` covers archived analyses as well, like the synchronous ``delete_analysis('all')``.
+        """
+        if (analysis_id_str == 'all') and (kind == 'delete'):
+            analysis_ids = await self._run_blocking(self.db_executor,
+                                                    partial(self.database.query_analysis_ids, include_archived=True))
+        elif analysis_id_str == 'all':
+            analysis_ids = await self._run_blocking(self.db_executor, self.database.get_analysis_ids)
+        else:
+            analysis_ids = [analysis_id_str]
+        operation = self.operation_tracker.submit(kind, analysis_ids, func)
+        return JSONResponse(status_code=202,
+                            content=operation,
+                            headers={'Location': f"/po/operations/{operation['operation_id']}"})
+
+    async def create_analysis_call(self, body: CreateAnalysis):
         """``POST /po/`` — create and start a new analysis deployment.
 
         Args:
@@ -178,49 +400,114 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return create_analysis(body, self.database)
+            return await self._run_blocking(self.k8s_executor, create_analysis, body, self.database)
         except Exception as e:
             logger.error(f"Error creating analysis: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error creating analysis (see po logs).")
 
-    def retrieve_all_history_call(self):
+    async def create_analyses_call(self, bodies: list[CreateAnalysis]):
+        """``POST /po/batch`` — create and start several analyses at once.
+
+        Namespace, node service discovery and Harbor secret are resolved once
+        for the batch, the analyses are deployed concurrently, and their status
+        is pushed through the API's Hub client.
+
+        Args:
+            bodies: Creation payloads, one per analysis.
+
+        Returns:
+            One result per payload, in request order, with either the new
+            ``status`` or an ``error``.
+
+        Raises:
+            HTTPException: 500 if the shared batch setup fails (details in logs).
+        """
+        try:
+            return await self._run_blocking(self.k8s_executor,
+                                            create_analyses,
+                                            bodies,
+                                            self.database,
+                                            self.hub_client,
+                                            self.node_id)
+        except Exception as e:
+            logger.error(f"Error creating analysis batch: {repr(e)}")
+            raise HTTPException(status_code=500, detail=f"Error creating analysis batch (see po logs).")
+
+    async def retrieve_all_history_call(self,
+                                        request: Request,
+                                        query: Annotated[HistoryQuery, Query()]):
         """``GET /po/history`` — return archived logs for every analysis.
 
+        The body is compressed with ``zstd`` or ``gzip`` if accepted by the client.
+
+        Args:
+            request: Incoming request, used for content negotiation.
+            query: Optional ``status``, ``project_id`` and ``created_after``
+                filters plus ``limit``/``offset`` pagination, and the
+                ``level``, ``since`` and ``until`` log record filters.
+
         Returns:
             Nested mapping ``{'analysis': {...}, 'nginx': {...}}`` keyed by
-            analysis id containing the persisted log snapshots.
+            analysis id containing the persisted log snapshots, plus the
+            matching log records under ``'logs'`` if any of ``level``,
+            ``since`` or ``until`` is given.
 
         Raises:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return retrieve_history('all', self.database)
+            return await self._encoded_json(request,
+                                            self.db_executor,
+                                            retrieve_history,
+                                            'all',
+                                            self.database,
+                                            query.analysis_query(),
+                                            query.log_query())
         except Exception as e:
             logger.error(f"Error retrieving ALL history data: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving ALL history data (see po logs).")
 
-    def retrieve_history_call(self, analysis_id: str):
+    async def retrieve_history_call(self,
+                                    request: Request,
+                                    analysis_id: str,
+                                    log_query: Annotated[LogQuery, Query()]):
         """``GET /po/history/{analysis_id}`` — return archived logs for a single analysis.
 
+        The body is compressed with ``zstd`` or ``gzip`` if accepted by the client.
+
         Args:
+            request: Incoming request, used for content negotiation.
             analysis_id: UUID of the analysis to query.
+            log_query: Optional ``level``, ``since`` and ``until`` log record filters.
 
         Returns:
             Nested mapping ``{'analysis': {...}, 'nginx': {...}}`` containing
-            the persisted log snapshots for ``analysis_id``.
+            the persisted log snapshots for ``analysis_id``, plus the matching
+            log records under ``'logs'`` if any log record filter is given.
 
         Raises:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return retrieve_history(analysis_id, self.database)
+            return await self._encoded_json(request,
+                                            self.db_executor,
+                                            retrieve_history,
+                                            analysis_id,
+                                            self.database,
+                                            None,
+                                            log_query)
         except Exception as e:
             logger.error(f"Error retrieving history data: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving history data (see po logs).")
 
-    def retrieve_all_logs_call(self):
+    async def retrieve_all_logs_call(self, request: Request):
         """``GET /po/logs`` — return live pod logs for every executing analysis.
 
+        The body is compressed with ``zstd`` or ``gzip`` if accepted by the client.
+
+        Args:
+            request: Incoming request, used for content negotiation.
+
         Returns:
             Nested mapping of analysis and nginx logs keyed by analysis id.
 
@@ -228,32 +515,61 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return retrieve_logs('all', self.database)
+            return await self._encoded_json(request, self.k8s_executor, retrieve_logs, 'all', self.database)
         except Exception as e:
             logger.error(f"Error retrieving ALL logs data: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving ALL logs data (see po logs).")
 
-    def retrieve_logs_call(self, analysis_id: str):
+    async def retrieve_logs_call(self,
+                                 request: Request,
+                                 analysis_id: str,
+                                 follow: bool = False,
+                                 tail: Annotated[Optional[int], Query(ge=0)] = None,
+                                 since_seconds: Annotated[Optional[int], Query(ge=1)] = None,
+                                 source: Literal['analysis', 'nginx'] = 'analysis'):
         """``GET /po/logs/{analysis_id}`` — return live pod logs for a single analysis.
 
+        Without query parameters the complete logs are returned as JSON. If
+        ``follow``, ``tail`` or ``since_seconds`` is given, the log of a single
+        pod is instead streamed as chunked ``text/plain``. The JSON body is
+        compressed with ``zstd`` or ``gzip`` if accepted by the client.
+
         Args:
+            request: Incoming request, used for content negotiation.
             analysis_id: UUID of the analysis to query.
+            follow: Keep the stream open and send new lines as they are written.
+            tail: Start the stream with the last ``tail`` lines only.
+            since_seconds: Start the stream with lines from the last ``since_seconds`` seconds only.
+            source: Stream the ``analysis`` pod or its ``nginx`` sidecar.
 
         Returns:
-            Nested mapping of analysis and nginx logs for ``analysis_id``.
+            Nested mapping of analysis and nginx logs for ``analysis_id``, or a
+            streaming response in streaming mode.
 
         Raises:
-            HTTPException: 500 on any downstream failure (details in logs).
+            HTTPException: 404 if no pod exists to stream from, 500 on any
+                downstream failure (details in logs).
         """
+        if follow or (tail is not None) or (since_seconds is not None):
+            return await self._stream_pod_log(analysis_id, source, follow, tail, since_seconds)
         try:
-            return retrieve_logs(analysis_id, self.database)
+            return await self._encoded_json(request, self.k8s_executor, retrieve_logs, analysis_id, self.database)
         except Exception as e:
             logger.error(f"Error retrieving logs data: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving logs data (see po logs).")
 
-    def get_all_status_and_progress_call(self):
+    async def get_all_status_and_progress_call(self, request: Request, query: Annotated[AnalysisQuery, Query()]):
         """``GET /po/status`` — return status and progress for every analysis.
 
+        Responses carry ``ETag``/``Last-Modified`` headers derived from the
+        database state version; a matching ``If-None-Match`` yields ``304``
+        without touching the database.
+
+        Args:
+            request: Incoming request, inspected for ``If-None-Match``.
+            query: Optional ``status``, ``project_id`` and ``created_after``
+                filters plus ``limit``/``offset`` pagination.
+
         Returns:
             Mapping ``{analysis_id: {'status': str, 'progress': int}}``.
 
@@ -261,15 +577,18 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return get_status_and_progress('all', self.database)
+            return await self._conditional_status(request, 'all', query)
         except Exception as e:
             logger.error(f"Error retrieving ALL status data: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving ALL status data (see po logs).")
 
-    def get_status_and_progress_call(self, analysis_id: str):
+    async def get_status_and_progress_call(self, request: Request, analysis_id: str):
         """``GET /po/status/{analysis_id}`` — return status and progress for a single analysis.
 
+        Supports conditional requests like ``GET /po/status``.
+
         Args:
+            request: Incoming request, inspected for ``If-None-Match``.
             analysis_id: UUID of the analysis to query.
 
         Returns:
@@ -279,14 +598,69 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return get_status_and_progress(analysis_id, self.database)
+            return await self._conditional_status(request, analysis_id)
         except Exception as e:
             logger.error(f"Error retrieving status data: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving status data (see po logs).")
 
-    def get_all_pods_call(self):
+    async def stream_status_call(self,
+                                 request: Request,
+                                 analysis_id: Annotated[Optional[list[str]], Query()] = None):
+        """``GET /po/status/stream`` — push status/progress transitions as Server-Sent Events.
+
+        The stream opens with a ``snapshot`` event holding the current status of
+        the requested analyses, followed by one ``status`` event per transition
+        and periodic keep-alive comments.
+
+        Args:
+            request: Incoming request, polled for client disconnects.
+            analysis_id: Optional (repeatable) analysis ids to restrict the stream to.
+
+        Returns:
+            A ``text/event-stream`` response.
+        """
+        # subscribe before taking the snapshot, so no transition in between is lost
+        queue = self.status_broadcaster.subscribe()
+        analysis_ids = set(analysis_id) if analysis_id else None
+
+        async def event_stream():
+            try:
+                if analysis_ids is None:
+                    snapshot = await self._run_blocking(self.db_executor, get_status_and_progress, 'all', self.database)
+                else:
+                    snapshot = {}
+                    for snapshot_id in analysis_ids:
+                        snapshot.update(await self._run_blocking(self.db_executor,
+                                                                 get_status_and_progress,
+                                                                 snapshot_id,
+                                                                 self.database))
+                yield format_sse('snapshot', snapshot)
+
+                while not await request.is_disconnected():
+                    try:
+                        event = await asyncio.wait_for(queue.get(), timeout=self.status_broadcaster.heartbeat_interval)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                        continue
+                    if (analysis_ids is None) or (event['analysis_id'] in analysis_ids):
+                        yield format_sse('status', {event['analysis_id']: {'status': event['status'],
+                                                                           'progress': event['progress']}})
+            except Exception as e:
+                logger.error(f"Error streaming status updates: {repr(e)}")
+            finally:
+                self.status_broadcaster.unsubscribe(queue)
+
+        return StreamingResponse(event_stream(),
+                                 media_type="text/event-stream",
+                                 headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    async def get_all_pods_call(self, query: Annotated[AnalysisQuery, Query()]):
         """``GET /po/pods`` — return the pod ids backing every analysis deployment.
 
+        Args:
+            query: Optional ``status``, ``project_id`` and ``created_after``
+                filters plus ``limit``/``offset`` pagination.
+
         Returns:
             Mapping ``{analysis_id: [pod_id, ...]}``.
 
@@ -294,12 +668,12 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return get_pods('all', self.database)
+            return await self._run_blocking(self.db_executor, get_pods, 'all', self.database, query)
         except Exception as e:
             logger.error(f"Error retrieving ALL pod names: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving ALL pod names (see po logs).")
 
-    def get_pods_call(self, analysis_id: str):
+    async def get_pods_call(self, analysis_id: str):
         """``GET /po/pods/{analysis_id}`` — return pod ids for a single analysis.
 
         Args:
@@ -312,94 +686,123 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return get_pods(analysis_id, self.database)
+            return await self._run_blocking(self.db_executor, get_pods, analysis_id, self.database)
         except Exception as e:
             logger.error(f"Error retrieving pod name: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error retrieving pod name (see po logs).")
 
-    def stop_all_analysis_call(self):
+    async def stop_all_analysis_call(self, wait: bool = False):
         """``PUT /po/stop`` — stop every analysis and push a stop log to the Hub.
 
+        The analyses are stopped in the background; poll the returned
+        operation via ``/po/operations/{operation_id}``.
+
+        Args:
+            wait: Stop synchronously and return the final statuses instead.
+
         Returns:
-            Mapping ``{analysis_id: status}`` reflecting the final status of
-            each stopped analysis.
+            ``202`` with the operation snapshot, or with ``wait`` a mapping
+            ``{analysis_id: status}`` reflecting the final status of each
+            stopped analysis.
 
         Raises:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            response = stop_analysis('all', self.database)
-            for analysis_id in self.database.get_analysis_ids():
-                stream_logs(AnalysisStoppedLog(analysis_id),
-                            self.node_id,
-                            self.enable_hub_logging,
-                            self.database,
-                            self.hub_client)
-            return response
+            if wait:
+                return await self._run_blocking(self.k8s_executor, self._stop_and_log, 'all')
+            return await self._submit_operation('stop', 'all', self._stop_single)
         except Exception as e:
             logger.error(f"Error stopping ALL analyzes: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error stopping ALL analyzes (see po logs).")
 
-    def stop_analysis_call(self, analysis_id: str):
+    async def stop_analysis_call(self, analysis_id: str, wait: bool = False):
         """``PUT /po/stop/{analysis_id}`` — stop a single analysis and push a stop log to the Hub.
 
         Args:
             analysis_id: UUID of the analysis to stop.
+            wait: Stop synchronously and return the final status instead.
 
         Returns:
-            Mapping ``{analysis_id: status}`` reflecting the final status.
+            ``202`` with the operation snapshot, or with ``wait`` a mapping
+            ``{analysis_id: status}`` reflecting the final status.
 
         Raises:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            response = stop_analysis(analysis_id, self.database)
-            stream_logs(AnalysisStoppedLog(analysis_id),
-                        self.node_id,
-                        self.enable_hub_logging,
-                        self.database,
-                        self.hub_client)
-            return response
+            if wait:
+                return await self._run_blocking(self.k8s_executor, self._stop_and_log, analysis_id)
+            return await self._submit_operation('stop', analysis_id, self._stop_single)
         except Exception as e:
             logger.error(f"Error stopping analysis: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error stopping analysis (see po logs).")
 
-    def delete_all_analysis_call(self):
+    async def delete_all_analysis_call(self, wait: bool = False):
         """``DELETE /po/delete`` — stop and permanently remove every analysis.
 
         Removes each analysis from the database and deletes its Keycloak client.
+        Runs in the background like ``PUT /po/stop``.
+
+        Args:
+            wait: Delete synchronously instead.
 
         Returns:
-            Mapping ``{analysis_id: None}`` acknowledging the deletions.
+            ``202`` with the operation snapshot, or with ``wait`` a mapping
+            ``{analysis_id: None}`` acknowledging the deletions.
 
         Raises:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return delete_analysis('all', self.database)
+            if wait:
+                return await self._run_blocking(self.k8s_executor, delete_analysis, 'all', self.database)
+            return await self._submit_operation('delete', 'all', self._delete_single)
         except Exception as e:
             logger.error(f"Error deleting ALL analyzes: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error deleting ALL analyzes (see po logs).")
 
-    def delete_analysis_call(self, analysis_id: str):
+    async def delete_analysis_call(self, analysis_id: str, wait: bool = False):
         """``DELETE /po/delete/{analysis_id}`` — stop and permanently remove a single analysis.
 
         Args:
             analysis_id: UUID of the analysis to delete.
+            wait: Delete synchronously instead.
 
         Returns:
-            Mapping ``{analysis_id: None}`` acknowledging the deletion.
+            ``202`` with the operation snapshot, or with ``wait`` a mapping
+            ``{analysis_id: None}`` acknowledging the deletion.
 
         Raises:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return delete_analysis(analysis_id, self.database)
+            if wait:
+                return await self._run_blocking(self.k8s_executor, delete_analysis, analysis_id, self.database)
+            return await self._submit_operation('delete', analysis_id, self._delete_single)
         except Exception as e:
             logger.error(f"Error deleting analysis: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error deleting analysis (see po logs).")
 
-    def cleanup_call(self, cleanup_type: str):
+    async def get_operation_call(self, operation_id: str):
+        """``GET /po/operations/{operation_id}`` — report the progress of a stop/delete operation.
+
+        Args:
+            operation_id: Id returned by ``PUT /po/stop`` or ``DELETE /po/delete``.
+
+        Returns:
+            Operation snapshot with its overall ``status`` and per-analysis
+            ``state``, ``result`` and ``error``.
+
+        Raises:
+            HTTPException: 404 if the operation is unknown or has been evicted.
+        """
+        operation = self.operation_tracker.get(operation_id)
+        if operation is None:
+            raise HTTPException(status_code=404, detail=f"Operation {operation_id} not found.")
+        return operation
+
+    async def cleanup_call(self, cleanup_type: str):
         """``DELETE /po/cleanup/{cleanup_type}`` — run a targeted cleanup pass.
 
         Args:
@@ -414,16 +817,18 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return cleanup(cleanup_type, self.database, self.namespace)
+            return await self._run_blocking(self.k8s_executor, cleanup, cleanup_type, self.database, self.namespace)
         except Exception as e:
             logger.error(f"Error cleaning up: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error cleaning up (see po logs).")
 
-    def stream_logs_call(self, body: CreateLogEntity):
+    async def stream_logs_call(self, body: CreateLogEntity):
         """``POST /po/stream_logs`` — accept a log line from an analysis pod.
 
-        Persists the log to the database, optionally forwards it to the FLAME
-        Hub, and updates the Hub with the latest status and progress.
+        Persists the log to the database and optionally forwards it to the
+        FLAME Hub. The reported status and progress are buffered and written to
+        the database and the Hub at a bounded rate (immediately for terminal
+        statuses).
 
         Args:
             body: Structured log entry posted by the analysis via the nginx
@@ -433,12 +838,91 @@ class PodOrchestrationAPI:
             HTTPException: 500 on any downstream failure (details in logs).
         """
         try:
-            return stream_logs(body, self.node_id, self.enable_hub_logging, self.database, self.hub_client)
+            return await self._run_blocking(self.db_executor,
+                                            stream_logs,
+                                            body,
+                                            self.node_id,
+                                            self.enable_hub_logging,
+                                            self.database,
+                                            self.hub_client,
+                                            self.progress_buffer)
         except Exception as e:
             logger.error(f"Error streaming logs: {repr(e)}")
             raise HTTPException(status_code=500, detail=f"Error streaming logs (see po logs).")
 
-    def health_call(self):
+    async def stream_logs_batch_call(self, request: Request):
+        """``POST /po/stream_logs/batch`` — accept many log lines from analysis pods at once.
+
+        The body is either a JSON array of log entries or, with content type
+        ``application/x-ndjson``, one JSON log entry per line. The batch size is
+        checked before the entries are validated; all lines are persisted in one
+        transaction and each analysis' status/progress is evaluated once per batch.
+
+        Args:
+            request: Incoming request carrying the batch body.
+
+        Returns:
+            Mapping ``{analysis_id: number_of_lines_accepted}``.
+
+        Raises:
+            HTTPException: 422 on a malformed body, 413 if the batch exceeds
+                ``PO_LOG_BATCH_MAX_SIZE`` entries, 500 on any downstream
+                failure (details in logs).
+        """
+        raw = await request.body()
+        ndjson = request.headers.get('content-type', '').split(';')[0].strip() == 'application/x-ndjson'
+        try:
+            if ndjson:
+                lines = [line for line in raw.splitlines() if line.strip()]
+                size = len(lines)
+            else:
+                entries = json.loads(raw)
+                size = len(entries) if isinstance(entries, list) else 0
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid log batch: {e}")
+        if size > _LOG_BATCH_MAX_SIZE:
+            raise HTTPException(status_code=413,
+                                detail=f"Log batch of {size} entries exceeds the limit of {_LOG_BATCH_MAX_SIZE}.")
+        try:
+            if ndjson:
+                entries = [json.loads(line) for line in lines]
+            body = _log_batch_adapter.validate_python(entries)
+        except (ValueError, ValidationError) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid log batch: {e}")
+
+        try:
+            return await self._run_blocking(self.db_executor,
+                                            stream_logs_batch,
+                                            body,
+                                            self.node_id,
+                                            self.enable_hub_logging,
+                                            self.database,
+                                            self.hub_client,
+                                            self.progress_buffer)
+        except Exception as e:
+            logger.error(f"Error streaming log batch: {repr(e)}")
+            raise HTTPException(status_code=500, detail=f"Error streaming log batch (see po logs).")
+
+    async def metrics_call(self):
+        """``GET /po/metrics`` — return internal cache statistics.
+
+        Returns:
+            Mapping with the size, hit/miss counters and hit rate of the
+            verified bearer-token cache (``token_cache``), the number of
+            connected status stream subscribers (``status_stream``), the
+            stored log volume incl. bytes saved by compression (``log_storage``)
+            the hit/miss counters of the deployment state cache
+            (``state_cache``, if enabled) and how database row changes are
+            detected (``change_feed``).
+        """
+        log_storage = await self._run_blocking(self.db_executor, self.database.get_log_storage_stats)
+        return {'token_cache': get_token_cache_stats(),
+                'status_stream': {'subscribers': self.status_broadcaster.subscriber_count()},
+                'log_storage': log_storage,
+                'state_cache': self.database.get_cache_stats(),
+                'change_feed': {'mode': self.database.get_change_feed_mode()}}
+
+    async def health_call(self):
         """``GET /po/healthz`` — unauthenticated liveness probe.
 
         Returns:
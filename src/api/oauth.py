@@ -1,15 +1,81 @@
 import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2AuthorizationCodeBearer
 
 from jwt import PyJWKClient
 import jwt
-from typing import Annotated
+from typing import Annotated, Optional
 
 
 _KEYCLOAK_URL = os.getenv("KEYCLOAK_URL")
 _REALM = os.getenv("KEYCLOAK_REALM", "flame")
 _REALM_BASE = f"{_KEYCLOAK_URL}/realms/{_REALM}/protocol/openid-connect"
+_JWKS_CACHE_TTL = int(os.getenv("KEYCLOAK_JWKS_TTL", "300"))  # Time in seconds the realm keys are cached
+
+_TOKEN_CACHE_SIZE = int(os.getenv("PO_TOKEN_CACHE_SIZE", "1024"))  # Max. number of verified tokens kept
+
+_jwks_client: Optional[PyJWKClient] = None
+_jwks_client_lock = threading.Lock()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of decoded claims for already verified bearer tokens.
+
+    Entries are keyed by the SHA-256 digest of the token (the raw token is
+    never stored) and are only served until the token's ``exp`` claim.
+    Hit/miss counters are kept for monitoring via ``/po/metrics``.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached claims for ``token`` if present and not yet expired."""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                exp, claims = entry
+                if exp > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(claims)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: dict) -> None:
+        """Store verified claims; tokens without a numeric ``exp`` are not cached."""
+        exp = claims.get('exp')
+        if (self.max_size <= 0) or not isinstance(exp, (int, float)):
+            return
+        key = hashlib.sha256(token.encode()).hexdigest()
+        with self._lock:
+            self._entries[key] = (float(exp), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """Return size, hit/miss counters and the hit rate of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self._entries),
+                    'max_size': self.max_size,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'hit_rate': (self.hits / lookups) if lookups else 0.0}
+
+
+_token_cache = VerifiedTokenCache(_TOKEN_CACHE_SIZE)
 
 
 _oauth2_scheme = OAuth2AuthorizationCodeBearer(
@@ -19,11 +85,30 @@ _oauth2_scheme = OAuth2AuthorizationCodeBearer(
 )
 
 
+def _get_jwks_client() -> PyJWKClient:
+    """Return the process-wide JWKS client, creating it on first use.
+
+    The client caches the realm's key set for ``KEYCLOAK_JWKS_TTL`` seconds
+    and refetches it early when a token references an unknown ``kid`` (e.g.
+    after a key rotation), so validation is local in the common case.
+    """
+    global _jwks_client
+    with _jwks_client_lock:
+        if _jwks_client is None:
+            _jwks_client = PyJWKClient(f"{_REALM_BASE}/certs",
+                                       cache_keys=True,
+                                       cache_jwk_set=True,
+                                       lifespan=_JWKS_CACHE_TTL)
+        return _jwks_client
+
+
 def valid_access_token(token: Annotated[str, Depends(_oauth2_scheme)]) -> dict:
     """FastAPI dependency that validates a Keycloak-issued OAuth2 bearer token.
 
-    Fetches the Keycloak realm's signing keys via JWKS and verifies the token's
-    signature and expiration. Audience validation is intentionally disabled.
+    Tokens that were verified before are served from the verified-token cache
+    until they expire. Otherwise the Keycloak realm's signing key is looked up
+    in the cached JWKS and the token's signature and expiration are verified.
+    Audience validation is intentionally disabled.
 
     Args:
         token: The bearer token extracted from the ``Authorization`` header by
@@ -36,10 +121,20 @@ def valid_access_token(token: Annotated[str, Depends(_oauth2_scheme)]) -> dict:
         HTTPException: 401 if the token is invalid, expired, or cannot be
             verified against the realm's signing keys.
     """
+    claims = _token_cache.get(token)
+    if claims is not None:
+        return claims
     try:
-        sig_key = PyJWKClient(f"{_REALM_BASE}/certs").get_signing_key_from_jwt(token)
-        return jwt.decode(token,
-                          key=sig_key,
-                          options={'verify_signature': True, 'verify_aud': False, 'verify_exp': True})
+        sig_key = _get_jwks_client().get_signing_key_from_jwt(token)
+        claims = jwt.decode(token,
+                            key=sig_key,
+                            options={'verify_signature': True, 'verify_aud': False, 'verify_exp': True})
     except jwt.exceptions.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    _token_cache.put(token, claims)
+    return claims
+
+
+def get_token_cache_stats() -> dict[str, float]:
+    """Return the statistics of the process-wide verified-token cache."""
+    return _token_cache.stats()
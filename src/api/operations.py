@@ -0,0 +1,119 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.utils.po_logging import get_logger
+
+
+logger = get_logger()
+
+_OPERATION_WORKERS = int(os.getenv("PO_OPERATION_WORKERS", "4"))  # Analyses stopped/deleted concurrently
+_OPERATION_HISTORY = int(os.getenv("PO_OPERATION_HISTORY", "256"))  # Max. number of finished operations kept
+
+
+class Operation:
+    """A long-running stop/delete request, tracked per analysis.
+
+    Each analysis moves from ``pending`` to ``running`` to ``succeeded`` or
+    ``failed``. The operation itself is ``pending`` until any analysis is
+    picked up, ``running`` while any is unfinished, and afterwards ``failed``
+    if at least one analysis failed, else ``succeeded``.
+    """
+
+    def __init__(self, kind: str, analysis_ids: list[str]) -> None:
+        self.operation_id = str(uuid.uuid4())
+        self.kind = kind
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.analyses: dict[str, dict[str, Any]] = {analysis_id: {'state': 'pending', 'result': None, 'error': None}
+                                                     for analysis_id in analysis_ids}
+        if not analysis_ids:
+            self.finished_at = self.created_at
+
+    @property
+    def status(self) -> str:
+        states = {analysis['state'] for analysis in self.analyses.values()}
+        if states == {'pending'}:
+            return 'pending'
+        if states & {'pending', 'running'}:
+            return 'running'
+        return 'failed' if 'failed' in states else 'succeeded'
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'operation_id': self.operation_id,
+                'kind': self.kind,
+                'status': self.status,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+                'analyses': {analysis_id: dict(analysis) for analysis_id, analysis in self.analyses.items()}}
+
+
+class OperationTracker:
+    """Runs stop/delete work on a bounded worker pool and keeps its per-analysis progress.
+
+    Every analysis of an operation is submitted as its own task, so one slow
+    analysis does not hold up the others. Finished operations are retained
+    (oldest evicted first) up to ``max_finished`` so clients can still poll
+    their outcome.
+    """
+
+    def __init__(self, max_workers: int = _OPERATION_WORKERS, max_finished: int = _OPERATION_HISTORY) -> None:
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='po-ops')
+        self._operations: OrderedDict[str, Operation] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, analysis_ids: list[str], func: Callable[[str], Any]) -> dict[str, Any]:
+        """Start ``func(analysis_id)`` for every analysis in the background.
+
+        Args:
+            kind: Operation type reported to clients (e.g. ``'stop'``).
+            analysis_ids: Analyses to process; duplicates are processed once.
+            func: Blocking per-analysis work; its return value is recorded as
+                the analysis' ``result``.
+
+        Returns:
+            Snapshot of the newly created operation.
+        """
+        analysis_ids = list(dict.fromkeys(analysis_ids))
+        operation = Operation(kind, analysis_ids)
+        with self._lock:
+            self._operations[operation.operation_id] = operation
+            self._prune()
+            snapshot = operation.to_dict()
+        for analysis_id in analysis_ids:
+            self._executor.submit(self._run, operation, analysis_id, func)
+        return snapshot
+
+    def get(self, operation_id: str) -> Optional[dict[str, Any]]:
+        """Return a snapshot of the operation, or ``None`` if unknown or already evicted."""
+        with self._lock:
+            operation = self._operations.get(operation_id)
+            return operation.to_dict() if operation is not None else None
+
+    def _run(self, operation: Operation, analysis_id: str, func: Callable[[str], Any]) -> None:
+        """Process a single analysis of an operation (runs on the worker pool)."""
+        with self._lock:
+            operation.analyses[analysis_id]['state'] = 'running'
+        try:
+            result = func(analysis_id)
+            update = {'state': 'succeeded', 'result': result}
+        except Exception as e:
+            logger.error(f"Error during {operation.kind} of analysis {analysis_id} "
+                         f"(operation {operation.operation_id}): {repr(e)}")
+            update = {'state': 'failed', 'error': repr(e)}
+        with self._lock:
+            operation.analyses[analysis_id].update(update)
+            if operation.status in ['succeeded', 'failed']:
+                operation.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Evict the oldest finished operations beyond ``max_finished`` (caller holds the lock)."""
+        finished = [operation_id for operation_id, operation in self._operations.items()
+                    if operation.finished_at is not None]
+        for operation_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._operations[operation_id]
@@ -0,0 +1,83 @@
+import gzip
+import os
+from typing import Any, Optional
+
+import orjson
+import zstandard
+
+
+_COMPRESSION_MIN_SIZE = int(os.getenv("PO_COMPRESSION_MIN_SIZE", "1024"))  # Bodies below this size (bytes) are sent as is
+_GZIP_LEVEL = int(os.getenv("PO_GZIP_LEVEL", "3"))  # gzip compression level (1-9)
+_ZSTD_LEVEL = int(os.getenv("PO_ZSTD_LEVEL", "3"))  # zstd compression level (1-22)
+
+# preferred first when the client accepts several encodings with the same quality
+_SUPPORTED_ENCODINGS = ('zstd', 'gzip')
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the response content coding from an ``Accept-Encoding`` header.
+
+    Honors quality values (``q=0`` excludes a coding) and the ``*`` wildcard;
+    on equal quality ``zstd`` is preferred over ``gzip``.
+
+    Args:
+        accept_encoding: Raw header value, ``None`` if the client sent none.
+
+    Returns:
+        ``'zstd'``, ``'gzip'`` or ``None`` for an uncompressed (identity) body.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    wildcard = qualities.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in _SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def encode_json(content: Any,
+                accept_encoding: Optional[str] = None,
+                min_size: int = _COMPRESSION_MIN_SIZE) -> tuple[bytes, dict[str, str]]:
+    """Serialize ``content`` to JSON and compress it as negotiated with the client.
+
+    This is CPU-bound for large payloads (history/log dumps) and is meant to be
+    run on an executor together with the data retrieval.
+
+    Args:
+        content: JSON-serializable response content.
+        accept_encoding: Client's ``Accept-Encoding`` header.
+        min_size: Serialized bodies smaller than this are never compressed.
+
+    Returns:
+        Tuple of the response body and the headers describing it
+        (``Vary`` and, if compressed, ``Content-Encoding``).
+    """
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    headers = {'Vary': 'Accept-Encoding'}
+
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= min_size else None
+    if encoding == 'zstd':
+        body = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(body)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+    return body, headers
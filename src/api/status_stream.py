@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Optional
+
+from src.utils.po_logging import get_logger
+
+
+logger = get_logger()
+
+_SSE_HEARTBEAT_INTERVAL = float(os.getenv("PO_SSE_HEARTBEAT_INTERVAL", "15"))  # Seconds between keep-alive comments
+_SSE_QUEUE_SIZE = int(os.getenv("PO_SSE_QUEUE_SIZE", "256"))  # Max. number of pending events per subscriber
+
+
+class StatusBroadcaster:
+    """Fan-out of analysis status/progress transitions to Server-Sent Events subscribers.
+
+    ``publish`` is registered as a database status listener and is therefore
+    called from arbitrary worker threads (status loop, API executors). It
+    drops writes that do not change an analysis' ``(status, progress)`` and
+    hands real transitions to each subscriber's event loop via
+    ``call_soon_threadsafe``. Subscriber queues are bounded; a subscriber that
+    falls behind loses its oldest pending events rather than stalling others.
+    The last state of an analysis is dropped via ``forget`` once it is deleted
+    or archived.
+    """
+
+    def __init__(self,
+                 queue_size: int = _SSE_QUEUE_SIZE,
+                 heartbeat_interval: float = _SSE_HEARTBEAT_INTERVAL) -> None:
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._last_states: dict[str, tuple[str, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a new subscriber on the running event loop and return its event queue."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; unknown queues are ignored."""
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def subscriber_count(self) -> int:
+        """Return the number of currently connected subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, analysis_id: str, status: str, progress: Optional[int]) -> None:
+        """Broadcast a status/progress transition (thread-safe, non-blocking)."""
+        with self._lock:
+            if self._last_states.get(analysis_id) == (status, progress):
+                return
+            self._last_states[analysis_id] = (status, progress)
+            subscribers = list(self._subscribers.items())
+
+        event = {'analysis_id': analysis_id, 'status': status, 'progress': progress}
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, event)
+            except RuntimeError:
+                # subscriber's event loop already closed
+                self.unsubscribe(queue)
+
+    def forget(self, analysis_id: str) -> None:
+        """Drop the last known state of an analysis that no longer exists; unknown ids are ignored."""
+        with self._lock:
+            self._last_states.pop(analysis_id, None)
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, event: dict) -> None:
+        """Put an event on a subscriber queue, discarding the oldest entry if it is full."""
+        if queue.full():
+            queue.get_nowait()
+            logger.warning("Status stream subscriber is falling behind, dropping oldest event")
+        queue.put_nowait(event)
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Serialize a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
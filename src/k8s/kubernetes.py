@@ -2,7 +2,9 @@ import os
 import time
 import json
 import base64
-from typing import Optional
+import codecs
+import hashlib
+from typing import Iterator, Optional
 import string
 
 from kubernetes import client
@@ -18,11 +20,15 @@ PORTS = {'nginx': [80],
          'analysis': [8000],
          'service': [80]}
 
+HARBOR_SECRET_NAME = 'flame-harbor-credentials'
+
+_LOG_STREAM_CHUNK_SIZE = int(os.getenv('PO_LOG_STREAM_CHUNK_SIZE', '65536'))  # Max. bytes read per log stream chunk
+
 
 def create_harbor_secret(host_address: str,
                          user: str,
                          password: str,
-                         name: str = 'flame-harbor-credentials',
+                         name: str = HARBOR_SECRET_NAME,
                          namespace: str = 'default') -> None:
     """Create (or recreate) the dockerconfigjson secret used to pull analysis images.
 
@@ -70,10 +76,23 @@ def create_harbor_secret(host_address: str,
                 raise Exception(f"Conflict in harbor secret creation remains unresolved (see po logs)")
 
 
+def harbor_secret_name(host_address: str, user: str, password: str) -> str:
+    """Return a pull secret name unique to a set of registry credentials.
+
+    Used when analyses deployed together pull with different credentials, so
+    that creating one secret does not overwrite the one another deployment
+    references.
+    """
+    digest = hashlib.sha256('\0'.join((host_address, user, password)).encode('utf-8')).hexdigest()[:12]
+    return f"{HARBOR_SECRET_NAME}-{digest}"
+
+
 def create_analysis_deployment(name: str,
                                image: str,
                                env: Optional[dict[str, str]] = None,
-                               namespace: str = 'default') -> list[str]:
+                               namespace: str = 'default',
+                               node_services: Optional[dict[str, str]] = None,
+                               image_pull_secret: str = HARBOR_SECRET_NAME) -> list[str]:
     """Deploy an analysis pod along with its nginx sidecar, service, and network policy.
 
     Creates the analysis ``Deployment`` using the Harbor pull secret, exposes
@@ -86,6 +105,10 @@ def create_analysis_deployment(name: str,
         env: Optional environment variables to inject into the analysis
             container.
         namespace: Namespace in which to create the resources.
+        node_services: Result of :func:`discover_node_services`, shared when
+            deploying several analyses; discovered on demand if ``None``.
+        image_pull_secret: Name of the Harbor pull secret (see
+            :func:`create_harbor_secret`).
 
     Returns:
         List of pod names that belong to the new analysis deployment.
@@ -107,7 +130,7 @@ def create_analysis_deployment(name: str,
     depl_selector = client.V1LabelSelector(match_labels=labels)
     depl_pod_spec = client.V1PodSpec(containers=containers,
                                      image_pull_secrets=[
-                                         client.V1LocalObjectReference(name="flame-harbor-credentials"),
+                                         client.V1LocalObjectReference(name=image_pull_secret),
                                      ])
     depl_template = client.V1PodTemplateSpec(metadata=depl_pod_metadata, spec=depl_pod_spec)
 
@@ -122,7 +145,7 @@ def create_analysis_deployment(name: str,
                                             meta_data_labels=labels,
                                             namespace=namespace)
 
-    nginx_name, _ = _create_analysis_nginx_deployment(name, analysis_service_name, env, namespace)
+    nginx_name, _ = _create_analysis_nginx_deployment(name, analysis_service_name, env, namespace, node_services)
 
     return _get_pods(name)
 
@@ -193,6 +216,105 @@ def get_analysis_logs(deployment_names: dict[str, str],
             }
 
 
+class PodLogStream:
+    """Incremental, sanitized reader for the log of a single pod.
+
+    Wraps the raw (non-preloaded) response of ``read_namespaced_pod_log`` and
+    yields sanitized chunks of complete lines as they arrive, so memory stays
+    flat regardless of the log size. Lines are filtered with the same rules as
+    :func:`get_analysis_logs`. ``close`` may be called from another thread to
+    abort a blocked read, e.g. when the requesting client disconnects.
+    """
+
+    def __init__(self,
+                 pod_name: str,
+                 namespace: str = 'default',
+                 follow: bool = False,
+                 tail_lines: Optional[int] = None,
+                 since_seconds: Optional[int] = None,
+                 chunk_size: int = _LOG_STREAM_CHUNK_SIZE) -> None:
+        """Open the log stream of ``pod_name``.
+
+        Args:
+            pod_name: Name of the pod to read.
+            namespace: Namespace the pod lives in.
+            follow: Keep the stream open and yield new lines as they are written.
+            tail_lines: Only start with the last ``tail_lines`` lines of the log.
+            since_seconds: Only start with lines written in the last ``since_seconds`` seconds.
+            chunk_size: Maximum number of bytes read from the connection at once.
+        """
+        core_client = client.CoreV1Api()
+        self.pod_name = pod_name
+        self.chunk_size = chunk_size
+        self._closed = False
+        self._response = core_client.read_namespaced_pod_log(pod_name,
+                                                             namespace,
+                                                             follow=follow,
+                                                             tail_lines=tail_lines,
+                                                             since_seconds=since_seconds,
+                                                             _preload_content=False)
+
+    def __iter__(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ''
+        try:
+            for raw in self._response.stream(self.chunk_size):
+                lines = (pending + decoder.decode(raw)).split('\n')
+                pending = lines.pop()
+                sanitized = _sanitize_log_lines(lines)
+                if sanitized:
+                    yield '\n'.join(sanitized) + '\n'
+            sanitized = _sanitize_log_lines([pending + decoder.decode(b'', final=True)])
+            if sanitized and sanitized[0]:
+                yield sanitized[0]
+        except Exception as e:
+            # reads on a stream closed from another thread fail; anything else is a genuine error
+            if not self._closed:
+                logger.error(f"Error while streaming pod logs for pod_name={self.pod_name}: {repr(e)}")
+                raise
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the underlying connection (idempotent, thread-safe)."""
+        if not self._closed:
+            self._closed = True
+            self._response.close()
+            self._response.release_conn()
+
+
+def open_pod_log_stream(name: str,
+                        pod_ids: Optional[list[str]] = None,
+                        namespace: str = 'default',
+                        follow: bool = False,
+                        tail_lines: Optional[int] = None,
+                        since_seconds: Optional[int] = None) -> Optional[PodLogStream]:
+    """Open a :class:`PodLogStream` for the newest pod matching ``app={name}``.
+
+    Args:
+        name: Value of the pods' ``app`` label.
+        pod_ids: Optional allowlist; pods not in this list are skipped.
+        namespace: Namespace to search in.
+        follow: Keep the stream open for new lines.
+        tail_lines: Only start with the last ``tail_lines`` lines.
+        since_seconds: Only start with lines from the last ``since_seconds`` seconds.
+
+    Returns:
+        The opened stream, or ``None`` if no matching pod exists.
+    """
+    core_client = client.CoreV1Api()
+    pods = [pod for pod in core_client.list_namespaced_pod(namespace=namespace, label_selector=f'app={name}').items
+            if (pod_ids is None) or (pod.metadata.name in pod_ids)]
+    if not pods:
+        return None
+    pod = max(pods, key=lambda p: p.metadata.creation_timestamp)
+    return PodLogStream(pod.metadata.name,
+                        namespace=namespace,
+                        follow=follow,
+                        tail_lines=tail_lines,
+                        since_seconds=since_seconds)
+
+
 def get_pod_status(deployment_name: str, namespace: str = 'default') -> Optional[dict[str, dict[str, str]]]:
     """Return readiness and (if not ready) failure details for each pod in a deployment.
 
@@ -244,7 +366,8 @@ def get_pod_status(deployment_name: str, namespace: str = 'default') -> Optional
 def _create_analysis_nginx_deployment(analysis_name: str,
                                       analysis_service_name: str,
                                       analysis_env: Optional[dict[str, str]] = None,
-                                      namespace: str = 'default') -> tuple[str, str]:
+                                      namespace: str = 'default',
+                                      node_services: Optional[dict[str, str]] = None) -> tuple[str, str]:
     """Deploy the nginx reverse-proxy sidecar for an analysis.
 
     Builds the nginx ConfigMap, starts the ``nginx-{analysis_name}`` deployment
@@ -258,6 +381,8 @@ def _create_analysis_nginx_deployment(analysis_name: str,
         analysis_env: Analysis config (must include ``ANALYSIS_ID`` and
             ``PROJECT_ID``) used to template the nginx config.
         namespace: Namespace in which to create the resources.
+        node_services: Pre-discovered node services (see
+            :func:`discover_node_services`).
 
     Returns:
         Tuple ``(nginx_deployment_name, nginx_service_name)``.
@@ -270,7 +395,8 @@ def _create_analysis_nginx_deployment(analysis_name: str,
                                                analysis_service_name=analysis_service_name,
                                                nginx_name=nginx_name,
                                                analysis_env=analysis_env,
-                                               namespace=namespace)
+                                               namespace=namespace,
+                                               node_services=node_services)
 
     liveness_probe = client.V1Probe(http_get=client.V1HTTPGetAction(path="/healthz", port=PORTS['nginx'][0]),
                                     initial_delay_seconds=15,
@@ -328,37 +454,26 @@ def _create_analysis_nginx_deployment(analysis_name: str,
     return nginx_name, nginx_service_name
 
 
-def _create_nginx_config_map(analysis_name: str,
-                             analysis_service_name: str,
-                             nginx_name: str,
-                             analysis_env: Optional[dict[str, str]] = None,
-                             namespace: str = 'default') -> str:
-    """Build and create the nginx ConfigMap scoped to a single analysis.
+def discover_node_services(namespace: str = 'default') -> dict[str, str]:
+    """Look up the node-local services and pod IPs every analysis nginx config refers to.
 
     Discovers the message broker, pod orchestration, hub adapter, kong, and
-    storage services at runtime, waits until each of their pods has an IP, and
-    renders an ``nginx.conf`` that whitelists the analysis pod for egress and
-    the message broker / pod orchestrator for ingress.
+    storage services, and waits until the message broker and pod orchestration
+    pods have an IP. The result does not depend on the analysis and can be
+    shared across all analyses created in one go.
 
     Args:
-        analysis_name: Name of the analysis deployment.
-        analysis_service_name: Upstream service for ``/analysis`` ingress.
-        nginx_name: Name of the nginx deployment (used to prefix the config
-            map name).
-        analysis_env: Analysis config containing ``ANALYSIS_ID`` and
-            ``PROJECT_ID`` used in location matches.
-        namespace: Namespace in which to create the ConfigMap.
+        namespace: Namespace to search in.
 
     Returns:
-        Name of the created ConfigMap (``{nginx_name}-config``).
+        Mapping with the keys ``message_broker_service_name``,
+        ``message_broker_ip``, ``po_service_name``, ``pod_orchestration_ip``,
+        ``hub_adapter_service_name``, ``kong_proxy_name`` and
+        ``storage_service_name``.
 
     Raises:
-        ValueError: If ``analysis_env`` is ``None`` or the pod orchestration
-            pod cannot be found.
+        ValueError: If the pod orchestration pod cannot be found.
     """
-    if analysis_env is None:
-        logger.error(f"Error creating an nginx failed since no analysis_env containing analysis and poject id was provided.")
-        raise ValueError(f"Error creating an nginx failed since no analysis_env containing analysis and poject id was provided.")
     core_client = client.CoreV1Api()
 
     # get the service name of the message broker
@@ -402,17 +517,6 @@ def _create_nginx_config_map(analysis_name: str,
             pod_orchestration_ip = pod_orchestration_pod.status.pod_ip
         time.sleep(1)
 
-    # await and get analysis pod ip
-    analysis_ip = None
-    while analysis_ip is None:
-        pod_list_object = core_client.list_namespaced_pod(label_selector=f"app={analysis_name}",
-                                                          watch=False,
-                                                          namespace=namespace)
-
-        if len(pod_list_object.items) > 0:
-            analysis_ip = pod_list_object.items[0].status.pod_ip
-        time.sleep(1)
-
     # get the name of the hub adapter, kong proxy, and storage service
     hub_adapter_service_name = find_k8s_resources('service',
                                                   'label',
@@ -428,6 +532,71 @@ def _create_nginx_config_map(analysis_name: str,
                                              'component=flame-storage-service',
                                              namespace=namespace)[0]
 
+    return {'message_broker_service_name': message_broker_service_name,
+            'message_broker_ip': message_broker_ip,
+            'po_service_name': po_service_name,
+            'pod_orchestration_ip': pod_orchestration_ip,
+            'hub_adapter_service_name': hub_adapter_service_name,
+            'kong_proxy_name': kong_proxy_name,
+            'storage_service_name': storage_service_name}
+
+
+def _create_nginx_config_map(analysis_name: str,
+                             analysis_service_name: str,
+                             nginx_name: str,
+                             analysis_env: Optional[dict[str, str]] = None,
+                             namespace: str = 'default',
+                             node_services: Optional[dict[str, str]] = None) -> str:
+    """Build and create the nginx ConfigMap scoped to a single analysis.
+
+    Uses the node services from :func:`discover_node_services` (discovering
+    them if not given), waits until the analysis pod has an IP, and renders an
+    ``nginx.conf`` that whitelists the analysis pod for egress and the message
+    broker / pod orchestrator for ingress.
+
+    Args:
+        analysis_name: Name of the analysis deployment.
+        analysis_service_name: Upstream service for ``/analysis`` ingress.
+        nginx_name: Name of the nginx deployment (used to prefix the config
+            map name).
+        analysis_env: Analysis config containing ``ANALYSIS_ID`` and
+            ``PROJECT_ID`` used in location matches.
+        namespace: Namespace in which to create the ConfigMap.
+        node_services: Pre-discovered node services, shared across analyses.
+
+    Returns:
+        Name of the created ConfigMap (``{nginx_name}-config``).
+
+    Raises:
+        ValueError: If ``analysis_env`` is ``None`` or the pod orchestration
+            pod cannot be found.
+    """
+    if analysis_env is None:
+        logger.error(f"Error creating an nginx failed since no analysis_env containing analysis and poject id was provided.")
+        raise ValueError(f"Error creating an nginx failed since no analysis_env containing analysis and poject id was provided.")
+    core_client = client.CoreV1Api()
+
+    if node_services is None:
+        node_services = discover_node_services(namespace)
+    message_broker_service_name = node_services['message_broker_service_name']
+    message_broker_ip = node_services['message_broker_ip']
+    po_service_name = node_services['po_service_name']
+    pod_orchestration_ip = node_services['pod_orchestration_ip']
+    hub_adapter_service_name = node_services['hub_adapter_service_name']
+    kong_proxy_name = node_services['kong_proxy_name']
+    storage_service_name = node_services['storage_service_name']
+
+    # await and get analysis pod ip
+    analysis_ip = None
+    while analysis_ip is None:
+        pod_list_object = core_client.list_namespaced_pod(label_selector=f"app={analysis_name}",
+                                                          watch=False,
+                                                          namespace=namespace)
+
+        if len(pod_list_object.items) > 0:
+            analysis_ip = pod_list_object.items[0].status.pod_ip
+        time.sleep(1)
+
     # generate config map
     data = {
             "nginx.conf": f"""
@@ -662,15 +831,19 @@ def _get_logs(name: str, pod_ids: Optional[list[str]] = None, namespace: str = '
                 logger.error(f"APIException while trying to retrieve pod logs for pod_name={pod.metadata.name}: "
                              f"{repr(e)}")
     # sanitize pod logs
-    final_logs = []
-    for log in pod_logs:
-        log = ''.join(filter(lambda x: x in string.printable, log))
-        log = '\n'.join([l for l in log.split('\n')
-                         if not l.startswith('INFO:') and
-                         not (l.endswith('"GET /healthz HTTP/1.0" 200 OK') or
-                              l.endswith('"POST /webhook HTTP/1.0" 200 OK'))])
-        final_logs.append(log)
-    return final_logs
+    return ['\n'.join(_sanitize_log_lines(log.split('\n'))) for log in pod_logs]
+
+
+def _sanitize_log_lines(lines: list[str]) -> list[str]:
+    """Strip non-printable characters and drop INFO and routine health/webhook access lines."""
+    sanitized = []
+    for line in lines:
+        line = ''.join(filter(lambda x: x in string.printable, line))
+        if not line.startswith('INFO:') and \
+                not (line.endswith('"GET /healthz HTTP/1.0" 200 OK') or
+                     line.endswith('"POST /webhook HTTP/1.0" 200 OK')):
+            sanitized.append(line)
+    return sanitized
 
 
 def _get_pods(name: str, namespace: str = 'default') -> list[str]:
@@ -42,7 +42,7 @@ def find_k8s_resources(resource_type: str,
 
     Args:
         resource_type: One of ``deployment``, ``pod``, ``service``,
-            ``networkpolicy``, ``configmap``, or ``job``.
+            ``networkpolicy``, ``configmap``, ``secret``, or ``job``.
         selector_type: Whether ``selector_arg`` is a ``label`` or ``field``
             selector.
         selector_arg: Selector expression (required if ``selector_type`` is set).
@@ -57,9 +57,9 @@ def find_k8s_resources(resource_type: str,
     Raises:
         ValueError: On an unknown ``resource_type`` or missing ``selector_arg``.
     """
-    if resource_type not in ['deployment', 'pod', 'service', 'networkpolicy', 'configmap', 'job']:
+    if resource_type not in ['deployment', 'pod', 'service', 'networkpolicy', 'configmap', 'secret', 'job']:
         raise ValueError("For k8s resource search: resource_type must be one of 'deployment', 'pod', 'service', "
-                         "'networkpolicy', 'configmap', or 'job")
+                         "'networkpolicy', 'configmap', 'secret', or 'job")
     if (selector_type is not None) and (selector_type not in ['label', 'field']):
         raise ValueError("For k8s resource search: selector_type must be either 'label' or 'field'")
     if (selector_type is not None) and (selector_arg is None):
@@ -73,7 +73,7 @@ def find_k8s_resources(resource_type: str,
         resources = client.AppsV1Api().list_namespaced_deployment(**kwargs)
     elif resource_type == 'networkpolicy':
         resources = client.NetworkingV1Api().list_namespaced_network_policy(**kwargs)
-    elif resource_type in ['pod', 'service', 'configmap']:
+    elif resource_type in ['pod', 'service', 'configmap', 'secret']:
         core_client = client.CoreV1Api()
         if resource_type == 'pod':
             resources = core_client.list_namespaced_pod(**kwargs)
@@ -81,6 +81,8 @@ def find_k8s_resources(resource_type: str,
             resources = core_client.list_namespaced_service(**kwargs)
         elif resource_type == 'configmap':
             resources = core_client.list_namespaced_config_map(**kwargs)
+        elif resource_type == 'secret':
+            resources = core_client.list_namespaced_secret(**kwargs)
         else:
             raise RuntimeError("Undefined resource")
     elif resource_type == 'job':
@@ -103,7 +105,7 @@ def delete_k8s_resource(name: str, resource_type: str, namespace: str = 'default
     Args:
         name: Name of the resource to delete.
         resource_type: One of ``deployment``, ``service``, ``pod``,
-            ``configmap``, ``networkpolicy``, or ``job``.
+            ``configmap``, ``secret``, ``networkpolicy``, or ``job``.
         namespace: Namespace the resource lives in.
 
     Raises:
@@ -138,6 +140,13 @@ def delete_k8s_resource(name: str, resource_type: str, namespace: str = 'default
         except client.exceptions.ApiException as e:
             if e.reason != 'Not Found':
                 logger.error(f"Not Found {name} configmap")
+    elif resource_type == 'secret':
+        try:
+            core_client = client.CoreV1Api()
+            core_client.delete_namespaced_secret(name=name, namespace=namespace)
+        except client.exceptions.ApiException as e:
+            if e.reason != 'Not Found':
+                logger.error(f"Not Found {name} secret")
     elif resource_type == 'networkpolicy':
         try:
             network_client = client.NetworkingV1Api()
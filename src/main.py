@@ -7,9 +7,11 @@ load_dotenv(find_dotenv())
 
 
 from src.resources.database.entity import Database
+from src.resources.database.cache import CachedDatabase
 from src.api.api import PodOrchestrationAPI
 from src.k8s.utils import get_current_namespace, load_cluster_config
 from src.status.status import status_loop
+from src.utils.token import start_keycloak_client_pool
 from src.utils.po_logging import get_logger
 
 
@@ -20,8 +22,9 @@ def main():
     """Entry point for the Pod Orchestration service.
 
     Loads the in-cluster Kubernetes configuration, initializes the database,
-    spawns the FastAPI server in a background thread, and starts the blocking
-    status monitoring loop on the main thread.
+    spawns the FastAPI server in a background thread, starts the database
+    change feed, and starts the blocking status monitoring loop on the main
+    thread.
     """
     # load cluster config
     load_cluster_config()
@@ -29,12 +32,21 @@ def main():
     if not os.getenv('NGINX_IMAGE'):
         logger.warning("Environment variable 'NGINX_IMAGE' is not set, defaulting to 'nginx:1.29.8'.")
 
-    # init database
-    database = Database()
+    # init database (optionally serving deployment state from memory)
+    if os.getenv('PO_STATE_CACHE') in ['True', 'true', '1', 't']:
+        database = CachedDatabase()
+    else:
+        database = Database()
+
+    # pre-provision keycloak clients for upcoming analyses
+    start_keycloak_client_pool()
 
     api_thread = Thread(target=start_po_api, kwargs={'database': database, 'namespace': get_current_namespace()})
     api_thread.start()
 
+    # report row changes (incl. those of other processes) to the cache, status stream and status loop
+    database.start_change_feed()
+
     # start status loop
     status_loop(database, int(os.getenv('STATUS_LOOP_INTERVAL', '10')))
 
@@ -1,12 +1,14 @@
 import json
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import inspect
 
-from src.k8s.kubernetes import create_analysis_deployment, delete_deployment
+from src.k8s.kubernetes import HARBOR_SECRET_NAME, create_analysis_deployment, delete_deployment
 from src.utils.token import create_analysis_tokens
 from src.resources.database.db_models import AnalysisDB
 from src.resources.database.entity import Database
+from src.resources.log.entity import LogQuery
 from src.status.constants import AnalysisStatus
 
 
@@ -36,7 +38,11 @@ class Analysis(BaseModel):
     log: Optional[str] = None
     pod_ids: Optional[list[str]] = None
 
-    def start(self, database: Database, namespace: str = 'default') -> None:
+    def start(self,
+              database: Database,
+              namespace: str = 'default',
+              node_services: Optional[dict[str, str]] = None,
+              image_pull_secret: str = HARBOR_SECRET_NAME) -> None:
         """Deploy the analysis on Kubernetes and persist it in the database.
 
         Generates the deployment name, mints the Kong and Keycloak tokens,
@@ -46,6 +52,10 @@ class Analysis(BaseModel):
         Args:
             database: Database wrapper used to persist the new deployment.
             namespace: Namespace the Kubernetes resources are created in.
+            node_services: Pre-discovered node services for the nginx config
+                (see :func:`discover_node_services`).
+            image_pull_secret: Name of the Harbor pull secret holding this
+                analysis' registry credentials.
         """
         self.status = AnalysisStatus.STARTED.value
         self.deployment_name = "analysis-" + self.analysis_id + "-" + str(self.restart_counter)
@@ -58,7 +68,9 @@ class Analysis(BaseModel):
         self.pod_ids = create_analysis_deployment(name=self.deployment_name,
                                                   image=self.image_url,
                                                   env=self.analysis_config,
-                                                  namespace=namespace)
+                                                  namespace=namespace,
+                                                  node_services=node_services,
+                                                  image_pull_secret=image_pull_secret)
 
         database.create_analysis(analysis_id=self.analysis_id,
                                  deployment_name=self.deployment_name,
@@ -99,8 +111,11 @@ class Analysis(BaseModel):
 def read_db_analysis(analysis: AnalysisDB) -> Analysis:
     """Convert a persisted :class:`AnalysisDB` row into a runtime :class:`Analysis`.
 
-    Decodes the JSON-encoded ``pod_ids`` column back into a Python list.
+    Decodes the JSON-encoded ``pod_ids`` column back into a Python list. The
+    deferred ``log`` column is only taken over if it was loaded with the row.
     """
+    state = inspect(analysis, raiseerr=False)
+    log_loaded = (state is None) or ('log' not in state.unloaded)
     return Analysis(analysis_id=analysis.analysis_id,
                     deployment_name=analysis.deployment_name,
                     project_id=analysis.project_id,
@@ -110,7 +125,7 @@ def read_db_analysis(analysis: AnalysisDB) -> Analysis:
                     registry_password=analysis.registry_password,
                     status=analysis.status,
                     pod_ids=json.loads(analysis.pod_ids),
-                    log=analysis.log,
+                    log=analysis.log if log_loaded else None,
                     namespace=analysis.namespace,
                     kong_token=analysis.kong_token,
                     restart_counter=analysis.restart_counter,
@@ -129,3 +144,25 @@ class CreateAnalysis(BaseModel):
     kong_token: str
     restart_counter: int = 0
     progress: int = 0
+
+
+class AnalysisQuery(BaseModel):
+    """Query parameters for filtering and paginating the ``/po/status``, ``/po/history`` and ``/po/pods`` listings."""
+
+    status: Optional[list[str]] = None
+    project_id: Optional[str] = None
+    created_after: Optional[float] = None
+    limit: Optional[int] = Field(default=None, ge=1)
+    offset: int = Field(default=0, ge=0)
+
+
+class HistoryQuery(AnalysisQuery, LogQuery):
+    """Query parameters of ``/po/history``: the listing filters plus the log record filters."""
+
+    def analysis_query(self) -> AnalysisQuery:
+        """Return the listing filters and pagination."""
+        return AnalysisQuery(**self.model_dump(include=set(AnalysisQuery.model_fields)))
+
+    def log_query(self) -> LogQuery:
+        """Return the log record filters."""
+        return LogQuery(**self.model_dump(include=set(LogQuery.model_fields)))
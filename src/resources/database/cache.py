@@ -0,0 +1,189 @@
+import threading
+from typing import Any, Optional, Union
+
+from sqlalchemy.engine import Row
+
+from src.resources.database.db_models import AnalysisDB, ArchiveDB
+from src.resources.database.entity import Database
+from src.status.constants import _TERMINAL_STATUSES
+
+
+class CachedDatabase(Database):
+    """:class:`Database` with an in-memory cache of the latest deployment of every analysis.
+
+    The orchestrator is the only writer of the analysis table, so the current
+    deployment state can be served from memory. The cache holds the latest
+    deployment row (without the deferred ``log`` column) per analysis id. It
+    is loaded in full on first use; every write path marks the analyses it
+    touches as stale, and the next read reloads just those in one query.
+    Changes made by other processes are picked up through the change feed
+    once it is started (see :meth:`Database.start_change_feed`).
+
+    Reads needing data the cache does not hold (``with_log=True``, archived
+    analyses) go to the database. Cached rows are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # held while refreshing, so an invalidation can't be overwritten by a read that started before it
+        self._cache_lock = threading.RLock()
+        self._latest: dict[str, AnalysisDB] = {}
+        self._deployment_analysis_ids: dict[str, str] = {}
+        self._cache_loaded = False
+        self._stale: set[str] = set()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self.add_change_listener(lambda analysis_id, _: self.invalidate_cache(analysis_id))
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Return the number of cached analyses, hit/miss counters and the hit rate of the state cache."""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {'enabled': True,
+                    'entries': len(self._latest),
+                    'hits': self._cache_hits,
+                    'misses': self._cache_misses,
+                    'hit_rate': self._cache_hits / lookups if lookups else 0.0}
+
+    def invalidate_cache(self, analysis_id: Optional[str] = None) -> None:
+        """Mark an analysis (``None``: all analyses) as stale, so its state is reloaded on the next read."""
+        with self._cache_lock:
+            if analysis_id is None:
+                self._cache_loaded = False
+                self._stale.clear()
+            else:
+                self._stale.add(analysis_id)
+
+    def _current(self) -> dict[str, AnalysisDB]:
+        """Return the up-to-date cache, (re)loading it from the database if needed (caller holds the lock)."""
+        if not self._cache_loaded:
+            self._cache_misses += 1
+            self._latest = super().get_latest_deployments()
+            self._deployment_analysis_ids = {deployment.deployment_name: analysis_id
+                                             for analysis_id, deployment in self._latest.items()}
+            self._cache_loaded = True
+            self._stale.clear()
+        elif self._stale:
+            self._cache_misses += 1
+            stale = list(self._stale)
+            refreshed = super().get_latest_deployments(stale)
+            for analysis_id in stale:
+                previous = self._latest.pop(analysis_id, None)
+                if previous is not None:
+                    self._deployment_analysis_ids.pop(previous.deployment_name, None)
+                if analysis_id in refreshed:
+                    self._latest[analysis_id] = refreshed[analysis_id]
+                    self._deployment_analysis_ids[refreshed[analysis_id].deployment_name] = analysis_id
+            self._stale.clear()
+        else:
+            self._cache_hits += 1
+        return self._latest
+
+    def _analysis_id_of(self, deployment_name: str) -> Optional[str]:
+        """Resolve a deployment name to its analysis id, from the cache if it is a latest deployment."""
+        with self._cache_lock:
+            analysis_id = self._deployment_analysis_ids.get(deployment_name)
+        if analysis_id is None:
+            with self.SessionLocal() as session:
+                analysis_id = session.query(AnalysisDB.analysis_id) \
+                    .filter(AnalysisDB.deployment_name == deployment_name) \
+                    .scalar()
+        return analysis_id
+
+    def get_latest_deployment(self, analysis_id: str, with_log: bool = False) -> Optional[AnalysisDB]:
+        if with_log:
+            return super().get_latest_deployment(analysis_id, with_log=True)
+        with self._cache_lock:
+            return self._current().get(analysis_id)
+
+    def get_latest_deployment_summary(self, analysis_id: str) -> Optional[AnalysisDB]:
+        return self.get_latest_deployment(analysis_id)
+
+    def get_latest_deployments(self,
+                               analysis_ids: Optional[list[str]] = None,
+                               with_log: bool = False,
+                               include_archived: bool = False) -> dict[str, Union[AnalysisDB, ArchiveDB]]:
+        if with_log or include_archived:
+            return super().get_latest_deployments(analysis_ids, with_log=with_log, include_archived=include_archived)
+        with self._cache_lock:
+            latest = self._current()
+            if analysis_ids is None:
+                return dict(sorted(latest.items(), key=lambda item: item[1].id))
+            return {analysis_id: latest[analysis_id] for analysis_id in analysis_ids if analysis_id in latest}
+
+    def get_latest_deployment_summaries(self,
+                                        analysis_ids: Optional[list[str]] = None,
+                                        include_archived: bool = False) -> dict[str, Row]:
+        if include_archived:
+            return super().get_latest_deployment_summaries(analysis_ids, include_archived=True)
+        return self.get_latest_deployments(analysis_ids)
+
+    def analysis_is_running(self, analysis_id: str) -> bool:
+        deployment = self.get_latest_deployment(analysis_id)
+        return (deployment is not None) and (deployment.status not in _TERMINAL_STATUSES)
+
+    def reset_db(self) -> None:
+        super().reset_db()
+        self.invalidate_cache()
+
+    def create_analysis(self, analysis_id: str, *args, **kwargs) -> AnalysisDB:
+        try:
+            return super().create_analysis(analysis_id, *args, **kwargs)
+        finally:
+            self.invalidate_cache(analysis_id)
+
+    def update_analysis(self, analysis_id: str, **kwargs) -> int:
+        try:
+            return super().update_analysis(analysis_id, **kwargs)
+        finally:
+            self.invalidate_cache(analysis_id)
+
+    def update_deployment(self, deployment_name: str, **kwargs) -> AnalysisDB:
+        analysis_id = self._analysis_id_of(deployment_name)
+        try:
+            return super().update_deployment(deployment_name, **kwargs)
+        finally:
+            self.invalidate_cache(analysis_id)
+
+    def delete_analysis(self, analysis_id: str) -> None:
+        try:
+            super().delete_analysis(analysis_id)
+        finally:
+            self.invalidate_cache(analysis_id)
+
+    def delete_deployment(self, deployment_name: str) -> None:
+        analysis_id = self._analysis_id_of(deployment_name)
+        try:
+            super().delete_deployment(deployment_name)
+        finally:
+            self.invalidate_cache(analysis_id)
+
+    def delete_old_deployments_from_db(self, analysis_id: str) -> None:
+        try:
+            super().delete_old_deployments_from_db(analysis_id)
+        finally:
+            self.invalidate_cache(analysis_id)
+
+    def append_analysis_logs_batch(self, logs: dict[str, list], *args, **kwargs) -> set[str]:
+        try:
+            progress_updated = super().append_analysis_logs_batch(logs, *args, **kwargs)
+        except Exception:
+            for analysis_id in logs:
+                self.invalidate_cache(analysis_id)
+            raise
+        # plain log lines leave the deployment rows untouched
+        for analysis_id in progress_updated:
+            self.invalidate_cache(analysis_id)
+        return progress_updated
+
+    def archive_terminal_analyses(self) -> list[str]:
+        try:
+            archived = super().archive_terminal_analyses()
+        except Exception:
+            # earlier batches may have been moved already
+            self.invalidate_cache()
+            raise
+        for analysis_id in archived:
+            self.invalidate_cache(analysis_id)
+        return archived
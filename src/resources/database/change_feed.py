@@ -0,0 +1,190 @@
+import json
+import os
+import select
+import threading
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.utils.po_logging import get_logger
+
+
+logger = get_logger()
+
+_CHANGE_FEED_POLL_INTERVAL = float(os.getenv('PO_CHANGE_FEED_POLL_INTERVAL', '10'))  # Seconds between polls (fallback)
+_CHANGE_FEED_CHANNEL = 'po_analysis_changes'
+
+_TRIGGER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION po_notify_analysis_change() RETURNS trigger AS $$
+DECLARE
+    changed_id text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.analysis_id;
+    ELSE
+        changed_id := NEW.analysis_id;
+    END IF;
+    PERFORM pg_notify('{_CHANGE_FEED_CHANNEL}', json_build_object('op', TG_OP, 'analysis_id', changed_id)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+class ChangeFeed:
+    """Feed of row changes in the ``analysis`` table, dispatched to listeners on a background thread.
+
+    On PostgreSQL an ``AFTER INSERT OR UPDATE OR DELETE`` trigger publishes
+    every changed row via ``pg_notify`` and the feed thread ``LISTEN``s on a
+    dedicated connection. Identical notifications within one transaction are
+    folded by PostgreSQL, so a set-based write reports each analysis once.
+    Changes missed while the connection was down are recovered by comparing
+    snapshots when it is re-established.
+
+    Where ``NOTIFY`` is unavailable (other dialects, missing privileges) the
+    feed degrades to polling: every ``poll_interval`` seconds the latest
+    deployment state of all analyses is compared with the previous snapshot,
+    so only changes to the latest deployment (name, status, progress) are seen.
+
+    Listeners are called as ``listener(analysis_id, operation)`` with
+    ``operation`` one of ``'INSERT'``, ``'UPDATE'`` or ``'DELETE'``. They run
+    on the feed thread and must not block; a change may be reported more than
+    once, so they should be idempotent.
+
+    Attributes:
+        engine: Engine of the analysis database.
+        snapshot: Callable returning the latest deployment state per analysis
+            id (compared by equality).
+        poll_interval: Seconds between polls, and the upper bound for
+            noticing a stop request.
+        mode: ``'notify'`` or ``'polling'`` once started, ``None`` before.
+    """
+
+    def __init__(self,
+                 engine: Engine,
+                 snapshot: Callable[[], dict[str, Any]],
+                 poll_interval: float = _CHANGE_FEED_POLL_INTERVAL) -> None:
+        self.engine = engine
+        self.snapshot = snapshot
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._states: Optional[dict[str, Any]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Register a callback invoked as ``listener(analysis_id, operation)`` for every row change."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Install the notification trigger if possible and start the feed thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self.mode = 'notify' if self.install_trigger() else 'polling'
+        logger.info(f"Starting analysis change feed ({self.mode})")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='po-change-feed', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the feed thread (returns within ``poll_interval`` seconds)."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def install_trigger(self) -> bool:
+        """(Re)create the ``NOTIFY`` trigger on the analysis table.
+
+        Returns:
+            ``True`` if the trigger is in place, ``False`` if the database
+            does not support it (the feed then polls).
+        """
+        if self.engine.dialect.name != 'postgresql':
+            return False
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(text(_TRIGGER_FUNCTION))
+                connection.execute(text("DROP TRIGGER IF EXISTS po_analysis_change ON analysis"))
+                connection.execute(text("CREATE TRIGGER po_analysis_change "
+                                        "AFTER INSERT OR UPDATE OR DELETE ON analysis "
+                                        "FOR EACH ROW EXECUTE FUNCTION po_notify_analysis_change()"))
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to install analysis change trigger, falling back to polling: {repr(e)}")
+            return False
+
+    def poll(self) -> int:
+        """Compare the current state with the previous snapshot and report the differences.
+
+        The first call only records the snapshot.
+
+        Returns:
+            Number of changes reported.
+        """
+        states = self.snapshot()
+        previous, self._states = self._states, states
+        if previous is None:
+            return 0
+        changes = [(analysis_id, 'DELETE') for analysis_id in previous.keys() - states.keys()]
+        for analysis_id, state in states.items():
+            if analysis_id not in previous:
+                changes.append((analysis_id, 'INSERT'))
+            elif previous[analysis_id] != state:
+                changes.append((analysis_id, 'UPDATE'))
+        for analysis_id, operation in changes:
+            self._publish(analysis_id, operation)
+        return len(changes)
+
+    def _publish(self, analysis_id: str, operation: str) -> None:
+        """Report one change to all listeners (listener errors are logged, not raised)."""
+        for listener in list(self._listeners):
+            try:
+                listener(analysis_id, operation)
+            except Exception as e:
+                logger.warning(f"Change listener failed for analysis {analysis_id}: {repr(e)}")
+
+    def _dispatch(self, payload: str) -> None:
+        """Report the change described by a notification payload (malformed payloads are logged and skipped)."""
+        try:
+            change = json.loads(payload)
+            analysis_id, operation = change['analysis_id'], change['op']
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring malformed analysis change notification {payload!r}: {repr(e)}")
+            return
+        self._publish(analysis_id, operation)
+
+    def _run(self) -> None:
+        """Feed thread body: listen for notifications, or poll, until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                if self.mode == 'notify':
+                    self._listen()
+                else:
+                    self.poll()
+            except Exception as e:
+                logger.warning(f"Analysis change feed failed ({self.mode}), retrying: {repr(e)}")
+            self._stop_event.wait(self.poll_interval)
+
+    def _listen(self) -> None:
+        """``LISTEN`` on a dedicated connection and dispatch notifications until stopped or disconnected."""
+        raw_connection = self.engine.raw_connection()
+        connection = raw_connection.dbapi_connection
+        # keep the autocommit connection out of the pool
+        raw_connection.detach()
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {_CHANGE_FEED_CHANNEL}")
+            # catch up on changes made while not listening
+            self.poll()
+            while not self._stop_event.is_set():
+                if not select.select([connection], [], [], self.poll_interval)[0]:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self._dispatch(connection.notifies.pop(0).payload)
+        finally:
+            raw_connection.close()
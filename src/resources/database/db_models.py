@@ -1,6 +1,7 @@
 from typing import Any
-from sqlalchemy import JSON, Column, Integer, String, Float
+from sqlalchemy import JSON, Column, Integer, String, Float, Index, LargeBinary
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
+from sqlalchemy.orm import deferred
 
 
 @as_declarative()
@@ -18,9 +19,16 @@ class Base:
 
 
 class AnalysisDB(Base):
-    """ORM model tracking the current state of an analysis deployment."""
+    """ORM model tracking the current state of an analysis deployment.
+
+    The legacy ``log`` column can hold a full log dump and is deferred: it is
+    only loaded when a query asks for it (``undefer``) or selects it directly.
+    """
 
     __tablename__ = "analysis"
+    __table_args__ = (Index('ix_analysis_analysis_id_time_created', 'analysis_id', 'time_created'),
+                      Index('ix_analysis_status', 'status'),
+                      Index('ix_analysis_time_created', 'time_created'))
     id = Column(Integer, primary_key=True, index=True)
     deployment_name = Column(String, unique=True, index=True)
     analysis_id = Column(String, unique=False, index=True)
@@ -30,7 +38,7 @@ class AnalysisDB(Base):
     registry_user = Column(String, nullable=True)
     registry_password = Column(String, nullable=True)
     status = Column(String, nullable=True)
-    log = Column(String, nullable=True)
+    log = deferred(Column(String, nullable=True))
     pod_ids = Column(JSON, nullable=True)
     namespace = Column(String, nullable=True)
     kong_token = Column(String, nullable=True)
@@ -40,10 +48,53 @@ class AnalysisDB(Base):
     time_updated = Column(Float, nullable=True)
 
 
+class AnalysisLogDB(Base):
+    """ORM model for streamed analysis log lines, appended one row per line and ordered by ``seq``.
+
+    Lines posted by analyses are stored as typed records (``level``,
+    ``status``, ``progress``, ``created_at``); lines without these fields
+    (e.g. appended as plain text) leave them empty.
+    """
+
+    __tablename__ = "analysis_log"
+    __table_args__ = (Index('ix_analysis_log_analysis_id_seq', 'analysis_id', 'seq', unique=True),
+                      Index('ix_analysis_log_analysis_id_created_at', 'analysis_id', 'created_at'))
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(String, nullable=False)
+    seq = Column(Integer, nullable=False)
+    log = Column(String, nullable=True)
+    time_created = Column(Float, nullable=True)
+    entity_id = Column(String, nullable=True)
+    level = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    progress = Column(Integer, nullable=True)
+    created_at = Column(Float, nullable=True)
+
+
+class LogSnapshotDB(Base):
+    """ORM model for the zstd-compressed pod log snapshot taken when an analysis is stopped."""
+
+    __tablename__ = "log_snapshot"
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(String, unique=True, index=True, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    truncated_lines = Column(Integer, nullable=False, default=0)
+    time_created = Column(Float, nullable=True)
+    format_version = Column(Integer, nullable=False)  # 1: JSON
+
+
 class ArchiveDB(Base):
-    """ORM model mirroring :class:`AnalysisDB` for completed analyses kept for history."""
+    """ORM model mirroring :class:`AnalysisDB` for completed analyses kept for history.
+
+    Deployments of analyses that terminated long enough ago are moved here
+    (stamped with ``time_archived``), keeping the ``analysis`` table scanned by
+    the status loop small. Like in :class:`AnalysisDB`, ``log`` is deferred.
+    """
 
     __tablename__ = "archive"
+    __table_args__ = (Index('ix_archive_analysis_id_time_created', 'analysis_id', 'time_created'),)
     id = Column(Integer, primary_key=True, index=True)
     deployment_name = Column(String, unique=True, index=True)
     analysis_id = Column(String, unique=False, index=True)
@@ -53,7 +104,7 @@ class ArchiveDB(Base):
     registry_user = Column(String, nullable=True)
     registry_password = Column(String, nullable=True)
     status = Column(String, nullable=True)
-    log = Column(String, nullable=True)
+    log = deferred(Column(String, nullable=True))
     pod_ids = Column(JSON, nullable=True)
     namespace = Column(String, nullable=True)
     kong_token = Column(String, nullable=True)
@@ -61,4 +112,4 @@ class ArchiveDB(Base):
     progress = Column(Integer, nullable=True, default=0)
     time_created = Column(Float, nullable=True)
     time_updated = Column(Float, nullable=True)
-
+    time_archived = Column(Float, nullable=True)
@@ -1,17 +1,50 @@
+import ast
 import json
 import os
+import threading
 import time
-from typing import Optional
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional, Union
+from sqlalchemy import create_engine, func, insert, inspect, literal, select, text, union_all
+from sqlalchemy.orm import sessionmaker, undefer
+from sqlalchemy.engine import Row
+import orjson
+import zstandard
 
-from src.status.constants import AnalysisStatus
-from src.resources.database.db_models import Base, AnalysisDB
+from src.status.constants import AnalysisStatus, _TERMINAL_STATUSES
+from src.resources.database.db_models import Base, AnalysisDB, AnalysisLogDB, ArchiveDB, LogSnapshotDB
+from src.resources.database.change_feed import ChangeFeed
+from src.resources.log.entity import LogEntity
 from src.utils.po_logging import get_logger
 
 
 logger = get_logger()
 
+_LOG_MAX_LINES = int(os.getenv('PO_LOG_MAX_LINES', '100000'))  # Streamed lines kept per analysis, oldest dropped first
+_LOG_SNAPSHOT_MAX_BYTES = int(os.getenv('PO_LOG_SNAPSHOT_MAX_BYTES', str(16 * 1024 * 1024)))  # Per stop snapshot
+_LOG_RETENTION_DAYS = float(os.getenv('PO_LOG_RETENTION_DAYS', '30'))  # Log retention for terminal analyses (0: keep)
+_LOG_ZSTD_LEVEL = 9  # snapshots are written once and rarely read, so favour ratio over speed
+_LOG_SNAPSHOT_FORMAT = 1  # zstd-compressed JSON
+_ARCHIVE_AFTER_DAYS = float(os.getenv('PO_ARCHIVE_AFTER_DAYS', '7'))  # Terminal analyses archived after this (0: never)
+_ARCHIVE_BATCH_SIZE = int(os.getenv('PO_ARCHIVE_BATCH_SIZE', '100'))  # Analyses moved per archival transaction
+_DB_POOL_SIZE = int(os.getenv('PO_DB_POOL_SIZE', '0'))  # Pooled connections (0: one per thread that may hold a session)
+_DB_MAX_OVERFLOW = int(os.getenv('PO_DB_MAX_OVERFLOW', '10'))  # Extra connections opened beyond the pool under bursts
+
+# thread pools whose workers may hold a session, with the defaults of their settings
+_DB_WORKER_SETTINGS = (('PO_DB_WORKERS', 8), ('PO_K8S_WORKERS', 8), ('PO_LOG_STREAM_WORKERS', 16),
+                       ('PO_OPERATION_WORKERS', 4), ('PO_BATCH_CREATE_WORKERS', 4))
+_DB_BACKGROUND_THREADS = 3  # status loop, progress flusher, change feed poller
+
+_LOG_RECORD_DEFAULTS = {'log': None, 'entity_id': None, 'level': None, 'status': None, 'progress': None,
+                        'created_at': None}
+
+# columns of the lightweight deployment summaries used by status checks and the status loop
+_SUMMARY_COLUMNS = (AnalysisDB.analysis_id,
+                    AnalysisDB.deployment_name,
+                    AnalysisDB.status,
+                    AnalysisDB.progress,
+                    AnalysisDB.time_created)
+
 
 class Database:
     """Thin CRUD wrapper around the PostgreSQL-backed analysis database.
@@ -19,6 +52,31 @@ class Database:
     Each method opens a short-lived SQLAlchemy session via the ``SessionLocal``
     factory and commits before returning. ``pool_pre_ping`` and a one-hour
     recycle window guard against stale connections.
+
+    Every write bumps an in-memory state version so readers (e.g. the status
+    endpoints' ETags) can cheaply detect whether anything changed. Writes that
+    touch an analysis' status or progress are additionally reported to the
+    registered status listeners.
+
+    Streamed log lines are kept in the append-only ``analysis_log`` table,
+    numbered per analysis by ``seq``; the next ``seq`` of each analysis is
+    cached in memory so appending never reads existing lines. Only the newest
+    ``PO_LOG_MAX_LINES`` lines of an analysis are kept. The pod logs captured
+    when an analysis stops are stored zstd-compressed in ``log_snapshot``, and
+    both are purged ``PO_LOG_RETENTION_DAYS`` after an analysis terminated.
+
+    Deployment rows are returned without their legacy ``log`` column unless
+    requested (``with_log=True``); id and status lookups select only the
+    columns they need.
+
+    Analyses that terminated more than ``PO_ARCHIVE_AFTER_DAYS`` ago are moved
+    to the ``archive`` table. Only lookups that pass ``include_archived=True``
+    (the history) see them; everything else works on the hot table only.
+
+    Row changes of the analysis table, including those made by other
+    processes, are reported to the registered change listeners by a
+    :class:`ChangeFeed` (``LISTEN``/``NOTIFY``, or polling where unavailable)
+    once :meth:`start_change_feed` was called.
     """
 
     def __init__(self) -> None:
@@ -33,37 +91,243 @@ class Database:
         logger.debug(f"Connecting to database at postgresql+psycopg2://{user}:*******@{host}:{port}/{database}")
 
         self.engine = create_engine(conn_uri,
+                                    pool_size=_DB_POOL_SIZE or self._default_pool_size(),
+                                    max_overflow=_DB_MAX_OVERFLOW,
                                     pool_pre_ping=True,
                                     pool_recycle=3600)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         Base.metadata.create_all(bind=self.engine)
+        self._add_archive_time_column()
+        self._create_missing_indexes()
+
+        self._state_lock = threading.Lock()
+        self._state_version = 0
+        self._state_changed_at = time.time()
+        self._status_listeners: list[Callable[[str, str, Optional[int]], None]] = []
+        self._log_seq_lock = threading.Lock()
+        self._next_log_seqs: dict[str, int] = {}
+        self._change_feed = ChangeFeed(self.engine, self._latest_states)
+        # writes of other processes invalidate the state version as well
+        self._change_feed.add_listener(lambda *_: self._bump_state_version())
+
+    @staticmethod
+    def _default_pool_size() -> int:
+        """Return one connection for every thread that may hold a session at the same time."""
+        return sum(int(os.getenv(name, str(default))) for name, default in _DB_WORKER_SETTINGS) + _DB_BACKGROUND_THREADS
+
+    def _add_archive_time_column(self) -> None:
+        """Add ``archive.time_archived`` to archive tables created before it existed (``create_all`` skips them)."""
+        if 'time_archived' in {column['name'] for column in inspect(self.engine).get_columns('archive')}:
+            return
+        column_type = ArchiveDB.__table__.c.time_archived.type.compile(dialect=self.engine.dialect)
+        with self.engine.begin() as connection:
+            connection.execute(text(f'ALTER TABLE archive ADD COLUMN time_archived {column_type}'))
+
+    def _create_missing_indexes(self) -> None:
+        """Create indexes added after the tables were first created (``create_all`` skips existing tables)."""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+
+    def _bump_state_version(self) -> None:
+        """Record that a deployment row was written."""
+        with self._state_lock:
+            self._state_version += 1
+            self._state_changed_at = time.time()
+
+    def add_status_listener(self, listener: Callable[[str, str, Optional[int]], None]) -> None:
+        """Register a callback invoked as ``listener(analysis_id, status, progress)`` after status/progress writes.
+
+        Listeners run synchronously on the writing thread and must not block.
+        """
+        self._status_listeners.append(listener)
+
+    def _notify_status_listeners(self, deployment: Union[AnalysisDB, Row]) -> None:
+        """Report the status and progress of a freshly written deployment row (or summary) to all listeners."""
+        for listener in self._status_listeners:
+            try:
+                listener(deployment.analysis_id, deployment.status, deployment.progress)
+            except Exception as e:
+                logger.warning(f"Status listener failed for analysis {deployment.analysis_id}: {repr(e)}")
+
+    def add_change_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Register a callback invoked as ``listener(analysis_id, operation)`` for row changes of the analysis table.
+
+        Listeners run on the change feed thread and must not block (see :class:`ChangeFeed`).
+        """
+        self._change_feed.add_listener(listener)
+
+    def start_change_feed(self) -> None:
+        """Start reporting row changes of the analysis table to the change listeners."""
+        self._change_feed.start()
+
+    def get_change_feed_mode(self) -> Optional[str]:
+        """Return how row changes are detected (``'notify'`` or ``'polling'``), ``None`` if the feed is not started."""
+        return self._change_feed.mode
+
+    def _latest_states(self) -> dict[str, tuple[str, str, Optional[int]]]:
+        """Return the deployment name, status and progress of the latest deployment per analysis (change feed polling)."""
+        with self.SessionLocal() as session:
+            rows = session.query(*_SUMMARY_COLUMNS) \
+                .filter(AnalysisDB.id.in_(self._latest_ids(session, None))) \
+                .all()
+        return {row.analysis_id: (row.deployment_name, row.status, row.progress) for row in rows}
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Return the statistics of the deployment state cache (see :class:`CachedDatabase`); disabled here."""
+        return {'enabled': False}
+
+    def get_state_version(self) -> tuple[int, float]:
+        """Return the current state version and the Unix time it last changed.
+
+        The version increases monotonically with every write made through this
+        instance and restarts at zero when the process restarts.
+        """
+        with self._state_lock:
+            return self._state_version, self._state_changed_at
 
     def reset_db(self) -> None:
         """Drop and recreate all tables. Destructive — wipes all analyses."""
         Base.metadata.drop_all(bind=self.engine)
         Base.metadata.create_all(bind=self.engine)
+        if self._change_feed.mode == 'notify':
+            # the trigger was dropped with the table
+            self._change_feed.install_trigger()
+        with self._log_seq_lock:
+            self._next_log_seqs.clear()
+        self._bump_state_version()
 
     def get_deployment(self, deployment_name: str) -> Optional[AnalysisDB]:
         """Return the deployment row with the given unique name, or ``None``."""
         with self.SessionLocal() as session:
             return session.query(AnalysisDB).filter_by(**{'deployment_name': deployment_name}).first()
 
-    def get_latest_deployment(self, analysis_id: str) -> Optional[AnalysisDB]:
-        """Return the most recently created deployment for an analysis, or ``None``."""
+    def get_latest_deployment(self, analysis_id: str, with_log: bool = False) -> Optional[AnalysisDB]:
+        """Return the most recently created deployment for an analysis, or ``None``.
+
+        Args:
+            analysis_id: Analysis to look up.
+            with_log: Also load the legacy ``log`` column (deferred otherwise).
+        """
         with self.SessionLocal() as session:
-            deployment = session.query(AnalysisDB).filter_by(**{'analysis_id': analysis_id}).order_by(AnalysisDB.time_created.desc()).first()
+            query = session.query(AnalysisDB)
+            if with_log:
+                query = query.options(undefer(AnalysisDB.log))
+            deployment = query.filter_by(**{'analysis_id': analysis_id}).order_by(AnalysisDB.time_created.desc()).first()
             return deployment
 
+    def get_latest_deployment_summary(self, analysis_id: str) -> Optional[Row]:
+        """Return ``analysis_id``, ``deployment_name``, ``status``, ``progress`` and ``time_created``
+        of the latest deployment of an analysis, or ``None``.
+
+        Selects only these columns, for callers that don't need the full row.
+        """
+        with self.SessionLocal() as session:
+            return self._latest_summary(session, analysis_id)
+
+    @staticmethod
+    def _latest_summary(session, analysis_id: str) -> Optional[Row]:
+        """Select the summary columns of the latest deployment of an analysis within ``session``."""
+        return session.query(*_SUMMARY_COLUMNS) \
+            .filter(AnalysisDB.analysis_id == analysis_id) \
+            .order_by(AnalysisDB.time_created.desc()) \
+            .first()
+
+    def get_latest_deployments(self,
+                               analysis_ids: Optional[list[str]] = None,
+                               with_log: bool = False,
+                               include_archived: bool = False) -> dict[str, Union[AnalysisDB, ArchiveDB]]:
+        """Return the latest deployment of every (or each given) analysis in a single query.
+
+        Args:
+            analysis_ids: Analyses to look up (``None`` for all).
+            with_log: Also load the legacy ``log`` column (deferred otherwise).
+            include_archived: Fall back to the ``archive`` table for analyses
+                not (or no longer) in the hot table.
+
+        Returns:
+            Mapping ``{analysis_id: deployment}``, in the order of
+            ``analysis_ids`` if given, else in creation order (archived
+            analyses last). Unknown analyses are left out.
+        """
+        if analysis_ids is not None and not analysis_ids:
+            return {}
+        models = (AnalysisDB, ArchiveDB) if include_archived else (AnalysisDB,)
+        deployments = []
+        with self.SessionLocal() as session:
+            for model in models:
+                query = session.query(model)
+                if with_log:
+                    query = query.options(undefer(model.log))
+                query = query.filter(model.id.in_(self._latest_ids(session, analysis_ids, model)))
+                if deployments:
+                    query = query.filter(model.analysis_id.notin_({row.analysis_id for row in deployments}))
+                deployments.extend(query.order_by(model.id).all())
+        return self._by_analysis_id(deployments, analysis_ids)
+
+    def get_latest_deployment_summaries(self,
+                                        analysis_ids: Optional[list[str]] = None,
+                                        include_archived: bool = False) -> dict[str, Row]:
+        """Bulk variant of :meth:`get_latest_deployment_summary`, ordered like :meth:`get_latest_deployments`.
+
+        Args:
+            analysis_ids: Analyses to look up (``None`` for all).
+            include_archived: Fall back to the ``archive`` table for analyses
+                not (or no longer) in the hot table.
+        """
+        if analysis_ids is not None and not analysis_ids:
+            return {}
+        models = (AnalysisDB, ArchiveDB) if include_archived else (AnalysisDB,)
+        rows = []
+        with self.SessionLocal() as session:
+            for model in models:
+                query = session.query(*(getattr(model, column.key) for column in _SUMMARY_COLUMNS)) \
+                    .filter(model.id.in_(self._latest_ids(session, analysis_ids, model)))
+                if rows:
+                    query = query.filter(model.analysis_id.notin_({row.analysis_id for row in rows}))
+                rows.extend(query.order_by(model.id).all())
+        return self._by_analysis_id(rows, analysis_ids)
+
+    @staticmethod
+    def _latest_ids(session, analysis_ids: Optional[list[str]], model: type = AnalysisDB):
+        """Select the row ids of the latest deployment per analysis (``ROW_NUMBER`` over ``time_created``).
+
+        Served by the ``(analysis_id, time_created)`` index of ``model``
+        (:class:`AnalysisDB` or :class:`ArchiveDB`).
+        """
+        rank = func.row_number().over(partition_by=model.analysis_id,
+                                      order_by=(model.time_created.desc(), model.id.desc()))
+        ranked = session.query(model.id, rank.label('rank'))
+        if analysis_ids is not None:
+            ranked = ranked.filter(model.analysis_id.in_(analysis_ids))
+        ranked = ranked.subquery()
+        return select(ranked.c.id).where(ranked.c.rank == 1)
+
+    @staticmethod
+    def _by_analysis_id(rows: list, analysis_ids: Optional[list[str]]) -> dict[str, Any]:
+        """Key latest-deployment rows by analysis id, following the order of ``analysis_ids`` if given."""
+        latest = {row.analysis_id: row for row in rows}
+        if analysis_ids is None:
+            return latest
+        return {analysis_id: latest[analysis_id] for analysis_id in analysis_ids if analysis_id in latest}
+
+    def get_running_analysis_ids(self) -> list[str]:
+        """Return the ids of all analyses whose latest deployment is not in a terminal status."""
+        return [analysis_id for analysis_id, summary in self.get_latest_deployment_summaries().items()
+                if summary.status not in _TERMINAL_STATUSES]
+
     def analysis_is_running(self, analysis_id: str) -> bool:
         """Return True if the latest deployment is not in a terminal status.
 
         Terminal statuses are ``EXECUTED``, ``STOPPED``, and ``FAILED``.
         """
-        latest_deployment = self.get_latest_deployment(analysis_id)
-        if latest_deployment is not None:
-            return latest_deployment.status not in [AnalysisStatus.EXECUTED.value,
-                                                    AnalysisStatus.STOPPED.value,
-                                                    AnalysisStatus.FAILED.value]
+        with self.SessionLocal() as session:
+            latest_status = session.query(AnalysisDB.status) \
+                .filter(AnalysisDB.analysis_id == analysis_id) \
+                .order_by(AnalysisDB.time_created.desc()) \
+                .first()
+        if latest_status is not None:
+            return latest_status.status not in _TERMINAL_STATUSES
         return False
 
     def get_deployments(self, analysis_id: str) -> list[AnalysisDB]:
@@ -110,27 +374,35 @@ class Database:
             session.add(analysis)
             session.commit()
             session.refresh(analysis)
+        self._bump_state_version()
+        self._notify_status_listeners(analysis)
         return analysis
 
-    def update_analysis(self, analysis_id: str, **kwargs) -> list[AnalysisDB]:
+    def update_analysis(self, analysis_id: str, **kwargs) -> int:
         """Apply ``kwargs`` as column updates to every deployment for an analysis.
 
+        Issued as a single ``UPDATE`` statement in one transaction, however
+        many deployments (restarts) the analysis has.
+
         Args:
             analysis_id: Analysis whose deployment rows should be updated.
-            **kwargs: Column/value pairs to ``setattr`` on each row.
+            **kwargs: Column/value pairs to set on each row.
 
         Returns:
-            The list of updated deployment rows.
+            The number of updated deployment rows.
         """
         with self.SessionLocal() as session:
-            analysis = session.query(AnalysisDB).filter_by(**{'analysis_id': analysis_id}).all()
-            for deployment in analysis:
-                if deployment:
-                    for key, value in kwargs.items():
-                        setattr(deployment, key, value)
-
-                    session.commit()
-            return analysis
+            updated = session.query(AnalysisDB) \
+                .filter(AnalysisDB.analysis_id == analysis_id) \
+                .update(kwargs, synchronize_session=False)
+            latest = self._latest_summary(session, analysis_id) \
+                if updated and ('status' in kwargs or 'progress' in kwargs) else None
+            session.commit()
+        if updated:
+            self._bump_state_version()
+            if latest is not None:
+                self._notify_status_listeners(latest)
+        return updated
 
     def update_deployment(self, deployment_name: str, **kwargs) -> AnalysisDB:
         """Apply ``kwargs`` as column updates to a single deployment row.
@@ -147,16 +419,32 @@ class Database:
             for key, value in kwargs.items():
                 setattr(deployment, key, value)
             session.commit()
+            self._bump_state_version()
+            if 'status' in kwargs or 'progress' in kwargs:
+                self._notify_status_listeners(deployment)
             return deployment
 
     def delete_analysis(self, analysis_id: str) -> None:
-        """Delete every deployment row belonging to an analysis."""
+        """Delete every deployment row (hot and archived) and all stored logs belonging to an analysis.
+
+        One ``DELETE`` statement per table, committed in a single transaction.
+        """
         with self.SessionLocal() as session:
-            analysis = session.query(AnalysisDB).filter_by(**{'analysis_id': analysis_id}).all()
-            for deployment in analysis:
-                if deployment:
-                    session.delete(deployment)
-                    session.commit()
+            deleted = session.query(AnalysisDB) \
+                .filter(AnalysisDB.analysis_id == analysis_id) \
+                .delete(synchronize_session=False)
+            deleted += session.query(ArchiveDB) \
+                .filter(ArchiveDB.analysis_id == analysis_id) \
+                .delete(synchronize_session=False)
+            session.query(AnalysisLogDB).filter(AnalysisLogDB.analysis_id == analysis_id) \
+                .delete(synchronize_session=False)
+            session.query(LogSnapshotDB).filter(LogSnapshotDB.analysis_id == analysis_id) \
+                .delete(synchronize_session=False)
+            session.commit()
+        with self._log_seq_lock:
+            self._next_log_seqs.pop(analysis_id, None)
+        if deleted:
+            self._bump_state_version()
 
     def delete_deployment(self, deployment_name: str) -> None:
         """Delete a single deployment row by its unique name."""
@@ -165,54 +453,484 @@ class Database:
             if deployment:
                 session.delete(deployment)
                 session.commit()
+                self._bump_state_version()
 
     def close(self) -> None:
-        """Open and immediately close a session to flush pooled connections."""
+        """Stop the change feed, then open and immediately close a session to flush pooled connections."""
+        self._change_feed.stop()
         with self.SessionLocal() as session:
             session.close()
 
     def get_analysis_ids(self) -> list[str]:
         """Return every analysis id currently tracked in the database."""
         with self.SessionLocal() as session:
-            return [analysis.analysis_id for analysis in session.query(AnalysisDB).all() if analysis is not None]
+            return [row.analysis_id for row in session.query(AnalysisDB.analysis_id).all()]
+
+    def query_analysis_ids(self,
+                           status: Optional[list[str]] = None,
+                           project_id: Optional[str] = None,
+                           created_after: Optional[float] = None,
+                           limit: Optional[int] = None,
+                           offset: int = 0,
+                           include_archived: bool = False) -> list[str]:
+        """Return a filtered page of analysis ids, judged by each analysis' latest deployment.
+
+        Analyses are ordered newest first (by the creation time of their latest
+        deployment), so ``limit``/``offset`` yield stable pages.
+
+        Args:
+            status: Only include analyses whose latest status is one of these.
+            project_id: Only include analyses of this project.
+            created_after: Only include analyses whose latest deployment was
+                created after this Unix timestamp.
+            limit: Maximum number of ids to return (``None`` for all).
+            offset: Number of ids to skip.
+            include_archived: Also include archived analyses.
+
+        Returns:
+            The matching analysis ids.
+        """
+        with self.SessionLocal() as session:
+            selects = []
+            for model in ((AnalysisDB, ArchiveDB) if include_archived else (AnalysisDB,)):
+                query = session.query(model.analysis_id, model.time_created) \
+                    .filter(model.id.in_(self._latest_ids(session, None, model)))
+                if status:
+                    query = query.filter(model.status.in_(status))
+                if project_id is not None:
+                    query = query.filter(model.project_id == project_id)
+                if created_after is not None:
+                    query = query.filter(model.time_created > created_after)
+                if model is ArchiveDB:
+                    # an analysis re-created after archival is judged by its hot deployment
+                    query = query.filter(model.analysis_id.notin_(session.query(AnalysisDB.analysis_id)))
+                selects.append(query.statement)
+            latest = union_all(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+            query = session.query(latest.c.analysis_id) \
+                .order_by(latest.c.time_created.desc(), latest.c.analysis_id) \
+                .offset(offset)
+            if limit is not None:
+                query = query.limit(limit)
+            return [row.analysis_id for row in query.all()]
 
     def get_deployment_ids(self) -> list[str]:
         """Return every deployment name currently tracked in the database."""
         with self.SessionLocal() as session:
-            return [analysis.deployment_name for analysis in session.query(AnalysisDB).all() if analysis is not None]
+            return [row.deployment_name for row in session.query(AnalysisDB.deployment_name).all()]
+
+    def get_registry_credentials(self) -> set[tuple[str, str, str]]:
+        """Return the distinct ``(registry_url, registry_user, registry_password)`` of all deployments in the hot table."""
+        with self.SessionLocal() as session:
+            rows = session.query(AnalysisDB.registry_url, AnalysisDB.registry_user, AnalysisDB.registry_password) \
+                .distinct() \
+                .all()
+        return {tuple(row) for row in rows}
 
     def get_deployment_pod_ids(self, deployment_name: str) -> list[str]:
         """Return the JSON-encoded pod id list recorded for a single deployment."""
-        return self.get_deployment(deployment_name).pod_ids
+        with self.SessionLocal() as session:
+            return session.query(AnalysisDB.pod_ids).filter(AnalysisDB.deployment_name == deployment_name).scalar()
 
     def get_analysis_pod_ids(self, analysis_id: str) -> list[str]:
         """Return the JSON-encoded pod id list for each deployment of an analysis."""
-        return [deployment.pod_ids for deployment in self.get_deployments(analysis_id) if deployment is not None]
+        return self.get_analyses_pod_ids([analysis_id])[analysis_id]
+
+    def get_analyses_pod_ids(self, analysis_ids: list[str]) -> dict[str, list[str]]:
+        """Bulk variant of :meth:`get_analysis_pod_ids` in a single query.
+
+        Returns:
+            Mapping ``{analysis_id: [pod_ids, ...]}`` in the order of
+            ``analysis_ids``, deployments in creation order; unknown analyses
+            map to an empty list.
+        """
+        pod_ids = {analysis_id: [] for analysis_id in analysis_ids}
+        if not analysis_ids:
+            return pod_ids
+        with self.SessionLocal() as session:
+            rows = session.query(AnalysisDB.analysis_id, AnalysisDB.pod_ids) \
+                .filter(AnalysisDB.analysis_id.in_(analysis_ids)) \
+                .order_by(AnalysisDB.id) \
+                .all()
+        for row in rows:
+            pod_ids[row.analysis_id].append(row.pod_ids)
+        return pod_ids
 
     def get_analysis_log(self, analysis_id: str) -> str:
-        """Return the accumulated log string for the latest deployment, or ``""``."""
-        deployment = self.get_latest_deployment(analysis_id)
-        if deployment is not None:
-            log = deployment.log
-            if log is not None:
-                return log
-        return ""
+        """Return the accumulated log string of an analysis, or ``""``.
+
+        Compatibility view over the append-only storage: the ``log`` column of
+        the latest deployment (if set) followed by all streamed lines, joined
+        by newlines.
+        """
+        deployment = self.get_latest_deployment(analysis_id, with_log=True)
+        if deployment is None:
+            return ""
+        lines = [deployment.log] if deployment.log else []
+        lines.extend(self.iter_analysis_log(analysis_id))
+        return "\n".join(lines)
+
+    def iter_analysis_log(self, analysis_id: str, batch_size: int = 1000) -> Iterator[str]:
+        """Yield the streamed log lines of an analysis in order, reading ``batch_size`` lines per query.
+
+        Structured records are rendered as their :class:`LogEntity` string.
+        """
+        last_seq = -1
+        while True:
+            with self.SessionLocal() as session:
+                rows = session.query(AnalysisLogDB.seq,
+                                     AnalysisLogDB.log,
+                                     AnalysisLogDB.entity_id,
+                                     AnalysisLogDB.level,
+                                     AnalysisLogDB.created_at) \
+                    .filter(AnalysisLogDB.analysis_id == analysis_id, AnalysisLogDB.seq > last_seq) \
+                    .order_by(AnalysisLogDB.seq) \
+                    .limit(batch_size) \
+                    .all()
+            for row in rows:
+                if row.level is None:
+                    yield row.log
+                else:
+                    yield str(LogEntity(log=row.log,
+                                        log_type=row.level,
+                                        id=row.entity_id,
+                                        created_at=str(datetime.fromtimestamp(row.created_at))))
+            if len(rows) < batch_size:
+                return
+            last_seq = rows[-1].seq
+
+    def _reserve_log_seqs(self, session, analysis_id: str, count: int) -> int:
+        """Reserve ``count`` consecutive ``seq`` numbers for an analysis and return the first one."""
+        with self._log_seq_lock:
+            first = self._next_log_seqs.get(analysis_id)
+            if first is None:
+                max_seq = session.query(func.max(AnalysisLogDB.seq)) \
+                    .filter(AnalysisLogDB.analysis_id == analysis_id) \
+                    .scalar()
+                first = 0 if max_seq is None else max_seq + 1
+            self._next_log_seqs[analysis_id] = first + count
+            return first
 
     def get_analysis_progress(self, analysis_id: str) -> Optional[int]:
         """Return the latest recorded progress (0-100), or ``None``."""
-        deployment = self.get_latest_deployment(analysis_id)
+        deployment = self.get_latest_deployment_summary(analysis_id)
         if deployment is not None:
             progress = deployment.progress
             if progress is not None:
                 return progress
         return None
 
-    def update_analysis_log(self, analysis_id: str, log: str) -> None:
-        """Append ``log`` to the existing log column for every deployment of an analysis."""
-        latest = self.get_analysis_log(analysis_id)
-        if latest:
-            log = latest + "\n" + log
-        self.update_analysis(analysis_id, log=log)
+    def update_analysis_log(self, analysis_id: str, log: Union[str, dict[str, Any]]) -> None:
+        """Append a single log line or record to an analysis."""
+        self.append_analysis_logs(analysis_id, [log])
+
+    def append_analysis_logs(self,
+                             analysis_id: str,
+                             logs: list[Union[str, dict[str, Any]]],
+                             progress: Optional[int] = None) -> bool:
+        """Append several log lines (and optionally advance the progress) in a single transaction.
+
+        The lines are inserted into the append-only log table, so the cost is
+        independent of the size of the log accumulated so far. Deployment rows
+        are only written if the progress advances.
+
+        Args:
+            analysis_id: Analysis whose deployments receive the lines.
+            logs: Log lines in order, either plain strings or typed records
+                as returned by :meth:`CreateLogEntity.to_log_record`.
+            progress: Highest progress reported alongside the lines.
+
+        Returns:
+            True if the stored progress was advanced.
+        """
+        return analysis_id in self.append_analysis_logs_batch({analysis_id: logs}, {analysis_id: progress})
+
+    def append_analysis_logs_batch(self,
+                                   logs: dict[str, list[Union[str, dict[str, Any]]]],
+                                   progress: Optional[dict[str, Optional[int]]] = None) -> set[str]:
+        """Bulk variant of :meth:`append_analysis_logs`: append the lines of several analyses in one transaction.
+
+        Args:
+            logs: Log lines per analysis id, in order. Unknown analyses are skipped.
+            progress: Highest progress reported per analysis id.
+
+        Returns:
+            Ids of the analyses whose stored progress was advanced.
+        """
+        progress = progress or {}
+        updated = []
+        with self.SessionLocal() as session:
+            for analysis_id, analysis_logs in logs.items():
+                latest = self._latest_summary(session, analysis_id)
+                if latest is None:
+                    continue
+
+                if analysis_logs:
+                    first_seq = self._reserve_log_seqs(session, analysis_id, len(analysis_logs))
+                    now = time.time()
+                    session.execute(insert(AnalysisLogDB),
+                                    [{**_LOG_RECORD_DEFAULTS,
+                                      **({'log': log} if isinstance(log, str) else log),
+                                      'analysis_id': analysis_id,
+                                      'seq': first_seq + i,
+                                      'time_created': now}
+                                     for i, log in enumerate(analysis_logs)])
+                    # ring buffer: drop the lines that fell out of the newest _LOG_MAX_LINES
+                    end_seq = first_seq + len(analysis_logs)
+                    if 0 < _LOG_MAX_LINES < end_seq:
+                        session.query(AnalysisLogDB) \
+                            .filter(AnalysisLogDB.analysis_id == analysis_id,
+                                    AnalysisLogDB.seq < end_seq - _LOG_MAX_LINES) \
+                            .delete(synchronize_session=False)
+                analysis_progress = progress.get(analysis_id)
+                if (analysis_progress is not None) and (latest.progress is not None) and \
+                        (latest.progress < analysis_progress <= 100):
+                    session.query(AnalysisDB) \
+                        .filter(AnalysisDB.analysis_id == analysis_id) \
+                        .update({AnalysisDB.progress: analysis_progress}, synchronize_session=False)
+                    updated.append(self._latest_summary(session, analysis_id))
+            session.commit()
+
+        if updated:
+            self._bump_state_version()
+            for latest in updated:
+                self._notify_status_listeners(latest)
+        return {latest.analysis_id for latest in updated}
+
+    def query_log_records(self,
+                          analysis_ids: list[str],
+                          level: Optional[list[str]] = None,
+                          since: Optional[float] = None,
+                          until: Optional[float] = None) -> dict[str, list[dict[str, Any]]]:
+        """Return the structured log records of several analyses, filtered by level and time range.
+
+        Served by the ``(analysis_id, created_at)`` index; lines stored without
+        a record (plain text) are never returned.
+
+        Args:
+            analysis_ids: Analyses to return records for.
+            level: Only include records with one of these levels.
+            since: Only include records created at or after this Unix timestamp.
+            until: Only include records created before this Unix timestamp.
+
+        Returns:
+            Mapping ``{analysis_id: [record, ...]}`` in creation order, with an
+            entry (possibly empty) for every requested analysis.
+        """
+        records = {analysis_id: [] for analysis_id in analysis_ids}
+        if not analysis_ids:
+            return records
+        with self.SessionLocal() as session:
+            query = session.query(AnalysisLogDB.analysis_id,
+                                  AnalysisLogDB.entity_id,
+                                  AnalysisLogDB.log,
+                                  AnalysisLogDB.level,
+                                  AnalysisLogDB.status,
+                                  AnalysisLogDB.progress,
+                                  AnalysisLogDB.created_at) \
+                .filter(AnalysisLogDB.analysis_id.in_(analysis_ids), AnalysisLogDB.created_at.isnot(None))
+            if since is not None:
+                query = query.filter(AnalysisLogDB.created_at >= since)
+            if until is not None:
+                query = query.filter(AnalysisLogDB.created_at < until)
+            if level:
+                query = query.filter(AnalysisLogDB.level.in_(level))
+            for row in query.order_by(AnalysisLogDB.analysis_id, AnalysisLogDB.created_at, AnalysisLogDB.seq):
+                records[row.analysis_id].append({'id': row.entity_id,
+                                                 'log': row.log,
+                                                 'log_type': row.level,
+                                                 'status': row.status,
+                                                 'progress': row.progress,
+                                                 'created_at': row.created_at})
+        return records
+
+    def store_log_snapshot(self,
+                           analysis_id: str,
+                           snapshot: dict[str, dict[str, list[str]]],
+                           time_created: Optional[float] = None) -> None:
+        """Store the pod logs captured when an analysis stops, replacing any previous snapshot.
+
+        The snapshot is truncated to ``PO_LOG_SNAPSHOT_MAX_BYTES`` (oldest
+        lines dropped first) and stored as zstd-compressed JSON.
+
+        Args:
+            analysis_id: Analysis the snapshot belongs to.
+            snapshot: Nested mapping ``{'analysis': {analysis_id: [...]},
+                'nginx': {analysis_id: [...]}}`` as returned by
+                :func:`get_analysis_logs`.
+            time_created: Time the analysis stopped (defaults to now); starts
+                the retention period.
+        """
+        snapshot, truncated_lines = _truncate_log_snapshot(snapshot, _LOG_SNAPSHOT_MAX_BYTES)
+        if truncated_lines:
+            logger.warning(f"Log snapshot of analysis {analysis_id} exceeds {_LOG_SNAPSHOT_MAX_BYTES} bytes, "
+                           f"dropped its {truncated_lines} oldest lines")
+        with self.SessionLocal() as session:
+            session.query(LogSnapshotDB).filter(LogSnapshotDB.analysis_id == analysis_id).delete()
+            row = LogSnapshotDB(analysis_id=analysis_id,
+                                truncated_lines=truncated_lines,
+                                time_created=time.time() if time_created is None else time_created)
+            _encode_log_snapshot(row, snapshot)
+            session.add(row)
+            session.commit()
+
+    def get_log_snapshot(self, analysis_id: str) -> Optional[dict[str, dict[str, list[str]]]]:
+        """Return the decompressed stop snapshot of an analysis, or ``None`` if none is stored.
+
+        Raises:
+            ValueError: If the snapshot was stored in an unknown format.
+        """
+        with self.SessionLocal() as session:
+            row = session.query(LogSnapshotDB.data, LogSnapshotDB.format_version) \
+                .filter(LogSnapshotDB.analysis_id == analysis_id) \
+                .first()
+        if row is None:
+            return None
+        if row.format_version != _LOG_SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported log snapshot format {row.format_version} (analysis {analysis_id})")
+        return orjson.loads(zstandard.ZstdDecompressor().decompress(row.data))
+
+    def migrate_legacy_log(self, analysis_id: str) -> Optional[dict[str, dict[str, list[str]]]]:
+        """Move a snapshot still kept in the legacy ``log`` column of an analysis into ``log_snapshot``.
+
+        The column (written as a Python literal by earlier versions) is parsed
+        once, stored as a snapshot dated to the latest deployment and cleared.
+        Archived deployments are looked at if the analysis has none in the
+        hot table.
+
+        Returns:
+            The converted snapshot, or ``None`` if the column is empty.
+        """
+        with self.SessionLocal() as session:
+            for model in (AnalysisDB, ArchiveDB):
+                latest = session.query(model.log, model.time_created) \
+                    .filter(model.analysis_id == analysis_id) \
+                    .order_by(model.time_created.desc()) \
+                    .first()
+                if latest is not None:
+                    break
+            if (latest is None) or (not latest.log):
+                return None
+            snapshot = ast.literal_eval(latest.log)
+            time_created = latest.time_created
+        self.store_log_snapshot(analysis_id, snapshot, time_created=time_created)
+        with self.SessionLocal() as session:
+            session.query(model).filter(model.analysis_id == analysis_id, model.log.isnot(None)) \
+                .update({model.log: None}, synchronize_session=False)
+            session.commit()
+        return snapshot
+
+    def purge_expired_logs(self) -> list[str]:
+        """Delete the stored logs of analyses that terminated more than ``PO_LOG_RETENTION_DAYS`` ago.
+
+        Streamed lines, the stop snapshot and any legacy ``log`` column content
+        are removed; the deployment rows themselves (hot or archived) are kept.
+
+        Returns:
+            Ids of the analyses whose logs were purged.
+        """
+        if _LOG_RETENTION_DAYS <= 0:
+            return []
+        cutoff = time.time() - _LOG_RETENTION_DAYS * 24 * 60 * 60
+        with self.SessionLocal() as session:
+            expired = self._terminated_before(session, cutoff, include_archived=True)
+            if expired:
+                session.query(AnalysisLogDB).filter(AnalysisLogDB.analysis_id.in_(expired)) \
+                    .delete(synchronize_session=False)
+                session.query(LogSnapshotDB).filter(LogSnapshotDB.analysis_id.in_(expired)) \
+                    .delete(synchronize_session=False)
+                for model in (AnalysisDB, ArchiveDB):
+                    session.query(model).filter(model.analysis_id.in_(expired), model.log.isnot(None)) \
+                        .update({model.log: None}, synchronize_session=False)
+                session.commit()
+        with self._log_seq_lock:
+            for analysis_id in expired:
+                self._next_log_seqs.pop(analysis_id, None)
+        return expired
+
+    def archive_terminal_analyses(self) -> list[str]:
+        """Move the deployments of analyses that terminated more than ``PO_ARCHIVE_AFTER_DAYS`` ago to ``archive``.
+
+        Analyses are moved ``PO_ARCHIVE_BATCH_SIZE`` at a time, each batch in
+        its own transaction (copy into ``archive``, then delete from
+        ``analysis``). Each batch is checked again within its transaction and
+        moves only the rows seen there, so an analysis restarted in the
+        meantime stays in the hot table. Stored logs are keyed by analysis id
+        and stay in place.
+
+        Returns:
+            Ids of the archived analyses.
+        """
+        if _ARCHIVE_AFTER_DAYS <= 0:
+            return []
+        cutoff = time.time() - _ARCHIVE_AFTER_DAYS * 24 * 60 * 60
+        with self.SessionLocal() as session:
+            expired = self._terminated_before(session, cutoff)
+        columns = [column.name for column in AnalysisDB.__table__.columns if column.name != 'id']
+        archived = []
+        for start in range(0, len(expired), _ARCHIVE_BATCH_SIZE):
+            batch = expired[start:start + _ARCHIVE_BATCH_SIZE]
+            with self.SessionLocal() as session:
+                batch = self._terminated_before(session, cutoff, analysis_ids=batch)
+                if not batch:
+                    continue
+                row_ids = [row.id for row in session.query(AnalysisDB.id).filter(AnalysisDB.analysis_id.in_(batch))]
+                # rows archived before the analysis was re-created are superseded by the newer ones
+                session.query(ArchiveDB).filter(ArchiveDB.analysis_id.in_(batch)).delete(synchronize_session=False)
+                rows = select(*[AnalysisDB.__table__.c[name] for name in columns], literal(time.time())) \
+                    .where(AnalysisDB.id.in_(row_ids))
+                session.execute(insert(ArchiveDB).from_select(columns + ['time_archived'], rows))
+                session.query(AnalysisDB).filter(AnalysisDB.id.in_(row_ids)).delete(synchronize_session=False)
+                session.commit()
+            archived.extend(batch)
+            self._bump_state_version()
+        return archived
+
+    def _terminated_before(self,
+                           session,
+                           cutoff: float,
+                           include_archived: bool = False,
+                           analysis_ids: Optional[list[str]] = None) -> list[str]:
+        """Return the ids of analyses whose latest deployment is terminal and terminated before ``cutoff``.
+
+        An analysis' termination time is that of its log snapshot, falling
+        back to the creation time of its latest deployment. Archived analyses
+        count as terminal; an analysis present in both tables is judged by its
+        hot deployment. ``analysis_ids`` restricts the check to these analyses.
+        """
+        terminated = {}
+        for model in ((AnalysisDB, ArchiveDB) if include_archived else (AnalysisDB,)):
+            query = session.query(model.analysis_id, model.time_created) \
+                .filter(model.id.in_(self._latest_ids(session, analysis_ids, model)))
+            if model is AnalysisDB:
+                query = query.filter(model.status.in_(_TERMINAL_STATUSES))
+            else:
+                query = query.filter(model.analysis_id.notin_(session.query(AnalysisDB.analysis_id)))
+            terminated.update(query.all())
+        if not terminated:
+            return []
+        snapshot_times = dict(session.query(LogSnapshotDB.analysis_id, LogSnapshotDB.time_created)
+                              .filter(LogSnapshotDB.analysis_id.in_(list(terminated)))
+                              .all())
+        return [analysis_id for analysis_id, time_created in terminated.items()
+                if (terminated_at := snapshot_times.get(analysis_id, time_created)) is not None
+                and terminated_at < cutoff]
+
+    def get_log_storage_stats(self) -> dict[str, float]:
+        """Return counters on stored logs, including the space saved by compressing snapshots."""
+        with self.SessionLocal() as session:
+            snapshots, raw_bytes, stored_bytes, truncated_lines = session.query(
+                func.count(LogSnapshotDB.id),
+                func.coalesce(func.sum(LogSnapshotDB.raw_size), 0),
+                func.coalesce(func.sum(LogSnapshotDB.stored_size), 0),
+                func.coalesce(func.sum(LogSnapshotDB.truncated_lines), 0)).one()
+            log_lines = session.query(func.count(AnalysisLogDB.id)).scalar()
+        return {'snapshots': snapshots,
+                'snapshot_raw_bytes': raw_bytes,
+                'snapshot_stored_bytes': stored_bytes,
+                'snapshot_saved_bytes': raw_bytes - stored_bytes,
+                'snapshot_compression_ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+                'snapshot_truncated_lines': truncated_lines,
+                'log_lines': log_lines}
 
     def progress_valid(self, analysis_id: str, progress: int) -> bool:
         """Return True if ``progress`` is strictly greater than stored progress and ``<= 100``."""
@@ -266,9 +984,54 @@ class Database:
         """Keep only the most recent deployment for an analysis; delete the rest.
 
         Used after a restart/unstuck so history does not accumulate stale
-        deployment rows.
+        deployment rows. Issued as a single ``DELETE`` statement.
         """
-        deployments = self.get_deployments(analysis_id)
-        deployments = sorted(deployments, key=lambda x: x.time_created, reverse=True)
-        for deployment in deployments[1:]:
-            self.delete_deployment(deployment.deployment_name)
+        with self.SessionLocal() as session:
+            deleted = session.query(AnalysisDB) \
+                .filter(AnalysisDB.analysis_id == analysis_id,
+                        AnalysisDB.id.notin_(self._latest_ids(session, [analysis_id]))) \
+                .delete(synchronize_session=False)
+            session.commit()
+        if deleted:
+            self._bump_state_version()
+
+
+def _encode_log_snapshot(row: LogSnapshotDB, snapshot: dict[str, dict[str, list[str]]]) -> None:
+    """Serialize a snapshot into ``row`` in the current format and record its raw/stored sizes."""
+    raw = orjson.dumps(snapshot)
+    row.data = zstandard.ZstdCompressor(level=_LOG_ZSTD_LEVEL).compress(raw)
+    row.raw_size = len(raw)
+    row.stored_size = len(row.data)
+    row.format_version = _LOG_SNAPSHOT_FORMAT
+
+
+def _truncate_log_snapshot(snapshot: dict[str, dict[str, list[str]]],
+                           max_bytes: int) -> tuple[dict[str, dict[str, list[str]]], int]:
+    """Cut a log snapshot down to ``max_bytes`` of line content, ring-buffer style.
+
+    Each log holds one newline-separated string per pod. Lines are dropped
+    oldest first, always from the currently largest pod log, so a chatty
+    nginx sidecar cannot crowd out the analysis log (and vice versa).
+
+    Returns:
+        The truncated snapshot and the number of dropped lines.
+    """
+    pod_logs = [(source, analysis_id, pod_log.split('\n'))
+                for source, source_logs in snapshot.items()
+                for analysis_id, logs in source_logs.items()
+                for pod_log in logs]
+    line_sizes = [[len(line.encode('utf-8')) for line in lines] for _, _, lines in pod_logs]
+    sizes = [sum(log_sizes) for log_sizes in line_sizes]
+    starts = [0] * len(pod_logs)
+    total = sum(sizes)
+    while total > max_bytes:
+        i = max(range(len(pod_logs)), key=sizes.__getitem__)
+        dropped = line_sizes[i][starts[i]]
+        sizes[i] -= dropped
+        total -= dropped
+        starts[i] += 1
+
+    truncated = {source: {analysis_id: [] for analysis_id in source_logs} for source, source_logs in snapshot.items()}
+    for (source, analysis_id, lines), start in zip(pod_logs, starts):
+        truncated[source][analysis_id].append('\n'.join(lines[start:]))
+    return truncated, sum(starts)
@@ -1,18 +1,21 @@
 import uuid
 import time
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel
 
 from src.status.constants import _MAX_RESTARTS
 
 
+LogLevel = Literal['emerg', 'alert', 'crit', 'error', 'warn', 'notice', 'info', 'debug']
+
+
 class LogEntity(BaseModel):
     """A persisted log line with an id and ISO-ish timestamp."""
 
     log: str
-    log_type: Literal['emerg', 'alert', 'crit', 'error', 'warn', 'notice', 'info', 'debug']
+    log_type: LogLevel
 
     id: str
     created_at: str
@@ -26,7 +29,7 @@ class CreateLogEntity(BaseModel):
     """Request body accepted by ``POST /po/stream_logs`` from analysis pods."""
 
     log: str
-    log_type: Literal['emerg', 'alert', 'crit', 'error', 'warn', 'notice', 'info', 'debug']
+    log_type: LogLevel
 
     analysis_id: str
     status: str
@@ -41,6 +44,30 @@ class CreateLogEntity(BaseModel):
             created_at=str(datetime.now())
         )
 
+    def to_log_record(self) -> dict[str, Any]:
+        """Return the typed columns stored per log line (see :meth:`Database.append_analysis_logs`)."""
+        return {'entity_id': str(uuid.uuid4()),
+                'log': self.log,
+                'level': self.log_type,
+                'status': self.status,
+                'progress': self.progress,
+                'created_at': time.time()}
+
+
+class LogQuery(BaseModel):
+    """Query parameters selecting structured log records in ``/po/history``.
+
+    ``since`` is inclusive and ``until`` exclusive, both Unix timestamps.
+    """
+
+    level: Optional[list[LogLevel]] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+
+    def is_set(self) -> bool:
+        """Return True if any filter is given."""
+        return (self.level is not None) or (self.since is not None) or (self.until is not None)
+
 
 class CreateStartUpErrorLog(CreateLogEntity):
     """Pre-formatted error log emitted when an analysis fails to start.
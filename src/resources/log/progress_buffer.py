@@ -0,0 +1,142 @@
+import os
+import threading
+from typing import Optional
+
+from flame_hub import CoreClient
+
+from src.resources.database.entity import Database
+from src.status.constants import AnalysisStatus, _TERMINAL_STATUSES
+from src.utils.hub_client import get_node_analysis_id, update_hub_status
+from src.utils.po_logging import get_logger
+
+
+logger = get_logger()
+
+_PROGRESS_FLUSH_INTERVAL = float(os.getenv("PO_PROGRESS_FLUSH_INTERVAL", "2"))  # Seconds between buffer flushes
+
+# reports that end the analysis' current run are written right away; a stuck analysis is about to be restarted
+_FLUSH_NOW_STATUSES = _TERMINAL_STATUSES | {AnalysisStatus.STUCK.value}
+
+
+class ProgressBuffer:
+    """Write-behind buffer for the status/progress reported alongside streamed logs.
+
+    Analyses report their status and progress with every log line. Instead of
+    writing each report to the database and the FLAME Hub, reports are
+    coalesced per analysis (latest status, highest valid progress) and flushed
+    by a background thread every ``flush_interval`` seconds. Reports with a
+    terminal status are flushed immediately on the calling thread, so the
+    final state is never delayed.
+
+    Attributes:
+        database: Database wrapper receiving progress updates.
+        hub_core_client: Hub client receiving status/progress updates.
+        node_id: This node's id in the FLAME Hub.
+        flush_interval: Seconds between periodic flushes.
+    """
+
+    def __init__(self,
+                 database: Database,
+                 hub_core_client: Optional[CoreClient],
+                 node_id: Optional[str],
+                 flush_interval: float = _PROGRESS_FLUSH_INTERVAL) -> None:
+        self.database = database
+        self.hub_core_client = hub_core_client
+        self.node_id = node_id
+        self.flush_interval = flush_interval
+        self._pending: dict[str, tuple[str, Optional[int]]] = {}
+        self._node_analysis_ids: dict[str, str] = {}
+        self._lock = threading.Lock()
+        # serializes flushes, so updates of the same analysis reach the Hub in order
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background flusher thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='po-progress-flush', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and write out everything still pending."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def record(self, analysis_id: str, status: str, progress: Optional[int]) -> None:
+        """Buffer a status/progress report of an analysis.
+
+        Args:
+            analysis_id: Reporting analysis.
+            status: Reported status; replaces any buffered status.
+            progress: Reported progress; values above 100 are ignored, and
+                only the highest buffered value is kept.
+        """
+        if (progress is not None) and (progress > 100):
+            progress = None
+        with self._lock:
+            pending = self._pending.get(analysis_id)
+            if (pending is not None) and (pending[1] is not None):
+                progress = pending[1] if progress is None else max(progress, pending[1])
+            self._pending[analysis_id] = (status, progress)
+        if status in _FLUSH_NOW_STATUSES:
+            self.flush(analysis_id)
+
+    def pending_count(self) -> int:
+        """Return the number of analyses with unflushed reports."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, analysis_id: Optional[str] = None) -> int:
+        """Write buffered reports to the database and the Hub.
+
+        Args:
+            analysis_id: Only flush this analysis (``None`` for all).
+
+        Returns:
+            Number of analyses flushed.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if analysis_id is None:
+                    entries, self._pending = self._pending, {}
+                elif analysis_id in self._pending:
+                    entries = {analysis_id: self._pending.pop(analysis_id)}
+                else:
+                    entries = {}
+            for pending_id, (status, progress) in entries.items():
+                try:
+                    self._write(pending_id, status, progress)
+                except Exception as e:
+                    logger.error(f"Failed to flush status/progress of analysis {pending_id}: {repr(e)}")
+        return len(entries)
+
+    def _write(self, analysis_id: str, status: str, progress: Optional[int]) -> None:
+        """Persist one coalesced report (advancing the stored progress only) and mirror it to the Hub."""
+        progress_updated = self.database.append_analysis_logs(analysis_id, [], progress=progress)
+
+        node_analysis_id = self._node_analysis_ids.get(analysis_id)
+        if node_analysis_id is None:
+            node_analysis_id = get_node_analysis_id(self.hub_core_client, analysis_id, self.node_id)
+            if node_analysis_id is not None:
+                self._node_analysis_ids[analysis_id] = node_analysis_id
+        if progress_updated:
+            update_hub_status(self.hub_core_client, node_analysis_id, run_status=status, run_progress=progress)
+        else:
+            update_hub_status(self.hub_core_client, node_analysis_id, run_status=status)
+
+        if status in _FLUSH_NOW_STATUSES:
+            self._node_analysis_ids.pop(analysis_id, None)
+
+    def _run(self) -> None:
+        """Flusher thread body: flush every ``flush_interval`` seconds until stopped."""
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Progress buffer flush failed: {repr(e)}")
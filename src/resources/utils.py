@@ -1,19 +1,28 @@
-import ast
+import os
 import time
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
 
 from fastapi import HTTPException
 from flame_hub import CoreClient
 
-from src.resources.database.entity import Database
-from src.resources.analysis.entity import Analysis, CreateAnalysis, read_db_analysis
-from src.resources.log.entity import CreateLogEntity
-from src.status.constants import AnalysisStatus
-from src.k8s.kubernetes import create_harbor_secret, get_analysis_logs
+from src.resources.database.entity import AnalysisDB, ArchiveDB, Database
+from src.resources.analysis.entity import Analysis, AnalysisQuery, CreateAnalysis, read_db_analysis
+from src.resources.log.entity import CreateLogEntity, LogQuery
+from src.resources.log.progress_buffer import ProgressBuffer
+from src.status.constants import AnalysisStatus, _TERMINAL_STATUSES
+from src.k8s.kubernetes import (HARBOR_SECRET_NAME,
+                                create_harbor_secret,
+                                harbor_secret_name,
+                                get_analysis_logs,
+                                open_pod_log_stream,
+                                PodLogStream,
+                                discover_node_services)
 from src.k8s.utils import get_current_namespace, find_k8s_resources, delete_k8s_resource
-from src.utils.token import _get_all_keycloak_clients
-from src.utils.token import delete_keycloak_client
+from src.utils.token import _get_flame_keycloak_clients, is_pool_client
+from src.utils.token import delete_keycloak_client, delete_keycloak_clients
 from src.utils.hub_client import (init_hub_client_and_update_hub_status_with_client,
+                                  update_hub_status_for_analysis,
                                   update_hub_status,
                                   get_node_analysis_id)
 from src.utils.other import resource_name_to_analysis
@@ -25,6 +34,7 @@ logger = get_logger()
 
 
 _MAX_UNSTUCK_REATTEMPTS = 10
+_BATCH_CREATE_WORKERS = int(os.getenv('PO_BATCH_CREATE_WORKERS', '4'))  # Analyses of a batch deployed concurrently
 
 
 def create_analysis(body: Union[CreateAnalysis, str], database: Database) -> dict[str, str]:
@@ -56,12 +66,105 @@ def create_analysis(body: Union[CreateAnalysis, str], database: Database) -> dic
         else:
             body = CreateAnalysis(**body)
 
-    if not(is_uuid(body.analysis_id) or is_uuid(body.project_id)):
+    if not _has_valid_ids(body):
         logger.error(f"Received request to create analysis with ID {body.analysis_id} for project {body.project_id}")
         raise HTTPException(status_code=400, detail="Analysis ID and Project ID must be valid UUIDs.")
 
     create_harbor_secret(body.registry_url, body.registry_user, body.registry_password, namespace=namespace)
 
+    analysis = _start_analysis(body, database, namespace)
+
+    # update hub status
+    init_hub_client_and_update_hub_status_with_client(body.analysis_id, AnalysisStatus.STARTED.value)
+
+    return {body.analysis_id: analysis.status}
+
+
+def create_analyses(bodies: list[CreateAnalysis],
+                    database: Database,
+                    hub_client: Optional[CoreClient] = None,
+                    node_id: Optional[str] = None) -> list[dict[str, Any]]:
+    """Create and start several analyses, sharing the per-request setup between them.
+
+    The namespace, the node service discovery for the nginx configs and the
+    Harbor pull secret (once per distinct set of registry credentials) are
+    resolved once for the whole batch. If the batch mixes credentials, each
+    set gets a pull secret of its own, so the analyses never pull with each
+    other's credentials. The analyses are then deployed
+    concurrently and their ``STARTED`` status is pushed to the Hub through
+    ``hub_client`` (or a fresh client per analysis if none is given). A failing
+    item does not affect the others.
+
+    Args:
+        bodies: Creation payloads, one per analysis.
+        database: Database wrapper used for persistence.
+        hub_client: Authenticated Hub client to reuse for the status updates.
+        node_id: This node's Hub id; required alongside ``hub_client``.
+
+    Returns:
+        One result per payload, in request order:
+        ``{'analysis_id': str, 'status': str}`` on success or
+        ``{'analysis_id': str, 'error': str}`` on failure.
+    """
+    results: list[dict[str, Any]] = [{'analysis_id': body.analysis_id} for body in bodies]
+    pending = []
+    seen_ids = set()
+    for i, body in enumerate(bodies):
+        if not _has_valid_ids(body):
+            results[i]['error'] = "Analysis ID and Project ID must be valid UUIDs."
+        elif body.analysis_id in seen_ids:
+            results[i]['error'] = "Duplicate analysis ID in batch."
+        else:
+            seen_ids.add(body.analysis_id)
+            pending.append(i)
+    if not pending:
+        return results
+
+    namespace = get_current_namespace()
+    node_services = discover_node_services(namespace)
+    credentials = {_credentials(bodies[i]) for i in pending}
+    if len(credentials) == 1:
+        secret_names = {credential: HARBOR_SECRET_NAME for credential in credentials}
+    else:
+        secret_names = {credential: harbor_secret_name(*credential) for credential in credentials}
+    for (registry_url, registry_user, registry_password), secret_name in secret_names.items():
+        create_harbor_secret(registry_url, registry_user, registry_password, name=secret_name, namespace=namespace)
+
+    def _create(body: CreateAnalysis) -> str:
+        analysis = _start_analysis(body, database, namespace, node_services, secret_names[_credentials(body)])
+        if (hub_client is not None) and (node_id is not None):
+            update_hub_status_for_analysis(hub_client, node_id, body.analysis_id, AnalysisStatus.STARTED.value)
+        else:
+            init_hub_client_and_update_hub_status_with_client(body.analysis_id, AnalysisStatus.STARTED.value)
+        return analysis.status
+
+    with ThreadPoolExecutor(max_workers=_BATCH_CREATE_WORKERS, thread_name_prefix='po-batch') as executor:
+        futures = {i: executor.submit(_create, bodies[i]) for i in pending}
+        for i, future in futures.items():
+            try:
+                results[i]['status'] = future.result()
+            except Exception as e:
+                logger.error(f"Error creating analysis {bodies[i].analysis_id} in batch: {repr(e)}")
+                results[i]['error'] = repr(e)
+    return results
+
+
+def _credentials(body: Union[CreateAnalysis, AnalysisDB, ArchiveDB]) -> tuple[str, str, str]:
+    """Return the registry url, user and password of a creation payload or deployment row."""
+    return body.registry_url, body.registry_user, body.registry_password
+
+
+def _has_valid_ids(body: CreateAnalysis) -> bool:
+    """Check the analysis/project ids of a creation payload (at least one must be a UUID)."""
+    return is_uuid(body.analysis_id) or is_uuid(body.project_id)
+
+
+def _start_analysis(body: CreateAnalysis,
+                    database: Database,
+                    namespace: str,
+                    node_services: Optional[dict[str, str]] = None,
+                    image_pull_secret: str = HARBOR_SECRET_NAME) -> Analysis:
+    """Build the :class:`Analysis` for a creation payload and deploy it."""
     analysis = Analysis(
         analysis_id=body.analysis_id,
         project_id=body.project_id,
@@ -74,50 +177,74 @@ def create_analysis(body: Union[CreateAnalysis, str], database: Database) -> dic
         restart_counter=body.restart_counter + 1,
         progress=body.progress
     )
-    analysis.start(database=database, namespace=namespace)
-
-    # update hub status
-    init_hub_client_and_update_hub_status_with_client(body.analysis_id, AnalysisStatus.STARTED.value)
-
-    return {body.analysis_id: analysis.status}
-
-
-def retrieve_history(analysis_id_str: str, database: Database) -> dict[str, dict[str, list[str]]]:
+    analysis.start(database=database,
+                   namespace=namespace,
+                   node_services=node_services,
+                   image_pull_secret=image_pull_secret)
+    return analysis
+
+
+def _query_analysis_ids(analysis_id_str: str,
+                        database: Database,
+                        query: Optional[AnalysisQuery],
+                        include_archived: bool = False) -> list[str]:
+    """Resolve ``"all"`` to a filtered, paginated list of analysis ids; pass specific ids through."""
+    if analysis_id_str != 'all':
+        return [analysis_id_str]
+    if query is None:
+        query = AnalysisQuery()
+    return database.query_analysis_ids(**query.model_dump(), include_archived=include_archived)
+
+
+def retrieve_history(analysis_id_str: str,
+                     database: Database,
+                     query: Optional[AnalysisQuery] = None,
+                     log_query: Optional[LogQuery] = None) -> dict[str, dict[str, list]]:
     """Return the persisted analysis and nginx logs for terminated analyses.
 
-    Only deployments in ``STOPPED``, ``EXECUTED``, or ``FAILED`` are included.
-    The stored log column is parsed back into a dictionary via ``ast.literal_eval``.
+    Only deployments in ``STOPPED``, ``EXECUTED``, or ``FAILED`` are included,
+    whether still in the hot table or already archived.
+    Logs come from the compressed stop snapshot; analyses stopped before
+    snapshots were stored separately have their log column converted to a
+    snapshot on first access. Analyses whose logs were purged report empty
+    logs.
+
+    If ``log_query`` sets any filter, the structured log records posted by the
+    analyses are additionally returned under ``'logs'``, selected by level and
+    time range in the database.
 
     Args:
         analysis_id_str: Specific analysis id or the literal string ``"all"``.
         database: Database wrapper used for the lookup.
+        query: Optional filters and pagination applied when listing ``"all"``.
+        log_query: Optional level/time-range filters for structured log records.
 
     Returns:
         Nested mapping ``{'analysis': {analysis_id: [...]},
-        'nginx': {analysis_id: [...]}}``.
+        'nginx': {analysis_id: [...]}}``, plus ``'logs': {analysis_id:
+        [record, ...]}`` if ``log_query`` is set.
     """
-    if analysis_id_str == 'all':
-        analysis_ids = database.get_analysis_ids()
-    else:
-        analysis_ids = [analysis_id_str]
+    analysis_ids = _query_analysis_ids(analysis_id_str, database, query, include_archived=True)
 
     deployments = {}
-    for analysis_id in analysis_ids:
-        deployment = database.get_latest_deployment(analysis_id)
-        if deployment is not None:
-            if deployment.status in [AnalysisStatus.STOPPED.value,
-                                     AnalysisStatus.EXECUTED.value,
-                                     AnalysisStatus.FAILED.value]:
-                deployments[analysis_id] = read_db_analysis(deployment)
+    for analysis_id, deployment in database.get_latest_deployments(analysis_ids, include_archived=True).items():
+        if deployment.status in _TERMINAL_STATUSES:
+            deployments[analysis_id] = read_db_analysis(deployment)
 
     analysis_logs, nginx_logs = ({}, {})
     for analysis_id, deployment in deployments.items():
-        # interpret log string as a dictionary
-        log = ast.literal_eval(deployment.log)
-        analysis_logs[analysis_id] = log['analysis'][analysis_id]
-        nginx_logs[analysis_id] = log['nginx'][analysis_id]
+        log = database.get_log_snapshot(analysis_id)
+        if log is None:
+            log = database.migrate_legacy_log(analysis_id)
+        if log is None:
+            log = {'analysis': {}, 'nginx': {}}
+        analysis_logs[analysis_id] = log['analysis'].get(analysis_id, [])
+        nginx_logs[analysis_id] = log['nginx'].get(analysis_id, [])
 
-    return {'analysis': analysis_logs, 'nginx': nginx_logs}
+    history = {'analysis': analysis_logs, 'nginx': nginx_logs}
+    if (log_query is not None) and log_query.is_set():
+        history['logs'] = database.query_log_records(list(deployments), **log_query.model_dump())
+    return history
 
 
 def retrieve_logs(analysis_id_str: str, database: Database) -> dict[str, dict[str, list[str]]]:
@@ -131,61 +258,91 @@ def retrieve_logs(analysis_id_str: str, database: Database) -> dict[str, dict[st
         Nested mapping ``{'analysis': {...}, 'nginx': {...}}`` returned by
         :func:`get_analysis_logs`.
     """
-    if analysis_id_str == 'all':
-        analysis_ids = database.get_analysis_ids()
-    else:
-        analysis_ids = [analysis_id_str]
+    analysis_ids = None if analysis_id_str == 'all' else [analysis_id_str]
 
     deployment_names = {}
-    for analysis_id in analysis_ids:
-        deployment = database.get_latest_deployment(analysis_id)
-        if deployment is not None:
-            if deployment.status in [AnalysisStatus.EXECUTING.value]:
-                deployment_names[analysis_id] = read_db_analysis(deployment).deployment_name
+    for analysis_id, deployment in database.get_latest_deployment_summaries(analysis_ids).items():
+        if deployment.status in [AnalysisStatus.EXECUTING.value]:
+            deployment_names[analysis_id] = deployment.deployment_name
 
     return get_analysis_logs(deployment_names, database=database)
 
 
-def get_status_and_progress(analysis_id_str: str, database: Database) -> dict[str, dict[str, str]]:
+def open_log_stream(analysis_id: str,
+                    database: Database,
+                    source: str = 'analysis',
+                    follow: bool = False,
+                    tail_lines: Optional[int] = None,
+                    since_seconds: Optional[int] = None) -> Optional[PodLogStream]:
+    """Open an incremental log stream for the latest deployment of an analysis.
+
+    Args:
+        analysis_id: Analysis whose logs should be streamed.
+        database: Database wrapper used to resolve the deployment and its pods.
+        source: ``'analysis'`` for the analysis pod or ``'nginx'`` for its sidecar proxy.
+        follow: Keep the stream open for new lines.
+        tail_lines: Only start with the last ``tail_lines`` lines.
+        since_seconds: Only start with lines from the last ``since_seconds`` seconds.
+
+    Returns:
+        The opened :class:`PodLogStream`, or ``None`` if the analysis or its pod does not exist.
+    """
+    deployment = database.get_latest_deployment(analysis_id)
+    if deployment is None:
+        return None
+    deployment = read_db_analysis(deployment)
+
+    if source == 'nginx':
+        name, pod_ids = f"nginx-{deployment.deployment_name}", None
+    else:
+        name, pod_ids = deployment.deployment_name, database.get_deployment_pod_ids(deployment.deployment_name)
+    return open_pod_log_stream(name,
+                               pod_ids=pod_ids,
+                               namespace=deployment.namespace,
+                               follow=follow,
+                               tail_lines=tail_lines,
+                               since_seconds=since_seconds)
+
+
+def get_status_and_progress(analysis_id_str: str,
+                            database: Database,
+                            query: Optional[AnalysisQuery] = None) -> dict[str, dict[str, str]]:
     """Return the latest status and progress for one or all analyses.
 
+    A specific analysis is also found once it was archived, while ``"all"``
+    lists the analyses in the hot table only (use ``/po/history`` for
+    archived ones).
+
     Args:
         analysis_id_str: Specific analysis id or the literal string ``"all"``.
         database: Database wrapper used for the lookup.
+        query: Optional filters and pagination applied when listing ``"all"``.
 
     Returns:
         Mapping ``{analysis_id: {'status': str, 'progress': int}}``.
     """
-    if analysis_id_str == 'all':
-        analysis_ids = database.get_analysis_ids()
-    else:
-        analysis_ids = [analysis_id_str]
-
-    deployments = {}
-    for analysis_id in analysis_ids:
-        deployment = database.get_latest_deployment(analysis_id)
-        if deployment is not None:
-            deployments[analysis_id] = read_db_analysis(deployment)
+    analysis_ids = _query_analysis_ids(analysis_id_str, database, query)
+    summaries = database.get_latest_deployment_summaries(analysis_ids, include_archived=(analysis_id_str != 'all'))
 
     return {analysis_id: {'status': deployment.status, 'progress': deployment.progress}
-            for analysis_id, deployment in deployments.items()}
+            for analysis_id, deployment in summaries.items()}
 
 
-def get_pods(analysis_id_str: str, database: Database) -> dict[str, list[str]]:
+def get_pods(analysis_id_str: str,
+             database: Database,
+             query: Optional[AnalysisQuery] = None) -> dict[str, list[str]]:
     """Return the recorded pod ids for one or all analyses.
 
     Args:
         analysis_id_str: Specific analysis id or the literal string ``"all"``.
         database: Database wrapper used for the lookup.
+        query: Optional filters and pagination applied when listing ``"all"``.
 
     Returns:
         Mapping ``{analysis_id: [pod_id, ...]}``.
     """
-    if analysis_id_str == 'all':
-        analysis_ids = database.get_analysis_ids()
-    else:
-        analysis_ids = [analysis_id_str]
-    return {analysis_id: database.get_analysis_pod_ids(analysis_id) for analysis_id in analysis_ids}
+    analysis_ids = _query_analysis_ids(analysis_id_str, database, query)
+    return database.get_analyses_pod_ids(analysis_ids)
 
 
 def stop_analysis(analysis_id_str: str, database: Database) -> dict[str, str]:
@@ -207,26 +364,20 @@ def stop_analysis(analysis_id_str: str, database: Database) -> dict[str, str]:
     Returns:
         Mapping ``{analysis_id: final_status}``.
     """
-    if analysis_id_str == 'all':
-        analysis_ids = database.get_analysis_ids()
-    else:
-        analysis_ids = [analysis_id_str]
-
-    deployments = {}
-    for analysis_id in analysis_ids:
-        deployment = database.get_latest_deployment(analysis_id)
-        if deployment is not None:
-            deployments[analysis_id] = read_db_analysis(deployment)
+    analysis_ids = None if analysis_id_str == 'all' else [analysis_id_str]
+    deployments = {analysis_id: read_db_analysis(deployment)
+                   for analysis_id, deployment in database.get_latest_deployments(analysis_ids).items()}
 
     for analysis_id, deployment in deployments.items():
-        # save logs as string to database (will be read as dict in retrieve_history)
-        log = str(get_analysis_logs({analysis_id: deployment.deployment_name}, database=database))
+        # save logs as compressed snapshot (read back in retrieve_history), keeping the deployment row slim
+        database.store_log_snapshot(analysis_id,
+                                    get_analysis_logs({analysis_id: deployment.deployment_name}, database=database))
         if deployment.status in [AnalysisStatus.FAILED.value,
                                  AnalysisStatus.EXECUTED.value,
                                  AnalysisStatus.STARTED.value]:
-            deployment.stop(database, log=log, status=deployment.status)
+            deployment.stop(database, log='', status=deployment.status)
         else:
-            deployment.stop(database, log=log)
+            deployment.stop(database, log='')
 
         # update hub status
         init_hub_client_and_update_hub_status_with_client(analysis_id, deployment.status)
@@ -238,7 +389,12 @@ def delete_analysis(analysis_id_str: str, database: Database) -> dict[str, None]
     """Stop and permanently remove one or all analyses.
 
     In addition to :func:`stop_analysis`, this deletes the matching Keycloak
-    client and removes the analysis rows from the database.
+    client and removes the analysis rows from the database. Archived analyses
+    have no deployment left to stop and are only removed.
+
+    Per-credential pull secrets of batch deployments (see
+    :func:`harbor_secret_name`) are deleted as well once no remaining
+    deployment pulls with the same credentials.
 
     Args:
         analysis_id_str: Specific analysis id or the literal string ``"all"``.
@@ -247,23 +403,52 @@ def delete_analysis(analysis_id_str: str, database: Database) -> dict[str, None]
     Returns:
         Mapping ``{analysis_id: None}`` acknowledging the deletions.
     """
-    if analysis_id_str == 'all':
-        analysis_ids = database.get_analysis_ids()
-    else:
-        analysis_ids = [analysis_id_str]
-
-    deployments = {}
-    for analysis_id in analysis_ids:
-        deployment = database.get_latest_deployment(analysis_id)
-        if deployment is not None:
-            deployments[analysis_id] = read_db_analysis(deployment)
+    analysis_ids = None if analysis_id_str == 'all' else [analysis_id_str]
+    deployments = database.get_latest_deployments(analysis_ids, include_archived=True)
 
     for analysis_id, deployment in deployments.items():
-        deployment.stop(database, log='')
+        if not isinstance(deployment, ArchiveDB):
+            read_db_analysis(deployment).stop(database, log='')
         delete_keycloak_client(analysis_id)
         database.delete_analysis(analysis_id)
 
-    return {analysis_id: None for analysis_id, deployment in deployments.items()}
+    if deployments:
+        _delete_unused_harbor_secrets(database,
+                                      get_current_namespace(),
+                                      {_credentials(deployment) for deployment in deployments.values()})
+    return {analysis_id: None for analysis_id in deployments}
+
+
+def _delete_unused_harbor_secrets(database: Database,
+                                  namespace: str,
+                                  credentials: Optional[set[tuple[str, str, str]]] = None) -> int:
+    """Delete the per-credential pull secrets that no deployment in the database pulls with anymore.
+
+    The shared ``HARBOR_SECRET_NAME`` secret is never touched.
+
+    Args:
+        database: Database wrapper used to look up the credentials still in use.
+        namespace: Namespace the secrets live in.
+        credentials: Only consider the secrets of these registry credentials
+            (``None`` for all per-credential secrets).
+
+    Returns:
+        Number of deleted secrets.
+    """
+    unused = {name for name in find_k8s_resources('secret', namespace=namespace)
+              if (name is not None) and name.startswith(f"{HARBOR_SECRET_NAME}-")}
+    if credentials is not None:
+        unused &= _harbor_secret_names(credentials)
+    if unused:
+        unused -= _harbor_secret_names(database.get_registry_credentials())
+    for name in unused:
+        delete_k8s_resource(name, 'secret', namespace=namespace)
+    return len(unused)
+
+
+def _harbor_secret_names(credentials: set[tuple[str, str, str]]) -> set[str]:
+    """Return the per-credential pull secret names of complete registry credentials."""
+    return {harbor_secret_name(*credential) for credential in credentials if None not in credential}
 
 
 def unstuck_analysis_deployments(analysis_id: str, database: Database) -> None:
@@ -346,10 +531,11 @@ def cleanup(cleanup_type: str,
             if cleanup_type in ['all', 'keycloak']:
                 # cleanup keycloak clients without corresponding analysis
                 # if all is all flame clients are deleted because ther are no analyzes in the db
-                analysis_ids = database.get_analysis_ids()
-                for client in _get_all_keycloak_clients():
-                    if (client['clientId'] not in analysis_ids) and client['name'].startswith('flame-'):
-                        delete_keycloak_client(client['clientId'])
+                analysis_ids = set(database.get_analysis_ids())
+                orphaned_clients = [client for client in _get_flame_keycloak_clients()
+                                    if (client['clientId'] not in analysis_ids) and not is_pool_client(client)]
+                num_deleted = delete_keycloak_clients(orphaned_clients)
+                response_content[cleanup_type] = f"Deleted {num_deleted} orphaned keycloak clients"
 
         else:
             response_content[cleanup_type] = f"Unknown cleanup type: {cleanup_type} (known types: 'zombies', 'all', " +\
@@ -363,7 +549,8 @@ def clean_up_the_rest(database: Database, namespace: str = 'default') -> str:
 
     Iterates over deployments, pods, services, network policies, and config
     maps labelled as FLAME analysis resources, and removes any whose analysis
-    id is not present in the database.
+    id is not present in the database. Per-credential pull secrets no
+    deployment pulls with anymore are removed as well.
 
     Args:
         database: Database wrapper used to look up the known analysis ids.
@@ -389,17 +576,90 @@ def clean_up_the_rest(database: Database, namespace: str = 'default') -> str:
                 delete_k8s_resource(z, res, namespace=namespace)
             result_str += f"Deleted {len(zombie_resources)} zombie " + \
                           f"{'' if '-nginx' not in selector_arg else 'nginx-'}{res}s\n"
+    result_str += f"Deleted {_delete_unused_harbor_secrets(database, namespace)} zombie harbor secrets\n"
     return result_str
 
 
-def stream_logs(log_entity: CreateLogEntity, node_id: str, enable_hub_logging: bool, database: Database, hub_core_client: CoreClient) -> None:
+def stream_logs_batch(log_entities: list[CreateLogEntity],
+                      node_id: str,
+                      enable_hub_logging: bool,
+                      database: Database,
+                      hub_core_client: CoreClient,
+                      progress_buffer: Optional[ProgressBuffer] = None) -> dict[str, int]:
+    """Persist a batch of log lines and mirror status/progress into the FLAME Hub.
+
+    Same outcome as calling :func:`stream_logs` for each entity in order, but
+    the lines of all analyses are written in one database transaction and the
+    progress/status of each analysis is evaluated, and pushed to the Hub, once
+    per batch: the highest valid progress and the status of the analysis' last
+    entity win.
+
+    Args:
+        log_entities: Structured log bodies posted by the analyses, in order.
+        node_id: This node's id in the FLAME Hub.
+        enable_hub_logging: Whether to forward logs to the Hub.
+        database: Database wrapper used for persistence.
+        hub_core_client: Initialized Hub core client.
+        progress_buffer: If given, status/progress is handed to this
+            write-behind buffer instead of being written immediately.
+
+    Returns:
+        Mapping ``{analysis_id: number_of_lines_accepted}``.
+    """
+    batches: dict[str, list[CreateLogEntity]] = {}
+    for log_entity in log_entities:
+        batches.setdefault(log_entity.analysis_id, []).append(log_entity)
+
+    progress = {}
+    for analysis_id, entities in batches.items():
+        valid_progress = [entity.progress for entity in entities if entity.progress <= 100]
+        progress[analysis_id] = max(valid_progress) if valid_progress else None
+    lines = {analysis_id: [entity.to_log_record() for entity in entities] for analysis_id, entities in batches.items()}
+    if progress_buffer is not None:
+        database.append_analysis_logs_batch(lines)
+        progress_updated = set()
+    else:
+        progress_updated = database.append_analysis_logs_batch(lines, progress)
+
+    for analysis_id, entities in batches.items():
+        # log to hub
+        if enable_hub_logging:
+            for entity in entities:
+                hub_core_client.create_analysis_node_log(analysis_id=analysis_id,
+                                                         node_id=node_id,
+                                                         status=entity.status,
+                                                         level=entity.log_type,
+                                                         message=entity.log)
+
+        if progress_buffer is not None:
+            progress_buffer.record(analysis_id, entities[-1].status, progress[analysis_id])
+            continue
+        node_analysis_id = get_node_analysis_id(hub_core_client, analysis_id, node_id)
+        if analysis_id in progress_updated:
+            update_hub_status(hub_core_client,
+                              node_analysis_id,
+                              run_status=entities[-1].status,
+                              run_progress=progress[analysis_id])
+        else:
+            update_hub_status(hub_core_client, node_analysis_id, run_status=entities[-1].status)
+
+    return {analysis_id: len(entities) for analysis_id, entities in batches.items()}
+
+
+def stream_logs(log_entity: CreateLogEntity,
+                node_id: str,
+                enable_hub_logging: bool,
+                database: Database,
+                hub_core_client: CoreClient,
+                progress_buffer: Optional[ProgressBuffer] = None) -> None:
     """Persist a log line and mirror status/progress into the FLAME Hub.
 
-    * Appends the serialized log to the analysis row in the database.
+    * Appends the serialized log to the analysis' log lines in the database.
     * If ``enable_hub_logging`` is set, pushes the log to the Hub.
-    * If the reported progress is newer than what is stored, updates both the
-      DB progress and the Hub status+progress; otherwise only the Hub status
-      is refreshed.
+    * If a ``progress_buffer`` is given, the status/progress is recorded in
+      it and written behind; otherwise, if the reported progress is newer than
+      what is stored, updates both the DB progress and the Hub
+      status+progress, else only the Hub status is refreshed.
 
     Args:
         log_entity: Structured log body posted by the analysis.
@@ -407,9 +667,10 @@ def stream_logs(log_entity: CreateLogEntity, node_id: str, enable_hub_logging: b
         enable_hub_logging: Whether to forward logs to the Hub.
         database: Database wrapper used for persistence.
         hub_core_client: Initialized Hub core client.
+        progress_buffer: Optional write-behind buffer for status/progress.
     """
     try:
-        database.update_analysis_log(log_entity.analysis_id, str(log_entity.to_log_entity()))
+        database.update_analysis_log(log_entity.analysis_id, log_entity.to_log_record())
     except IndexError as e:
         logger.error(f"Failed to update analysis log in database: {repr(e)}")
 
@@ -421,7 +682,9 @@ def stream_logs(log_entity: CreateLogEntity, node_id: str, enable_hub_logging: b
                                                  level=log_entity.log_type,
                                                  message=log_entity.log)
 
-    if database.progress_valid(log_entity.analysis_id, log_entity.progress):
+    if progress_buffer is not None:
+        progress_buffer.record(log_entity.analysis_id, log_entity.status, log_entity.progress)
+    elif database.progress_valid(log_entity.analysis_id, log_entity.progress):
         database.update_analysis_progress(log_entity.analysis_id, log_entity.progress)
         update_hub_status(hub_core_client,
                           get_node_analysis_id(hub_core_client, log_entity.analysis_id, node_id),
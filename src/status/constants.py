@@ -26,3 +26,9 @@ class AnalysisStatus(Enum):
     EXECUTING = 'executing'
     EXECUTED = 'executed'
     FAILED = 'failed'
+
+
+# statuses of analyses that no longer run (persisted, unlike the transient STUCK)
+_TERMINAL_STATUSES = frozenset({AnalysisStatus.EXECUTED.value,
+                                AnalysisStatus.STOPPED.value,
+                                AnalysisStatus.FAILED.value})
@@ -1,3 +1,4 @@
+import threading
 import time
 import os
 from typing import Optional
@@ -28,6 +29,8 @@ from src.utils.po_logging import get_logger
 
 logger = get_logger()
 
+_LOG_PURGE_INTERVAL = 60 * 60  # Seconds between purges of expired logs
+
 
 def status_loop(database: Database, status_loop_interval: int) -> None:
     """Run the blocking background loop that reconciles analyses with the Hub.
@@ -42,6 +45,9 @@ def status_loop(database: Database, status_loop_interval: int) -> None:
       matching transition (restart, status update, or deletion);
     * submits the final Hub status for the iteration.
 
+    Between iterations the loop sleeps ``status_loop_interval`` seconds, but
+    wakes up early when the database change feed reports a new analysis.
+
     Args:
         database: Database wrapper used for all persistence.
         status_loop_interval: Seconds between iterations.
@@ -49,6 +55,15 @@ def status_loop(database: Database, status_loop_interval: int) -> None:
     hub_client = None
     node_id = None
     node_analysis_ids = {}
+    last_log_purge = 0.0
+
+    analysis_created = threading.Event()
+
+    def _on_change(_: str, operation: str) -> None:
+        if operation == 'INSERT':
+            analysis_created.set()
+
+    database.add_change_listener(_on_change)
 
     client_id, client_secret, hub_url_core, hub_auth, enable_hub_logging, http_proxy, https_proxy = extract_hub_envs()
 
@@ -84,8 +99,7 @@ def status_loop(database: Database, status_loop_interval: int) -> None:
                 continue
         else:
             # If running analyzes exist, enter status loop
-            running_analyzes = [analysis_id for analysis_id in database.get_analysis_ids()
-                                if database.analysis_is_running(analysis_id)]
+            running_analyzes = database.get_running_analysis_ids()
             logger.action(f"Checking for running analyzes...{running_analyzes}")
             if running_analyzes:
                 hub_client_issues = 0
@@ -158,11 +172,37 @@ def status_loop(database: Database, status_loop_interval: int) -> None:
                                     f"internal_status={analysis_status['int_status']} "
                                     f"to {analysis_hub_status}")
 
-            time.sleep(status_loop_interval)
+            if time.time() - last_log_purge >= _LOG_PURGE_INTERVAL:
+                last_log_purge = time.time()
+                _purge_expired_logs(database)
+                _archive_terminal_analyses(database)
+
+            analysis_created.wait(status_loop_interval)
+            analysis_created.clear()
             logger.status_loop(f"Iteration completed. Sleeping for {status_loop_interval} seconds.")
 
 
 
+def _purge_expired_logs(database: Database) -> None:
+    """Drop the stored logs of analyses past their retention period (errors are logged, not raised)."""
+    try:
+        purged = database.purge_expired_logs()
+        if purged:
+            logger.action(f"Purged expired logs of {len(purged)} analyses: {purged}")
+    except Exception as e:
+        logger.error(f"Failed to purge expired logs: {repr(e)}")
+
+
+def _archive_terminal_analyses(database: Database) -> None:
+    """Move long-terminated analyses to the archive table (errors are logged, not raised)."""
+    try:
+        archived = database.archive_terminal_analyses()
+        if archived:
+            logger.action(f"Archived {len(archived)} terminated analyses: {archived}")
+    except Exception as e:
+        logger.error(f"Failed to archive terminated analyses: {repr(e)}")
+
+
 def inform_analysis_of_partner_statuses(database: Database,
                                         hub_client: flame_hub.CoreClient,
                                         analysis_id: str,
@@ -180,7 +220,7 @@ def inform_analysis_of_partner_statuses(database: Database,
         API is not (yet) reachable.
     """
     node_statuses = get_partner_node_statuses(hub_client, analysis_id, node_analysis_id)
-    deployment_name = database.get_latest_deployment(analysis_id).deployment_name
+    deployment_name = database.get_latest_deployment_summary(analysis_id).deployment_name
     client = Client(base_url=f"http://nginx-{deployment_name}:{PORTS['nginx'][0]}")
     try: # try except, in case analysis api is not yet ready
         response = client.post(url="/analysis/partner_status",
@@ -211,7 +251,7 @@ def _get_analysis_status(analysis_id: str, database: Database) -> Optional[dict[
         ``status_action`` (one of ``unstuck``, ``running``, ``finishing``, or
         ``None``). Returns ``None`` when the analysis has no deployment.
     """
-    analysis = database.get_latest_deployment(analysis_id)
+    analysis = database.get_latest_deployment_summary(analysis_id)
     if analysis is not None:
         db_status = analysis.status
         # Make the Finished status final, the internal status is not checked anymore,
@@ -413,7 +453,7 @@ def _stream_stuck_logs(analysis: AnalysisDB,
 
 def _update_running_status(database: Database, analysis_status: dict[str, str]) -> None:
     """Transition the latest deployment from ``STARTED`` to ``EXECUTING`` in the DB."""
-    analysis = database.get_latest_deployment(analysis_status['analysis_id'])
+    analysis = database.get_latest_deployment_summary(analysis_status['analysis_id'])
     if analysis is not None:
         database.update_deployment_status(analysis.deployment_name, AnalysisStatus.EXECUTING.value)
 
@@ -425,7 +465,7 @@ def _update_finished_status(database: Database, analysis_status: dict[str, str])
     Keycloak client); anything else triggers a stop that retains the row for
     history.
     """
-    analysis = database.get_latest_deployment(analysis_status['analysis_id'])
+    analysis = database.get_latest_deployment_summary(analysis_status['analysis_id'])
     if analysis is not None:
         finished_status = analysis_status['int_status'] \
             if analysis_status['int_status'] != AnalysisStatus.STUCK.value else AnalysisStatus.FAILED.value
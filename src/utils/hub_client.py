@@ -211,12 +211,27 @@ def init_hub_client_and_update_hub_status_with_client(analysis_id: str, status:
     if hub_client is not None:
         node_id = get_node_id_by_client(hub_client, client_id)
         if node_id is not None:
-            node_analysis_id = get_node_analysis_id(hub_client, analysis_id, node_id)
-            if node_analysis_id is not None:
-                update_hub_status(hub_client, node_analysis_id, run_status=status)
-            else:
-                logger.error("Failed to retrieve node_analysis_id from hub client. Cannot update status.")
+            update_hub_status_for_analysis(hub_client, node_id, analysis_id, status)
         else:
             logger.error("Failed to retrieve node_id from hub client. Cannot update status.")
     else:
         logger.error(f"Failed to initialize hub client. Cannot update status.")
+
+
+def update_hub_status_for_analysis(hub_client: flame_hub.CoreClient,
+                                   node_id: str,
+                                   analysis_id: str,
+                                   status: str) -> None:
+    """Push a status update for an analysis using an already authenticated Hub client.
+
+    Args:
+        hub_client: Initialized Hub core client.
+        node_id: This node's Hub id (see :func:`get_node_id_by_client`).
+        analysis_id: Analysis whose Hub status should be updated.
+        status: New execution status string.
+    """
+    node_analysis_id = get_node_analysis_id(hub_client, analysis_id, node_id)
+    if node_analysis_id is not None:
+        update_hub_status(hub_client, node_analysis_id, run_status=status)
+    else:
+        logger.error("Failed to retrieve node_analysis_id from hub client. Cannot update status.")
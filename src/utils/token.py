@@ -1,6 +1,13 @@
 import os
+import time
+import uuid
+import threading
 import requests
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.utils.po_logging import get_logger
 
@@ -10,10 +17,195 @@ logger = get_logger()
 _KEYCLOAK_URL = os.getenv('KEYCLOAK_URL')
 _KEYCLOAK_REALM = os.getenv('KEYCLOAK_REALM')
 
+# (connect, read) timeouts in seconds applied to every Keycloak request
+_KEYCLOAK_TIMEOUT = (float(os.getenv('KEYCLOAK_CONNECT_TIMEOUT', '5')),
+                     float(os.getenv('KEYCLOAK_READ_TIMEOUT', '30')))
+_KEYCLOAK_MAX_RETRIES = int(os.getenv('KEYCLOAK_MAX_RETRIES', '3'))
+_KEYCLOAK_POOL_SIZE = int(os.getenv('KEYCLOAK_POOL_SIZE', '10'))
+_KEYCLOAK_PAGE_SIZE = int(os.getenv('KEYCLOAK_PAGE_SIZE', '100'))
+_KEYCLOAK_CLEANUP_WORKERS = int(os.getenv('KEYCLOAK_CLEANUP_WORKERS', '8'))
+_KEYCLOAK_CLIENT_POOL_SIZE = int(os.getenv('KEYCLOAK_CLIENT_POOL_SIZE', '2'))
+
+_POOL_CLIENT_PREFIX = 'flame-pool-'
+_POOL_REFILL_RETRY_INTERVAL = 30  # Time in seconds to wait before retrying a failed pool refill
+
+
+def _init_keycloak_session() -> requests.Session:
+    """Build the shared, connection-pooling session used for all Keycloak traffic.
+
+    Idempotent requests (``GET``, ``PUT``, ``DELETE``, ...) are retried with
+    exponential backoff on connection errors and on 502/503/504 responses.
+    Token requests (``POST``) are never retried automatically.
+    """
+    retry = Retry(total=_KEYCLOAK_MAX_RETRIES,
+                  backoff_factor=0.5,
+                  status_forcelist=(502, 503, 504),
+                  allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=_KEYCLOAK_POOL_SIZE,
+                          pool_maxsize=_KEYCLOAK_POOL_SIZE,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_KEYCLOAK_SESSION = _init_keycloak_session()
+
+
+class KeycloakClientPool:
+    """Warm pool of pre-created Keycloak service-account clients.
+
+    Pool clients are created in the background under a ``flame-pool-{uuid}``
+    client id. Starting a new analysis binds one of them by renaming it to the
+    analysis id, which replaces the creation and secret lookup on the critical
+    path with a single update request. The pool is refilled asynchronously
+    after every successful bind.
+
+    Attributes:
+        size: Number of clients kept ready (``0`` disables the pool).
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._clients: deque[tuple[str, str]] = deque()  # (client uuid, client secret)
+        self._lock = threading.Lock()
+        self._refill_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background refill thread (no-op if disabled or already running)."""
+        if (self.size <= 0) or (self._thread is not None):
+            return
+        self._thread = threading.Thread(target=self._run, name='keycloak-client-pool', daemon=True)
+        self._thread.start()
+
+    def available(self) -> int:
+        """Return the number of clients currently ready to be bound."""
+        with self._lock:
+            return len(self._clients)
+
+    def bind(self, analysis_id: str, admin_token: Optional[str] = None) -> Optional[str]:
+        """Rename a pooled client to ``analysis_id`` and return its secret.
+
+        Callers check that the analysis has no client yet (see
+        :func:`create_analysis_tokens`).
+
+        Args:
+            analysis_id: Analysis to bind a pooled client to.
+            admin_token: Admin access token to reuse; a new one is minted if omitted.
+
+        Returns:
+            The client secret, or ``None`` if the pool is empty or the rename
+            failed.
+        """
+        with self._lock:
+            if not self._clients:
+                return None
+            client_uuid, client_secret = self._clients.popleft()
+
+        url_update_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients/{client_uuid}"
+        client_data = {'clientId': f"{analysis_id}",
+                       'name': f"flame-{analysis_id}"}
+        try:
+            if admin_token is None:
+                admin_token = _get_keycloak_admin_token()
+            headers = {'Authorization': f"Bearer {admin_token}",
+                       'Content-Type': "application/json"}
+            response = _KEYCLOAK_SESSION.put(url_update_client,
+                                             headers=headers,
+                                             json=client_data,
+                                             timeout=_KEYCLOAK_TIMEOUT)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            # the pooled client stays unbound and is put back, so no refill is needed
+            logger.warning(f"Failed to bind pooled keycloak client to analysis {analysis_id}: {repr(e)}")
+            with self._lock:
+                self._clients.appendleft((client_uuid, client_secret))
+            return None
+        self._refill_event.set()
+        logger.action(f"Bound pooled keycloak client to analysis {analysis_id}")
+        return client_secret
+
+    def _run(self) -> None:
+        """Adopt leftover pool clients once, then refill whenever a client was taken.
+
+        Any failure (unreachable Keycloak, unexpected responses) is logged and
+        retried after ``_POOL_REFILL_RETRY_INTERVAL`` seconds, so the thread
+        never dies.
+        """
+        adopted = False
+        self._refill_event.set()
+        while True:
+            self._refill_event.wait()
+            self._refill_event.clear()
+            try:
+                if not adopted:
+                    self._adopt()
+                    adopted = True
+                self._refill()
+            except Exception as e:
+                logger.warning(f"Failed to refill keycloak client pool: {repr(e)}")
+                time.sleep(_POOL_REFILL_RETRY_INTERVAL)
+                self._refill_event.set()
+
+    def _adopt(self) -> None:
+        """Take over pool clients left behind by a previous orchestrator instance."""
+        admin_token = _get_keycloak_admin_token()
+        url_get_clients = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients"
+        headers = {'Authorization': f"Bearer {admin_token}"}
+
+        response = _KEYCLOAK_SESSION.get(url_get_clients,
+                                         headers=headers,
+                                         params={'clientId': _POOL_CLIENT_PREFIX, 'search': 'true'},
+                                         timeout=_KEYCLOAK_TIMEOUT)
+        response.raise_for_status()
+        leftovers = [client for client in response.json() if client['clientId'].startswith(_POOL_CLIENT_PREFIX)]
+
+        with self._lock:
+            while leftovers and (len(self._clients) < self.size):
+                client = leftovers.pop()
+                self._clients.append((client['id'], client['secret']))
+        delete_keycloak_clients(leftovers)
+
+    def _refill(self) -> None:
+        """Create pool clients until ``size`` clients are ready."""
+        while self.available() < self.size:
+            admin_token = _get_keycloak_admin_token()
+            client_id = f"{_POOL_CLIENT_PREFIX}{uuid.uuid4()}"
+            _create_keycloak_client(admin_token, client_id, name=client_id)
+
+            url_get_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients?clientId={client_id}"
+            headers = {'Authorization': f"Bearer {admin_token}"}
+            response = _KEYCLOAK_SESSION.get(url_get_client, headers=headers, timeout=_KEYCLOAK_TIMEOUT)
+            response.raise_for_status()
+            client = response.json()[0]
+
+            with self._lock:
+                self._clients.append((client['id'], client['secret']))
+
+
+_KEYCLOAK_CLIENT_POOL = KeycloakClientPool(_KEYCLOAK_CLIENT_POOL_SIZE)
+
+
+def start_keycloak_client_pool() -> None:
+    """Start filling the warm pool of Keycloak analysis clients in the background."""
+    _KEYCLOAK_CLIENT_POOL.start()
+
+
+def is_pool_client(client: dict) -> bool:
+    """Return True if a raw Keycloak client dict belongs to the warm client pool."""
+    return client['clientId'].startswith(_POOL_CLIENT_PREFIX)
+
 
 def create_analysis_tokens(kong_token: str, analysis_id: str) -> dict[str, str]:
     """Assemble the token env dict injected into the analysis container.
 
+    A new analysis gets a pooled Keycloak client if one is available, while a
+    restarted analysis keeps its existing client; otherwise the client is
+    looked up or created on demand.
+
     Args:
         kong_token: Opaque Kong token minted for the analysis by the node.
         analysis_id: Analysis id used as the Keycloak client id.
@@ -22,32 +214,48 @@ def create_analysis_tokens(kong_token: str, analysis_id: str) -> dict[str, str]:
         Dict with ``DATA_SOURCE_TOKEN`` (the Kong token) and
         ``KEYCLOAK_TOKEN`` (a freshly minted service-account token).
     """
+    keycloak_token = None
+    admin_token = None
+    if _KEYCLOAK_CLIENT_POOL.available() > 0:
+        admin_token = _get_keycloak_admin_token()
+        if not _keycloak_client_exists(analysis_id, admin_token):
+            pooled_secret = _KEYCLOAK_CLIENT_POOL.bind(analysis_id, admin_token)
+            if pooled_secret is not None:
+                keycloak_token = _request_keycloak_token(analysis_id, pooled_secret)
+    if keycloak_token is None:
+        keycloak_token = get_keycloak_token(analysis_id, admin_token)
+
     tokens = {'DATA_SOURCE_TOKEN': kong_token,
-              'KEYCLOAK_TOKEN': get_keycloak_token(analysis_id)}
+              'KEYCLOAK_TOKEN': keycloak_token}
     return tokens
 
 
-def get_keycloak_token(analysis_id: str) -> Optional[str]:
+def get_keycloak_token(analysis_id: str, admin_token: Optional[str] = None) -> Optional[str]:
     """Obtain a client-credentials access token for an analysis's Keycloak client.
 
     Creates the Keycloak client on demand if it does not already exist.
 
     Args:
         analysis_id: Analysis id used as the Keycloak client id.
+        admin_token: Admin access token to reuse; a new one is minted if omitted.
 
     Returns:
         The access token, or ``None`` on HTTP failure.
     """
-    client_secret = _get_keycloak_client_secret(analysis_id)
+    client_secret = _get_keycloak_client_secret(analysis_id, admin_token)
+    return _request_keycloak_token(analysis_id, client_secret)
 
+
+def _request_keycloak_token(client_id: str, client_secret: str) -> Optional[str]:
+    """Run the client-credentials grant for a client; return the token or ``None`` on HTTP failure."""
     keycloak_url = f"{_KEYCLOAK_URL}/realms/flame/protocol/openid-connect/token"
     data = {'grant_type': 'client_credentials',
-            'client_id': analysis_id,
+            'client_id': client_id,
             'client_secret': client_secret}
 
     # get token from keycloak like in the above curl command
     try:
-        response = requests.post(keycloak_url, data=data)
+        response = _KEYCLOAK_SESSION.post(keycloak_url, data=data, timeout=_KEYCLOAK_TIMEOUT)
         response.raise_for_status()
 
         return response.json()['access_token']
@@ -56,9 +264,10 @@ def get_keycloak_token(analysis_id: str) -> Optional[str]:
         return None
 
 
-def _get_keycloak_client_secret(analysis_id: str) -> str:
-    """Return the client secret for an analysis, creating the client if needed."""
-    admin_token = _get_keycloak_admin_token()
+def _get_keycloak_client_secret(analysis_id: str, admin_token: Optional[str] = None) -> str:
+    """Return the client secret for an analysis, creating the client if needed (minting an admin token if omitted)."""
+    if admin_token is None:
+        admin_token = _get_keycloak_admin_token()
 
     if not _keycloak_client_exists(analysis_id, admin_token):
         # create client
@@ -68,7 +277,7 @@ def _get_keycloak_client_secret(analysis_id: str) -> str:
     url_get_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients?clientId={analysis_id}"
     headers = {'Authorization': f"Bearer {admin_token}"}
 
-    response = requests.get(url_get_client, headers=headers)
+    response = _KEYCLOAK_SESSION.get(url_get_client, headers=headers, timeout=_KEYCLOAK_TIMEOUT)
     response.raise_for_status()
 
     return response.json()[0]['secret']
@@ -86,7 +295,7 @@ def _get_keycloak_admin_token() -> str:
         'client_id': keycloak_admin_client_id,
         'client_secret': keycloak_admin_client_secret
     }
-    response = requests.post(url_admin_access_token, data=data)
+    response = _KEYCLOAK_SESSION.post(url_admin_access_token, data=data, timeout=_KEYCLOAK_TIMEOUT)
     response.raise_for_status()
 
     return response.json()['access_token']
@@ -97,34 +306,92 @@ def _keycloak_client_exists(analysis_id: str, admin_token: str) -> bool:
     url_get_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients?clientId={analysis_id}"
     headers = {'Authorization': f"Bearer {admin_token}"}
 
-    response = requests.get(url_get_client, headers=headers)
+    response = _KEYCLOAK_SESSION.get(url_get_client, headers=headers, timeout=_KEYCLOAK_TIMEOUT)
     response.raise_for_status()
 
     return bool(response.json())
 
 
-def _create_keycloak_client(admin_token: str, analysis_id: str) -> None:
-    """Create a service-account Keycloak client named ``flame-{analysis_id}``."""
+def _create_keycloak_client(admin_token: str, analysis_id: str, name: Optional[str] = None) -> None:
+    """Create a service-account Keycloak client named ``flame-{analysis_id}`` (or ``name``)."""
     url_create_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients"
     headers = {'Authorization': f"Bearer {admin_token}",
                'Content-Type': "application/json"}
     client_data = {'clientId': f"{analysis_id}",
-                   'name': f"flame-{analysis_id}",
+                   'name': name if name is not None else f"flame-{analysis_id}",
                    'serviceAccountsEnabled': 'true'}
 
-    response = requests.post(url_create_client, headers=headers, json=client_data)
+    response = _KEYCLOAK_SESSION.post(url_create_client, headers=headers, json=client_data, timeout=_KEYCLOAK_TIMEOUT)
     response.raise_for_status()
 
-def _get_all_keycloak_clients() -> list[dict]:
-    """Return every Keycloak client in the configured realm as raw JSON dicts."""
-    admin_token = _get_keycloak_admin_token()
+def _get_flame_keycloak_clients(admin_token: Optional[str] = None) -> Iterator[dict]:
+    """Yield every ``flame-`` Keycloak client of the configured realm as raw JSON dicts.
+
+    Clients are listed in pages of ``KEYCLOAK_PAGE_SIZE`` and filtered on the
+    ``flame-`` name prefix page by page, so the full realm is never held in
+    memory at once.
+
+    Args:
+        admin_token: Admin access token to reuse; a new one is minted if omitted.
+    """
+    if admin_token is None:
+        admin_token = _get_keycloak_admin_token()
     url_get_clients = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients"
     headers = {'Authorization': f"Bearer {admin_token}"}
 
-    response = requests.get(url_get_clients, headers=headers)
+    first = 0
+    while True:
+        response = _KEYCLOAK_SESSION.get(url_get_clients,
+                                         headers=headers,
+                                         params={'first': first, 'max': _KEYCLOAK_PAGE_SIZE},
+                                         timeout=_KEYCLOAK_TIMEOUT)
+        response.raise_for_status()
+        page = response.json()
+        for client in page:
+            if (client.get('name') or '').startswith('flame-'):
+                yield client
+        if len(page) < _KEYCLOAK_PAGE_SIZE:
+            break
+        first += _KEYCLOAK_PAGE_SIZE
+
+
+def delete_keycloak_clients(clients: list[dict]) -> int:
+    """Delete a batch of Keycloak clients concurrently.
+
+    Uses the client UUIDs (``id``) already present in the listing, so no
+    per-client lookup is needed, and a single admin token for the whole batch.
+    At most ``KEYCLOAK_CLEANUP_WORKERS`` deletions run at the same time.
+
+    Args:
+        clients: Raw client dicts as returned by :func:`_get_flame_keycloak_clients`.
+
+    Returns:
+        The number of clients that were deleted successfully.
+    """
+    if not clients:
+        return 0
+    admin_token = _get_keycloak_admin_token()
+
+    def _delete(client: dict) -> bool:
+        try:
+            _delete_keycloak_client_by_uuid(client['id'], admin_token)
+            return True
+        except (KeyError, requests.exceptions.RequestException) as e:
+            logger.error(f"Failed to delete keycloak client {client.get('clientId')}: {repr(e)}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=_KEYCLOAK_CLEANUP_WORKERS) as executor:
+        return sum(executor.map(_delete, clients))
+
+
+def _delete_keycloak_client_by_uuid(client_uuid: str, admin_token: str) -> None:
+    """Delete the Keycloak client with the given internal UUID."""
+    url_delete_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients/{client_uuid}"
+    headers = {'Authorization': f"Bearer {admin_token}"}
+
+    response = _KEYCLOAK_SESSION.delete(url_delete_client, headers=headers, timeout=_KEYCLOAK_TIMEOUT)
     response.raise_for_status()
 
-    return response.json()
 
 def delete_keycloak_client(analysis_id: str) -> None:
     """Delete the Keycloak client associated with an analysis.
@@ -137,16 +404,12 @@ def delete_keycloak_client(analysis_id: str) -> None:
     url_get_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients?clientId={analysis_id}"
     headers = {'Authorization': f"Bearer {admin_token}"}
 
-    response = requests.get(url_get_client, headers=headers)
+    response = _KEYCLOAK_SESSION.get(url_get_client, headers=headers, timeout=_KEYCLOAK_TIMEOUT)
     response.raise_for_status()
     try:
-        uuid = response.json()[0]['id']
+        client_uuid = response.json()[0]['id']
     except (KeyError, IndexError) as e:
         logger.error(f"Failed to retrieve keycloak client: {repr(e)}")
         return
 
-    url_delete_client = f"{_KEYCLOAK_URL}/admin/realms/{_KEYCLOAK_REALM}/clients/{uuid}"
-    headers = {'Authorization': f"Bearer {admin_token}"}
-
-    response = requests.delete(url_delete_client, headers=headers)
-    response.raise_for_status()
+    _delete_keycloak_client_by_uuid(client_uuid, admin_token)
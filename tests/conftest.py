@@ -115,15 +115,27 @@ def mock_database(sample_analysis_db):
 
     mock_db.get_deployment.return_value = default_analysis
     mock_db.get_latest_deployment.return_value = default_analysis
+    mock_db.get_latest_deployment_summary.return_value = default_analysis
+    mock_db.get_latest_deployments.return_value = {"analysis_id": default_analysis}
+    mock_db.get_latest_deployment_summaries.return_value = {"analysis_id": default_analysis}
+    mock_db.get_running_analysis_ids.return_value = ["analysis_id"]
     mock_db.get_deployments.return_value = [default_analysis]
     mock_db.create_analysis.return_value = default_analysis
-    mock_db.update_analysis.return_value = [default_analysis]
+    mock_db.update_analysis.return_value = 1
     mock_db.update_deployment.return_value = default_analysis
     mock_db.get_analysis_ids.return_value = ["analysis_id"]
+    mock_db.query_analysis_ids.return_value = ["analysis_id"]
+    mock_db.get_state_version.return_value = (1, 1700000000.0)
     mock_db.get_deployment_ids.return_value = ["analysis-analysis_id-0"]
     mock_db.get_deployment_pod_ids.return_value = ["pod-1"]
     mock_db.get_analysis_pod_ids.return_value = [["pod-1"]]
+    mock_db.get_analyses_pod_ids.return_value = {"analysis_id": [["pod-1"]]}
     mock_db.get_analysis_log.return_value = ""
+    mock_db.get_log_snapshot.return_value = None
+    mock_db.migrate_legacy_log.return_value = None
+    mock_db.get_log_storage_stats.return_value = {"snapshots": 0, "log_lines": 0}
+    mock_db.get_cache_stats.return_value = {"enabled": False}
+    mock_db.get_change_feed_mode.return_value = "polling"
     mock_db.get_analysis_progress.return_value = 0
     mock_db.analysis_is_running.return_value = True
     mock_db.progress_valid.return_value = True
@@ -6,10 +6,14 @@ Uses the api_test_client fixture from conftest.py, which:
   - patches hub client init to avoid real network calls
 """
 
-from unittest.mock import MagicMock, patch
+import json
+
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.resources.analysis.entity import AnalysisQuery
+from src.resources.log.entity import LogQuery
 from src.status.constants import AnalysisStatus
 
 
@@ -42,6 +46,60 @@ class TestHealthEndpoint:
         app.dependency_overrides.update(overrides_backup)
 
 
+# ─── TestBlockingExecutors ────────────────────────────────────────────────────
+
+class TestBlockingExecutors:
+    def test_all_handlers_are_async(self, api_test_client):
+        import inspect
+
+        po_routes = [route for route in api_test_client.app.routes if getattr(route, "path", "").startswith("/po")]
+        assert po_routes
+        assert all(inspect.iscoroutinefunction(route.endpoint) for route in po_routes)
+
+    def test_database_work_runs_in_db_executor(self, api_test_client):
+        import threading
+
+        thread_names = []
+
+        def _record(*args):
+            thread_names.append(threading.current_thread().name)
+            return {}
+
+        with patch("src.api.api.get_status_and_progress", side_effect=_record):
+            response = api_test_client.get("/po/status")
+        assert response.status_code == 200
+        assert thread_names[0].startswith("po-db")
+
+    def test_cluster_work_runs_in_k8s_executor(self, api_test_client):
+        import threading
+
+        thread_names = []
+
+        def _record(*args):
+            thread_names.append(threading.current_thread().name)
+            return {}
+
+        with patch("src.api.api.retrieve_logs", side_effect=_record):
+            response = api_test_client.get("/po/logs")
+        assert response.status_code == 200
+        assert thread_names[0].startswith("po-k8s")
+
+
+# ─── TestMetricsEndpoint ──────────────────────────────────────────────────────
+
+class TestMetricsEndpoint:
+    def test_metrics_returns_token_cache_stats(self, api_test_client):
+        fake_stats = {"size": 1, "max_size": 1024, "hits": 3, "misses": 1, "hit_rate": 0.75}
+        with patch("src.api.api.get_token_cache_stats", return_value=fake_stats):
+            response = api_test_client.get("/po/metrics")
+        assert response.status_code == 200
+        assert response.json() == {"token_cache": fake_stats,
+                                   "status_stream": {"subscribers": 0},
+                                   "log_storage": {"snapshots": 0, "log_lines": 0},
+                                   "state_cache": {"enabled": False},
+                                   "change_feed": {"mode": "polling"}}
+
+
 # ─── TestUnauthenticated ──────────────────────────────────────────────────────
 
 class TestUnauthenticated:
@@ -89,6 +147,42 @@ class TestCreateAnalysis:
         assert data["analysis_id"] == AnalysisStatus.STARTING.value
 
 
+# ─── TestBatchCreateEndpoint ──────────────────────────────────────────────────
+
+class TestBatchCreateEndpoint:
+    def _body(self, analysis_id):
+        return {
+            "analysis_id": analysis_id,
+            "project_id": "project_id",
+            "registry_url": "harbor.privateaim",
+            "image_url": "harbor.privateaim/node_id/analysis_id",
+            "registry_user": "robot_user",
+            "registry_password": "default_pw",
+            "kong_token": "default_kong_token",
+        }
+
+    def test_batch_create(self, api_test_client, mock_database, mock_hub_client):
+        fake_result = [{"analysis_id": "a1", "status": "started"}, {"analysis_id": "a2", "error": "err"}]
+        with patch("src.api.api.create_analyses", return_value=fake_result) as mock_fn:
+            response = api_test_client.post("/po/batch", json=[self._body("a1"), self._body("a2")])
+        assert response.status_code == 200
+        assert response.json() == fake_result
+        bodies, database, hub_client, node_id = mock_fn.call_args[0]
+        assert [body.analysis_id for body in bodies] == ["a1", "a2"]
+        assert database is mock_database
+
+    def test_batch_create_500_on_exception(self, api_test_client):
+        with patch("src.api.api.create_analyses", side_effect=RuntimeError("err")):
+            response = api_test_client.post("/po/batch", json=[self._body("a1")])
+        assert response.status_code == 500
+
+    def test_batch_create_rejects_invalid_item(self, api_test_client):
+        with patch("src.api.api.create_analyses") as mock_fn:
+            response = api_test_client.post("/po/batch", json=[{"analysis_id": "a1"}])
+        assert response.status_code == 422
+        mock_fn.assert_not_called()
+
+
 # ─── TestHistoryEndpoints ─────────────────────────────────────────────────────
 
 class TestHistoryEndpoints:
@@ -97,7 +191,7 @@ class TestHistoryEndpoints:
         with patch("src.api.api.retrieve_history", return_value=fake_result) as mock_fn:
             response = api_test_client.get("/po/history")
         assert response.status_code == 200
-        mock_fn.assert_called_once_with("all", mock_fn.call_args[0][1])
+        mock_fn.assert_called_once_with("all", mock_fn.call_args[0][1], AnalysisQuery(), LogQuery())
 
     def test_retrieve_all_history_500_on_exception(self, api_test_client):
         with patch("src.api.api.retrieve_history", side_effect=RuntimeError("db error")):
@@ -109,7 +203,21 @@ class TestHistoryEndpoints:
         with patch("src.api.api.retrieve_history", return_value=fake_result) as mock_fn:
             response = api_test_client.get("/po/history/analysis_id")
         assert response.status_code == 200
-        mock_fn.assert_called_once_with("analysis_id", mock_fn.call_args[0][1])
+        mock_fn.assert_called_once_with("analysis_id", mock_fn.call_args[0][1], None, LogQuery())
+
+    def test_history_log_filters_forwarded(self, api_test_client):
+        with patch("src.api.api.retrieve_history", return_value={}) as mock_fn:
+            response = api_test_client.get("/po/history/analysis_id", params={"level": ["error", "warn"],
+                                                                             "since": 1700000000,
+                                                                             "until": 1700003600.5})
+        assert response.status_code == 200
+        assert mock_fn.call_args[0][3] == LogQuery(level=["error", "warn"], since=1700000000, until=1700003600.5)
+
+    def test_history_invalid_level_rejected(self, api_test_client):
+        with patch("src.api.api.retrieve_history", return_value={}) as mock_fn:
+            response = api_test_client.get("/po/history", params={"level": "verbose"})
+        assert response.status_code == 422
+        mock_fn.assert_not_called()
 
     def test_retrieve_history_by_id_500_on_exception(self, api_test_client):
         with patch("src.api.api.retrieve_history", side_effect=RuntimeError("db error")):
@@ -117,6 +225,30 @@ class TestHistoryEndpoints:
         assert response.status_code == 500
 
 
+# ─── TestListingFilters ───────────────────────────────────────────────────────
+
+class TestListingFilters:
+    def test_status_filters_and_pagination_are_forwarded(self, api_test_client):
+        with patch("src.api.api.get_status_and_progress", return_value={}) as mock_fn:
+            response = api_test_client.get("/po/status", params={"status": ["executing", "started"],
+                                                                 "project_id": "project_id",
+                                                                 "created_after": 1700000000.5,
+                                                                 "limit": 10,
+                                                                 "offset": 20})
+        assert response.status_code == 200
+        assert mock_fn.call_args[0][2] == AnalysisQuery(status=["executing", "started"],
+                                                        project_id="project_id",
+                                                        created_after=1700000000.5,
+                                                        limit=10,
+                                                        offset=20)
+
+    def test_invalid_limit_rejected(self, api_test_client):
+        with patch("src.api.api.get_pods", return_value={}) as mock_fn:
+            response = api_test_client.get("/po/pods", params={"limit": 0})
+        assert response.status_code == 422
+        mock_fn.assert_not_called()
+
+
 # ─── TestLogsEndpoints ────────────────────────────────────────────────────────
 
 class TestLogsEndpoints:
@@ -145,6 +277,100 @@ class TestLogsEndpoints:
         assert response.status_code == 500
 
 
+# ─── TestResponseCompression ──────────────────────────────────────────────────
+
+class TestResponseCompression:
+    LARGE_RESULT = {"analysis": {"analysis_id": ["log line"] * 1000}, "nginx": {"analysis_id": []}}
+
+    def test_history_gzip_when_accepted(self, api_test_client):
+        with patch("src.api.api.retrieve_history", return_value=self.LARGE_RESULT):
+            response = api_test_client.get("/po/history", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == self.LARGE_RESULT
+
+    def test_history_zstd_preferred(self, api_test_client):
+        with patch("src.api.api.retrieve_history", return_value=self.LARGE_RESULT):
+            response = api_test_client.get("/po/history/analysis_id", headers={"Accept-Encoding": "gzip, zstd"})
+        assert response.headers["content-encoding"] == "zstd"
+        assert response.json() == self.LARGE_RESULT
+
+    def test_logs_uncompressed_without_accept_encoding(self, api_test_client):
+        with patch("src.api.api.retrieve_logs", return_value=self.LARGE_RESULT):
+            response = api_test_client.get("/po/logs", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == self.LARGE_RESULT
+
+    def test_small_body_not_compressed(self, api_test_client):
+        with patch("src.api.api.retrieve_logs", return_value={}):
+            response = api_test_client.get("/po/logs/analysis_id", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == {}
+
+
+# ─── TestLogStreaming ─────────────────────────────────────────────────────────
+
+class _FakeLogStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+        self.threads = []
+
+    def __iter__(self):
+        import threading
+
+        for chunk in self.chunks:
+            self.threads.append(threading.current_thread().name)
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class TestLogStreaming:
+    def test_follow_streams_chunks(self, api_test_client):
+        log_stream = _FakeLogStream(["line 1\n", "line 2\n"])
+        with patch("src.api.api.open_log_stream", return_value=log_stream) as mock_fn:
+            response = api_test_client.get("/po/logs/analysis_id", params={"follow": "true", "tail": 10})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == "line 1\nline 2\n"
+        mock_fn.assert_called_once_with("analysis_id", mock_fn.call_args[0][1], "analysis", True, 10, None)
+        assert log_stream.closed
+        assert all(name.startswith("po-logs") for name in log_stream.threads)
+
+    def test_since_seconds_and_nginx_source(self, api_test_client):
+        with patch("src.api.api.open_log_stream", return_value=_FakeLogStream([])) as mock_fn:
+            response = api_test_client.get("/po/logs/analysis_id", params={"since_seconds": 60, "source": "nginx"})
+        assert response.status_code == 200
+        mock_fn.assert_called_once_with("analysis_id", mock_fn.call_args[0][1], "nginx", False, None, 60)
+
+    def test_without_stream_params_returns_json(self, api_test_client):
+        with (
+            patch("src.api.api.open_log_stream") as mock_stream,
+            patch("src.api.api.retrieve_logs", return_value={}),
+        ):
+            response = api_test_client.get("/po/logs/analysis_id")
+        assert response.status_code == 200
+        mock_stream.assert_not_called()
+
+    def test_missing_pod_returns_404(self, api_test_client):
+        with patch("src.api.api.open_log_stream", return_value=None):
+            response = api_test_client.get("/po/logs/analysis_id", params={"follow": "true"})
+        assert response.status_code == 404
+
+    def test_open_failure_returns_500(self, api_test_client):
+        with patch("src.api.api.open_log_stream", side_effect=RuntimeError("err")):
+            response = api_test_client.get("/po/logs/analysis_id", params={"follow": "true"})
+        assert response.status_code == 500
+
+    def test_invalid_tail_rejected(self, api_test_client):
+        response = api_test_client.get("/po/logs/analysis_id", params={"tail": -1})
+        assert response.status_code == 422
+
+
 # ─── TestStatusEndpoints ──────────────────────────────────────────────────────
 
 class TestStatusEndpoints:
@@ -153,7 +379,7 @@ class TestStatusEndpoints:
         with patch("src.api.api.get_status_and_progress", return_value=fake_result) as mock_fn:
             response = api_test_client.get("/po/status")
         assert response.status_code == 200
-        mock_fn.assert_called_once_with("all", mock_fn.call_args[0][1])
+        mock_fn.assert_called_once_with("all", mock_fn.call_args[0][1], AnalysisQuery())
 
     def test_get_all_status_500_on_exception(self, api_test_client):
         with patch("src.api.api.get_status_and_progress", side_effect=RuntimeError("err")):
@@ -173,6 +399,135 @@ class TestStatusEndpoints:
         assert response.status_code == 500
 
 
+# ─── TestConditionalStatus ────────────────────────────────────────────────────
+
+class TestConditionalStatus:
+    def test_status_sets_validators(self, api_test_client):
+        with patch("src.api.api.get_status_and_progress", return_value={}):
+            response = api_test_client.get("/po/status")
+        assert response.status_code == 200
+        assert response.headers["etag"].endswith('-1"')
+        assert response.headers["last-modified"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    def test_matching_etag_returns_304_without_db_work(self, api_test_client):
+        with patch("src.api.api.get_status_and_progress", return_value={}) as mock_fn:
+            etag = api_test_client.get("/po/status").headers["etag"]
+            response = api_test_client.get("/po/status", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert mock_fn.call_count == 1
+
+    def test_weak_and_listed_etags_match(self, api_test_client):
+        with patch("src.api.api.get_status_and_progress", return_value={}) as mock_fn:
+            etag = api_test_client.get("/po/status/analysis_id").headers["etag"]
+            response = api_test_client.get("/po/status/analysis_id",
+                                           headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == 304
+        assert mock_fn.call_count == 1
+
+    def test_changed_state_returns_200(self, api_test_client, mock_database):
+        with patch("src.api.api.get_status_and_progress", return_value={}) as mock_fn:
+            etag = api_test_client.get("/po/status").headers["etag"]
+            mock_database.get_state_version.return_value = (2, 1700000001.0)
+            response = api_test_client.get("/po/status", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert mock_fn.call_count == 2
+
+
+# ─── TestStatusStream ─────────────────────────────────────────────────────────
+
+def _api_instance(api_test_client):
+    """Return the PodOrchestrationAPI instance behind the captured app."""
+    route = next(r for r in api_test_client.app.routes if getattr(r, "path", "") == "/po/status/stream")
+    return route.endpoint.__self__
+
+
+class TestStatusStream:
+    def test_stream_route_not_shadowed_by_analysis_id(self, api_test_client):
+        paths = [getattr(r, "path", "") for r in api_test_client.app.routes]
+        assert paths.index("/po/status/stream") < paths.index("/po/status/{analysis_id}")
+
+    def test_listener_registered_on_database(self, api_test_client, mock_database):
+        api = _api_instance(api_test_client)
+        mock_database.add_status_listener.assert_called_once_with(api.status_broadcaster.publish)
+        mock_database.add_change_listener.assert_called_once_with(api._publish_change)
+
+    def test_change_feed_publishes_latest_state(self, api_test_client, mock_database):
+        api = _api_instance(api_test_client)
+        with patch.object(api.status_broadcaster, "subscriber_count", return_value=1), \
+                patch.object(api.status_broadcaster, "publish") as mock_publish:
+            api._publish_change("analysis_id", "UPDATE")
+        mock_publish.assert_called_once_with("analysis_id", "started", 0)
+
+    def test_change_feed_forgets_deleted_analysis(self, api_test_client, mock_database):
+        api = _api_instance(api_test_client)
+        api.status_broadcaster.publish("analysis_id", "executed", 100)
+        mock_database.get_latest_deployment_summary.return_value = None
+        api._publish_change("analysis_id", "DELETE")
+        assert "analysis_id" not in api.status_broadcaster._last_states
+
+    def test_change_feed_keeps_state_when_older_deployment_deleted(self, api_test_client, mock_database):
+        api = _api_instance(api_test_client)
+        api._publish_change("analysis_id", "DELETE")
+        assert api.status_broadcaster._last_states["analysis_id"] == ("started", 0)
+
+    def test_change_feed_skips_lookup_without_subscribers(self, api_test_client, mock_database):
+        api = _api_instance(api_test_client)
+        mock_database.get_latest_deployment_summary.reset_mock()
+        api._publish_change("analysis_id", "UPDATE")
+        mock_database.get_latest_deployment_summary.assert_not_called()
+
+    def test_snapshot_then_transitions(self, api_test_client):
+        import anyio
+
+        api = _api_instance(api_test_client)
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(side_effect=[False, False, True])
+        snapshot = {"analysis_id": {"status": "started", "progress": 0}}
+
+        async def _consume():
+            with patch("src.api.api.get_status_and_progress", return_value=snapshot):
+                response = await api.stream_status_call(request, None)
+                body = response.body_iterator
+                first = await body.__anext__()
+                api.status_broadcaster.publish("analysis_id", "executing", 10)
+                api.status_broadcaster.publish("analysis_id", "executing", 10)  # duplicate, dropped
+                api.status_broadcaster.publish("analysis_id", "executing", 20)
+                rest = [chunk async for chunk in body]
+            return response, first, rest
+
+        response, first, rest = anyio.run(_consume)
+        assert response.media_type == "text/event-stream"
+        assert first == f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+        assert rest == [
+            'event: status\ndata: {"analysis_id": {"status": "executing", "progress": 10}}\n\n',
+            'event: status\ndata: {"analysis_id": {"status": "executing", "progress": 20}}\n\n',
+        ]
+        assert api.status_broadcaster.subscriber_count() == 0
+
+    def test_filtered_stream_skips_other_analyses(self, api_test_client):
+        import anyio
+
+        api = _api_instance(api_test_client)
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(side_effect=[False, False, True])
+
+        async def _consume():
+            with patch("src.api.api.get_status_and_progress", return_value={}) as mock_fn:
+                response = await api.stream_status_call(request, ["a1"])
+                body = response.body_iterator
+                await body.__anext__()
+                api.status_broadcaster.publish("a2", "executing", 10)
+                api.status_broadcaster.publish("a1", "executed", 100)
+                rest = [chunk async for chunk in body]
+            return mock_fn, rest
+
+        mock_fn, rest = anyio.run(_consume)
+        mock_fn.assert_called_once_with("a1", mock_fn.call_args[0][1])
+        assert rest == ['event: status\ndata: {"a1": {"status": "executed", "progress": 100}}\n\n']
+
+
 # ─── TestPodsEndpoints ────────────────────────────────────────────────────────
 
 class TestPodsEndpoints:
@@ -181,7 +536,7 @@ class TestPodsEndpoints:
         with patch("src.api.api.get_pods", return_value=fake_result) as mock_fn:
             response = api_test_client.get("/po/pods")
         assert response.status_code == 200
-        mock_fn.assert_called_once_with("all", mock_fn.call_args[0][1])
+        mock_fn.assert_called_once_with("all", mock_fn.call_args[0][1], AnalysisQuery())
 
     def test_get_all_pods_500_on_exception(self, api_test_client):
         with patch("src.api.api.get_pods", side_effect=RuntimeError("err")):
@@ -203,68 +558,179 @@ class TestPodsEndpoints:
 
 # ─── TestStopEndpoints ────────────────────────────────────────────────────────
 
+def _wait_for_operation(client, operation_id, timeout=5.0):
+    """Poll /po/operations/{id} until the operation has finished."""
+    import time
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        operation = client.get(f"/po/operations/{operation_id}").json()
+        if operation["status"] in ("succeeded", "failed"):
+            return operation
+        time.sleep(0.01)
+    raise AssertionError(f"Operation {operation_id} did not finish in time")
+
+
 class TestStopEndpoints:
-    def test_stop_all(self, api_test_client, mock_database):
+    def test_stop_all_returns_operation(self, api_test_client, mock_database):
+        mock_database.get_analysis_ids.return_value = ["a1", "a2"]
+        with (
+            patch("src.api.api.stop_analysis", side_effect=lambda aid, db: {aid: "stopped"}) as mock_stop,
+            patch("src.api.api.stream_logs") as mock_stream,
+        ):
+            response = api_test_client.put("/po/stop")
+            assert response.status_code == 202
+            operation_id = response.json()["operation_id"]
+            assert response.headers["location"] == f"/po/operations/{operation_id}"
+            assert response.json()["kind"] == "stop"
+            assert set(response.json()["analyses"]) == {"a1", "a2"}
+            operation = _wait_for_operation(api_test_client, operation_id)
+        assert operation["status"] == "succeeded"
+        assert operation["analyses"]["a1"] == {"state": "succeeded", "result": "stopped", "error": None}
+        assert {c.args[0] for c in mock_stop.call_args_list} == {"a1", "a2"}
+        assert mock_stream.call_count == 2
+
+    def test_stop_by_id_records_failure(self, api_test_client):
+        with patch("src.api.api.stop_analysis", side_effect=RuntimeError("err")):
+            response = api_test_client.put("/po/stop/analysis_id")
+            assert response.status_code == 202
+            operation = _wait_for_operation(api_test_client, response.json()["operation_id"])
+        assert operation["status"] == "failed"
+        assert operation["analyses"]["analysis_id"]["state"] == "failed"
+        assert "err" in operation["analyses"]["analysis_id"]["error"]
+
+    def test_stop_all_wait(self, api_test_client, mock_database):
         fake_stop_result = {"analysis_id": "stopped"}
         with (
             patch("src.api.api.stop_analysis", return_value=fake_stop_result) as mock_stop,
             patch("src.api.api.stream_logs") as mock_stream,
         ):
-            response = api_test_client.put("/po/stop")
+            response = api_test_client.put("/po/stop", params={"wait": "true"})
         assert response.status_code == 200
+        assert response.json() == fake_stop_result
         mock_stop.assert_called_once_with("all", mock_database)
         # stream_logs called once per analysis_id returned by get_analysis_ids
         assert mock_stream.call_count == len(mock_database.get_analysis_ids())
 
-    def test_stop_all_500_on_exception(self, api_test_client):
+    def test_stop_all_wait_logs_restarted_analysis_once(self, api_test_client, mock_database):
+        mock_database.get_analysis_ids.return_value = ["a1", "a1", "a2"]
+        with (
+            patch("src.api.api.stop_analysis", return_value={"a1": "stopped", "a2": "stopped"}),
+            patch("src.api.api.stream_logs") as mock_stream,
+        ):
+            response = api_test_client.put("/po/stop", params={"wait": "true"})
+        assert response.status_code == 200
+        assert [c.args[0].analysis_id for c in mock_stream.call_args_list] == ["a1", "a2"]
+
+    def test_stop_all_wait_500_on_exception(self, api_test_client):
         with patch("src.api.api.stop_analysis", side_effect=RuntimeError("err")):
-            response = api_test_client.put("/po/stop")
+            response = api_test_client.put("/po/stop", params={"wait": "true"})
         assert response.status_code == 500
 
-    def test_stop_by_id(self, api_test_client, mock_database):
+    def test_stop_by_id_wait(self, api_test_client, mock_database):
         fake_stop_result = {"analysis_id": "stopped"}
         with (
             patch("src.api.api.stop_analysis", return_value=fake_stop_result) as mock_stop,
             patch("src.api.api.stream_logs") as mock_stream,
         ):
-            response = api_test_client.put("/po/stop/analysis_id")
+            response = api_test_client.put("/po/stop/analysis_id", params={"wait": "true"})
         assert response.status_code == 200
         mock_stop.assert_called_once_with("analysis_id", mock_database)
         mock_stream.assert_called_once()
 
-    def test_stop_by_id_500_on_exception(self, api_test_client):
+    def test_stop_by_id_wait_500_on_exception(self, api_test_client):
         with patch("src.api.api.stop_analysis", side_effect=RuntimeError("err")):
-            response = api_test_client.put("/po/stop/analysis_id")
+            response = api_test_client.put("/po/stop/analysis_id", params={"wait": "true"})
         assert response.status_code == 500
 
 
 # ─── TestDeleteEndpoints ──────────────────────────────────────────────────────
 
 class TestDeleteEndpoints:
-    def test_delete_all(self, api_test_client, mock_database):
+    def test_delete_all_returns_operation(self, api_test_client, mock_database):
+        mock_database.query_analysis_ids.return_value = ["a1", "a2"]
+        with patch("src.api.api.delete_analysis", return_value={}) as mock_fn:
+            response = api_test_client.delete("/po/delete")
+            assert response.status_code == 202
+            assert response.json()["kind"] == "delete"
+            operation = _wait_for_operation(api_test_client, response.json()["operation_id"])
+        assert operation["status"] == "succeeded"
+        assert {c.args for c in mock_fn.call_args_list} == {("a1", mock_database), ("a2", mock_database)}
+
+    def test_delete_all_processes_restarted_analysis_once(self, api_test_client, mock_database):
+        # a1 has two deployment rows
+        mock_database.query_analysis_ids.return_value = ["a1", "a1", "a2"]
+        with patch("src.api.api.delete_analysis", return_value={}) as mock_fn:
+            response = api_test_client.delete("/po/delete")
+            operation = _wait_for_operation(api_test_client, response.json()["operation_id"])
+        assert operation["status"] == "succeeded"
+        assert sorted(c.args[0] for c in mock_fn.call_args_list) == ["a1", "a2"]
+
+    def test_delete_all_includes_archived_analyses(self, api_test_client, tmp_path):
+        from sqlalchemy import create_engine as real_create_engine
+
+        # file-backed, so the concurrent operation workers use separate connections
+        sqlite_engine = real_create_engine(f"sqlite:///{tmp_path / 'po.db'}", connect_args={"check_same_thread": False})
+        with patch("src.resources.database.entity.create_engine", return_value=sqlite_engine):
+            from src.resources.database.entity import Database
+
+            database = Database()
+        for analysis_id, status in (("old", "executed"), ("hot", "started")):
+            database.create_analysis(analysis_id=analysis_id, deployment_name=f"analysis-{analysis_id}-0",
+                                     project_id="proj1", pod_ids=["pod-1"], status=status, log=None,
+                                     registry_url="harbor.test", image_url="harbor.test/img",
+                                     registry_user="user", registry_password="pw", kong_token="token",
+                                     restart_counter=0, progress=0)
+        database.update_deployment("analysis-old-0", time_created=1.0)
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            assert database.archive_terminal_analyses() == ["old"]
+        _api_instance(api_test_client).database = database
+
+        with patch("src.resources.utils.read_db_analysis"), \
+                patch("src.resources.utils.delete_keycloak_client") as mock_keycloak:
+            response = api_test_client.delete("/po/delete")
+            operation = _wait_for_operation(api_test_client, response.json()["operation_id"])
+
+        assert set(operation["analyses"]) == {"old", "hot"}
+        assert {c.args[0] for c in mock_keycloak.call_args_list} == {"old", "hot"}
+        assert database.query_analysis_ids(include_archived=True) == []
+
+    def test_delete_by_id_returns_operation(self, api_test_client, mock_database):
+        with patch("src.api.api.delete_analysis", return_value={}) as mock_fn:
+            response = api_test_client.delete("/po/delete/analysis_id")
+            assert response.status_code == 202
+            operation = _wait_for_operation(api_test_client, response.json()["operation_id"])
+        assert operation["analyses"] == {"analysis_id": {"state": "succeeded", "result": None, "error": None}}
+        mock_fn.assert_called_once_with("analysis_id", mock_database)
+
+    def test_delete_all_wait(self, api_test_client, mock_database):
         fake_result = {"analysis_id": "stopped"}
         with patch("src.api.api.delete_analysis", return_value=fake_result) as mock_fn:
-            response = api_test_client.delete("/po/delete")
+            response = api_test_client.delete("/po/delete", params={"wait": "true"})
         assert response.status_code == 200
         mock_fn.assert_called_once_with("all", mock_database)
 
-    def test_delete_all_500_on_exception(self, api_test_client):
+    def test_delete_all_wait_500_on_exception(self, api_test_client):
         with patch("src.api.api.delete_analysis", side_effect=RuntimeError("err")):
-            response = api_test_client.delete("/po/delete")
+            response = api_test_client.delete("/po/delete", params={"wait": "true"})
         assert response.status_code == 500
 
-    def test_delete_by_id(self, api_test_client, mock_database):
+    def test_delete_by_id_wait(self, api_test_client, mock_database):
         fake_result = {"analysis_id": "stopped"}
         with patch("src.api.api.delete_analysis", return_value=fake_result) as mock_fn:
-            response = api_test_client.delete("/po/delete/analysis_id")
+            response = api_test_client.delete("/po/delete/analysis_id", params={"wait": "true"})
         assert response.status_code == 200
         mock_fn.assert_called_once_with("analysis_id", mock_database)
 
-    def test_delete_by_id_500_on_exception(self, api_test_client):
+    def test_delete_by_id_wait_500_on_exception(self, api_test_client):
         with patch("src.api.api.delete_analysis", side_effect=RuntimeError("err")):
-            response = api_test_client.delete("/po/delete/analysis_id")
+            response = api_test_client.delete("/po/delete/analysis_id", params={"wait": "true"})
         assert response.status_code == 500
 
+    def test_unknown_operation_returns_404(self, api_test_client):
+        response = api_test_client.get("/po/operations/unknown")
+        assert response.status_code == 404
+
 
 # ─── TestCleanupEndpoint ──────────────────────────────────────────────────────
 
@@ -307,4 +773,66 @@ class TestStreamLogsEndpoint:
                 "status": "executing",
                 "progress": 0,
             })
-        assert response.status_code == 500
\ No newline at end of file
+        assert response.status_code == 500
+
+
+# ─── TestStreamLogsBatchEndpoint ──────────────────────────────────────────────
+
+def _log_entry(analysis_id="analysis_id", progress=50):
+    return {"analysis_id": analysis_id, "log": "line", "log_type": "info", "status": "executing", "progress": progress}
+
+
+class TestStreamLogsBatchEndpoint:
+    def test_json_array(self, api_test_client, mock_database):
+        with patch("src.api.api.stream_logs_batch", return_value={"analysis_id": 2}) as mock_fn:
+            response = api_test_client.post("/po/stream_logs/batch", json=[_log_entry(), _log_entry(progress=60)])
+        assert response.status_code == 200
+        assert response.json() == {"analysis_id": 2}
+        entities = mock_fn.call_args[0][0]
+        assert [e.progress for e in entities] == [50, 60]
+        assert mock_fn.call_args[0][3] is mock_database
+
+    def test_ndjson(self, api_test_client):
+        body = "\n".join(json.dumps(e) for e in [_log_entry("a1"), _log_entry("a2")]) + "\n\n"
+        with patch("src.api.api.stream_logs_batch", return_value={}) as mock_fn:
+            response = api_test_client.post("/po/stream_logs/batch",
+                                            content=body,
+                                            headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 200
+        assert [e.analysis_id for e in mock_fn.call_args[0][0]] == ["a1", "a2"]
+
+    @pytest.mark.parametrize("body, content_type", [
+        ("not json", "application/json"),
+        ('{"analysis_id": "a1"}', "application/json"),
+        ('[{"analysis_id": "a1"}]', "application/json"),
+        ('{"analysis_id": "a1"}\n{oops', "application/x-ndjson"),
+    ])
+    def test_malformed_body_returns_422(self, api_test_client, body, content_type):
+        with patch("src.api.api.stream_logs_batch") as mock_fn:
+            response = api_test_client.post("/po/stream_logs/batch",
+                                            content=body,
+                                            headers={"Content-Type": content_type})
+        assert response.status_code == 422
+        mock_fn.assert_not_called()
+
+    @pytest.mark.parametrize("body, content_type", [
+        (json.dumps([_log_entry(), {"analysis_id": "a1"}]), "application/json"),
+        ('{"analysis_id": "a1"}\n{oops', "application/x-ndjson"),
+    ])
+    def test_oversized_batch_returns_413_before_validation(self, api_test_client, body, content_type):
+        with (
+            patch("src.api.api._LOG_BATCH_MAX_SIZE", 1),
+            patch("src.api.api._log_batch_adapter") as mock_adapter,
+            patch("src.api.api.stream_logs_batch") as mock_fn,
+        ):
+            response = api_test_client.post("/po/stream_logs/batch",
+                                            content=body,
+                                            headers={"Content-Type": content_type})
+        assert response.status_code == 413
+        mock_adapter.validate_python.assert_not_called()
+        mock_fn.assert_not_called()
+
+    def test_500_on_exception(self, api_test_client):
+        with patch("src.api.api.stream_logs_batch", side_effect=RuntimeError("err")):
+            response = api_test_client.post("/po/stream_logs/batch", json=[_log_entry()])
+        assert response.status_code == 500
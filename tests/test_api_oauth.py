@@ -26,6 +26,7 @@ class TestValidAccessToken:
         mock_jwks_client.get_signing_key_from_jwt.return_value = mock_signing_key
 
         with (
+            patch("src.api.oauth._jwks_client", None),
             patch("src.api.oauth.PyJWKClient", return_value=mock_jwks_client),
             patch("src.api.oauth.jwt.decode", return_value=fake_payload),
         ):
@@ -40,9 +41,111 @@ class TestValidAccessToken:
         mock_jwks_client = MagicMock()
         mock_jwks_client.get_signing_key_from_jwt.side_effect = jwt_lib.exceptions.InvalidTokenError("bad token")
 
-        with patch("src.api.oauth.PyJWKClient", return_value=mock_jwks_client):
+        with (
+            patch("src.api.oauth._jwks_client", None),
+            patch("src.api.oauth.PyJWKClient", return_value=mock_jwks_client),
+        ):
             with pytest.raises(HTTPException) as exc_info:
                 valid_access_token("bad.token.here")
 
         assert exc_info.value.status_code == 401
-        assert "Not authenticated" in exc_info.value.detail
\ No newline at end of file
+        assert "Not authenticated" in exc_info.value.detail
+
+
+# ─── TestJwksClientCache ──────────────────────────────────────────────────────
+
+class TestJwksClientCache:
+    def test_jwks_client_created_once_across_requests(self):
+        from src.api.oauth import valid_access_token
+
+        mock_jwks_client = MagicMock()
+
+        with (
+            patch("src.api.oauth._jwks_client", None),
+            patch("src.api.oauth.PyJWKClient", return_value=mock_jwks_client) as mock_cls,
+            patch("src.api.oauth.jwt.decode", return_value={"sub": "user-id"}),
+        ):
+            valid_access_token("first.jwt.token")
+            valid_access_token("second.jwt.token")
+
+        mock_cls.assert_called_once()
+        assert mock_jwks_client.get_signing_key_from_jwt.call_count == 2
+
+    def test_jwks_client_caches_key_set_with_ttl(self):
+        from src.api.oauth import _get_jwks_client, _JWKS_CACHE_TTL, _REALM_BASE
+
+        with (
+            patch("src.api.oauth._jwks_client", None),
+            patch("src.api.oauth.PyJWKClient") as mock_cls,
+        ):
+            _get_jwks_client()
+
+        mock_cls.assert_called_once_with(f"{_REALM_BASE}/certs",
+                                         cache_keys=True,
+                                         cache_jwk_set=True,
+                                         lifespan=_JWKS_CACHE_TTL)
+
+
+
+# ─── TestVerifiedTokenCache ───────────────────────────────────────────────────
+
+class TestVerifiedTokenCache:
+    def test_repeated_token_skips_verification(self):
+        import time
+        from src.api.oauth import VerifiedTokenCache, valid_access_token
+
+        payload = {"sub": "user-id", "exp": time.time() + 60}
+        mock_jwks_client = MagicMock()
+
+        with (
+            patch("src.api.oauth._token_cache", VerifiedTokenCache(8)) as cache,
+            patch("src.api.oauth._get_jwks_client", return_value=mock_jwks_client),
+            patch("src.api.oauth.jwt.decode", return_value=payload) as mock_decode,
+        ):
+            first = valid_access_token("repeated.jwt.token")
+            second = valid_access_token("repeated.jwt.token")
+
+        assert first == second == payload
+        mock_decode.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_expired_entry_is_not_served(self):
+        import time
+        from src.api.oauth import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(8)
+        cache.put("token", {"exp": time.time() - 1})
+        assert cache.get("token") is None
+        assert cache.stats()["size"] == 0
+
+    def test_token_without_exp_is_not_cached(self):
+        from src.api.oauth import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(8)
+        cache.put("token", {"sub": "user-id"})
+        assert cache.stats()["size"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        import time
+        from src.api.oauth import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_raw_token_is_not_stored(self):
+        import time
+        from src.api.oauth import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(2)
+        cache.put("secret.jwt.token", {"exp": time.time() + 60})
+        assert "secret.jwt.token" not in cache._entries
@@ -0,0 +1,117 @@
+"""Tests for src/api/operations.py."""
+
+import threading
+
+import pytest
+
+from src.api.operations import Operation, OperationTracker
+
+
+def _wait(tracker, operation_id, timeout=5.0):
+    import time
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        operation = tracker.get(operation_id)
+        if operation["finished_at"] is not None:
+            return operation
+        time.sleep(0.01)
+    raise AssertionError("operation did not finish in time")
+
+
+# ─── TestOperation ────────────────────────────────────────────────────────────
+
+class TestOperation:
+    @pytest.mark.parametrize(
+        "states, expected",
+        [
+            (["pending", "pending"], "pending"),
+            (["running", "pending"], "running"),
+            (["succeeded", "pending"], "running"),
+            (["succeeded", "succeeded"], "succeeded"),
+            (["succeeded", "failed"], "failed"),
+        ],
+    )
+    def test_status_aggregates_analysis_states(self, states, expected):
+        operation = Operation("stop", ["a1", "a2"])
+        for analysis, state in zip(operation.analyses.values(), states):
+            analysis["state"] = state
+        assert operation.status == expected
+
+    def test_empty_operation_is_finished(self):
+        operation = Operation("stop", [])
+        assert operation.status == "succeeded"
+        assert operation.finished_at is not None
+
+
+# ─── TestOperationTracker ─────────────────────────────────────────────────────
+
+class TestOperationTracker:
+    def test_runs_each_analysis_and_records_results(self):
+        tracker = OperationTracker(max_workers=2)
+
+        snapshot = tracker.submit("stop", ["a1", "a2"], lambda analysis_id: f"{analysis_id}-stopped")
+        operation = _wait(tracker, snapshot["operation_id"])
+
+        assert operation["status"] == "succeeded"
+        assert operation["analyses"]["a1"]["result"] == "a1-stopped"
+        assert operation["analyses"]["a2"]["result"] == "a2-stopped"
+
+    def test_duplicate_ids_processed_once(self):
+        tracker = OperationTracker(max_workers=2)
+        calls = []
+
+        snapshot = tracker.submit("delete", ["a1", "a1", "a2"], calls.append)
+        _wait(tracker, snapshot["operation_id"])
+
+        assert sorted(calls) == ["a1", "a2"]
+
+    def test_failure_is_isolated_per_analysis(self):
+        tracker = OperationTracker(max_workers=2)
+
+        def _work(analysis_id):
+            if analysis_id == "a2":
+                raise RuntimeError("boom")
+
+        snapshot = tracker.submit("delete", ["a1", "a2"], _work)
+        operation = _wait(tracker, snapshot["operation_id"])
+
+        assert operation["status"] == "failed"
+        assert operation["analyses"]["a1"]["state"] == "succeeded"
+        assert operation["analyses"]["a2"]["state"] == "failed"
+        assert "boom" in operation["analyses"]["a2"]["error"]
+
+    def test_pool_is_bounded(self):
+        tracker = OperationTracker(max_workers=1)
+        release = threading.Event()
+        started = []
+
+        def _work(analysis_id):
+            started.append(analysis_id)
+            release.wait(5)
+
+        snapshot = tracker.submit("stop", ["a1", "a2"], _work)
+        while not started:
+            pass
+        operation = tracker.get(snapshot["operation_id"])
+        assert sorted(a["state"] for a in operation["analyses"].values()) == ["pending", "running"]
+
+        release.set()
+        assert _wait(tracker, snapshot["operation_id"])["status"] == "succeeded"
+
+    def test_snapshots_are_copies(self):
+        tracker = OperationTracker()
+        snapshot = tracker.submit("stop", [], lambda analysis_id: None)
+        snapshot["analyses"]["x"] = {}
+        assert tracker.get(snapshot["operation_id"])["analyses"] == {}
+
+    def test_oldest_finished_operations_are_evicted(self):
+        tracker = OperationTracker(max_finished=2)
+        ids = [tracker.submit("stop", [], lambda analysis_id: None)["operation_id"] for _ in range(3)]
+
+        assert tracker.get(ids[0]) is None
+        assert tracker.get(ids[1]) is not None
+        assert tracker.get(ids[2]) is not None
+
+    def test_unknown_operation(self):
+        assert OperationTracker().get("unknown") is None
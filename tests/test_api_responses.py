@@ -0,0 +1,60 @@
+import gzip
+import json
+
+import pytest
+import zstandard
+
+from src.api.responses import encode_json, negotiate_encoding
+
+
+# ─── TestNegotiateEncoding ────────────────────────────────────────────────────
+
+class TestNegotiateEncoding:
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("zstd;q=0.5, gzip", "gzip"),
+        ("zstd;q=0, gzip;q=0", None),
+        ("*", "zstd"),
+        ("*, zstd;q=0", "gzip"),
+        ("GZIP", "gzip"),
+        ("gzip;q=abc", None),
+    ])
+    def test_negotiation(self, header, expected):
+        assert negotiate_encoding(header) == expected
+
+
+# ─── TestEncodeJson ───────────────────────────────────────────────────────────
+
+class TestEncodeJson:
+    CONTENT = {"analysis": {"analysis_id": ["line"] * 500}, "nginx": {"analysis_id": []}}
+
+    def test_identity(self):
+        body, headers = encode_json(self.CONTENT, None)
+        assert json.loads(body) == self.CONTENT
+        assert headers == {"Vary": "Accept-Encoding"}
+
+    def test_gzip_round_trip(self):
+        body, headers = encode_json(self.CONTENT, "gzip")
+        assert headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(body)) == self.CONTENT
+
+    def test_zstd_round_trip(self):
+        body, headers = encode_json(self.CONTENT, "zstd")
+        assert headers["Content-Encoding"] == "zstd"
+        assert json.loads(zstandard.ZstdDecompressor().decompress(body)) == self.CONTENT
+
+    def test_below_min_size_not_compressed(self):
+        body, headers = encode_json({"a": 1}, "gzip", min_size=1024)
+        assert "Content-Encoding" not in headers
+        assert json.loads(body) == {"a": 1}
+
+    def test_gzip_output_is_deterministic(self):
+        assert encode_json(self.CONTENT, "gzip")[0] == encode_json(self.CONTENT, "gzip")[0]
+
+    def test_non_str_keys_serialized(self):
+        body, _ = encode_json({1: "x"})
+        assert json.loads(body) == {"1": "x"}
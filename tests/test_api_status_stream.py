@@ -0,0 +1,109 @@
+"""Tests for src/api/status_stream.py.
+
+Drives the broadcaster from an event loop via anyio.run() and publishes from
+worker threads, like the status loop and API executors do.
+"""
+
+import json
+import threading
+
+import anyio
+
+from src.api.status_stream import StatusBroadcaster, format_sse
+
+
+# ─── TestStatusBroadcaster ────────────────────────────────────────────────────
+
+class TestStatusBroadcaster:
+    def test_publish_from_thread_reaches_subscriber(self):
+        broadcaster = StatusBroadcaster()
+
+        async def _run():
+            queue = broadcaster.subscribe()
+            thread = threading.Thread(target=broadcaster.publish, args=("a1", "executing", 10))
+            thread.start()
+            thread.join()
+            with anyio.fail_after(1):
+                return await queue.get()
+
+        assert anyio.run(_run) == {"analysis_id": "a1", "status": "executing", "progress": 10}
+
+    def test_unchanged_state_is_not_rebroadcast(self):
+        broadcaster = StatusBroadcaster()
+
+        async def _run():
+            queue = broadcaster.subscribe()
+            broadcaster.publish("a1", "executing", 10)
+            broadcaster.publish("a1", "executing", 10)
+            broadcaster.publish("a1", "executing", 20)
+            await anyio.sleep(0)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        events = anyio.run(_run)
+        assert [e["progress"] for e in events] == [10, 20]
+
+    def test_all_subscribers_receive_event(self):
+        broadcaster = StatusBroadcaster()
+
+        async def _run():
+            queues = [broadcaster.subscribe() for _ in range(3)]
+            broadcaster.publish("a1", "started", 0)
+            await anyio.sleep(0)
+            return [q.qsize() for q in queues]
+
+        assert anyio.run(_run) == [1, 1, 1]
+
+    def test_slow_subscriber_drops_oldest(self):
+        broadcaster = StatusBroadcaster(queue_size=2)
+
+        async def _run():
+            queue = broadcaster.subscribe()
+            for progress in (10, 20, 30):
+                broadcaster.publish("a1", "executing", progress)
+            await anyio.sleep(0)
+            return [queue.get_nowait()["progress"] for _ in range(queue.qsize())]
+
+        assert anyio.run(_run) == [20, 30]
+
+    def test_unsubscribe(self):
+        broadcaster = StatusBroadcaster()
+
+        async def _run():
+            queue = broadcaster.subscribe()
+            assert broadcaster.subscriber_count() == 1
+            broadcaster.unsubscribe(queue)
+            broadcaster.unsubscribe(queue)  # idempotent
+            broadcaster.publish("a1", "started", 0)
+            await anyio.sleep(0)
+            return queue.qsize()
+
+        assert anyio.run(_run) == 0
+        assert broadcaster.subscriber_count() == 0
+
+    def test_forget_drops_last_state(self):
+        broadcaster = StatusBroadcaster()
+
+        async def _run():
+            queue = broadcaster.subscribe()
+            broadcaster.publish("a1", "executing", 10)
+            broadcaster.forget("a1")
+            broadcaster.forget("unknown")  # ignored
+            broadcaster.publish("a1", "executing", 10)  # recreated analysis is broadcast again
+            await anyio.sleep(0)
+            return queue.qsize()
+
+        assert anyio.run(_run) == 2
+        assert broadcaster._last_states == {"a1": ("executing", 10)}
+        broadcaster.forget("a1")
+        assert broadcaster._last_states == {}
+
+    def test_publish_without_subscribers_is_noop(self):
+        StatusBroadcaster().publish("a1", "started", 0)  # must not raise
+
+
+# ─── TestFormatSse ────────────────────────────────────────────────────────────
+
+class TestFormatSse:
+    def test_format(self):
+        data = {"a1": {"status": "started", "progress": 0}}
+        assert format_sse("status", data) == f"event: status\ndata: {json.dumps(data)}\n\n"
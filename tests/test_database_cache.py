@@ -0,0 +1,168 @@
+"""Tests for src/resources/database/cache.py — SQLite in-memory backend."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.resources.database.db_models import Base
+
+
+# ─── Fixture ─────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def db():
+    """CachedDatabase instance backed by SQLite in-memory."""
+    from sqlalchemy import create_engine as real_create_engine
+
+    sqlite_engine = real_create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}
+    )
+
+    with patch("src.resources.database.entity.create_engine", return_value=sqlite_engine):
+        from src.resources.database.cache import CachedDatabase
+
+        database = CachedDatabase()
+
+    yield database
+
+    Base.metadata.drop_all(bind=sqlite_engine)
+
+
+def _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", **kwargs):
+    """Insert a record with sensible defaults."""
+    defaults = dict(
+        analysis_id=analysis_id,
+        deployment_name=deployment_name,
+        project_id="proj1",
+        pod_ids=["pod-1"],
+        status="started",
+        log=None,
+        registry_url="harbor.test",
+        image_url="harbor.test/img",
+        registry_user="user",
+        registry_password="pw",
+        kong_token="token",
+        restart_counter=0,
+        progress=0,
+    )
+    defaults.update(kwargs)
+    return db.create_analysis(**defaults)
+
+
+# ─── Cached reads ────────────────────────────────────────────────────────────
+
+
+class TestCachedReads:
+    def test_repeated_reads_are_hits(self, db):
+        _insert(db)
+        assert db.get_latest_deployment("a1").status == "started"
+        assert db.get_latest_deployment_summary("a1").deployment_name == "analysis-a1-0"
+        assert db.analysis_is_running("a1") is True
+        assert db.get_cache_stats() == {"enabled": True, "entries": 1, "hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+    def test_reads_do_not_query_database_when_warm(self, db):
+        from sqlalchemy import event
+
+        _insert(db)
+        db.get_latest_deployment("a1")
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        db.get_latest_deployment("a1")
+        db.get_latest_deployments()
+        db.get_running_analysis_ids()
+        db.get_analysis_progress("a1")
+
+        assert statements == []
+
+    def test_bulk_reads_match_uncached_order(self, db):
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        assert list(db.get_latest_deployments()) == ["a2", "a1"]
+        assert list(db.get_latest_deployments(["a1", "missing", "a2"])) == ["a1", "a2"]
+
+    def test_log_reads_bypass_cache(self, db):
+        _insert(db, log="legacy")
+        assert db.get_latest_deployment("a1", with_log=True).log == "legacy"
+        assert db.get_cache_stats()["misses"] == 0
+
+    def test_archived_reads_bypass_cache(self, db):
+        _insert(db, status="stopped")
+        db.update_deployment("analysis-a1-0", time_created=time.time() - 30 * 86400)
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            assert db.archive_terminal_analyses() == ["a1"]
+
+        assert db.get_latest_deployment("a1") is None
+        assert db.get_latest_deployments(["a1"], include_archived=True)["a1"].status == "stopped"
+
+
+# ─── Invalidation ────────────────────────────────────────────────────────────
+
+
+class TestInvalidation:
+    def test_update_analysis(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        db.update_analysis_status("a1", "executing")
+        assert db.get_latest_deployment("a1").status == "executing"
+
+    def test_update_deployment(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        db.update_deployment_status("analysis-a1-0", "failed")
+        assert db.analysis_is_running("a1") is False
+
+    def test_new_deployment_replaces_latest(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        _insert(db, deployment_name="analysis-a1-1", status="executing")
+        assert db.get_latest_deployment("a1").deployment_name == "analysis-a1-1"
+
+    def test_delete_analysis(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        db.delete_analysis("a1")
+        assert db.get_latest_deployment("a1") is None
+        assert db.get_cache_stats()["entries"] == 0
+
+    def test_delete_latest_deployment(self, db):
+        _insert(db, deployment_name="analysis-a1-0")
+        _insert(db, deployment_name="analysis-a1-1")
+        db.get_latest_deployment("a1")
+        db.delete_deployment("analysis-a1-1")
+        assert db.get_latest_deployment("a1").deployment_name == "analysis-a1-0"
+
+    def test_progress_from_logs(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        db.append_analysis_logs("a1", ["line"], progress=60)
+        assert db.get_analysis_progress("a1") == 60
+
+    def test_plain_log_lines_keep_cache_warm(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        misses = db.get_cache_stats()["misses"]
+        db.append_analysis_logs("a1", ["line"])
+        db.get_latest_deployment("a1")
+        assert db.get_cache_stats()["misses"] == misses
+
+    def test_reset_db(self, db):
+        _insert(db)
+        db.get_latest_deployment("a1")
+        db.reset_db()
+        assert db.get_latest_deployments() == {}
+
+    def test_change_feed_invalidates(self, db):
+        from sqlalchemy import text
+
+        _insert(db)
+        db.get_latest_deployment("a1")
+        db._change_feed.poll()
+        with db.engine.begin() as connection:
+            connection.execute(text("UPDATE analysis SET status = 'failed' WHERE analysis_id = 'a1'"))
+        assert db.get_latest_deployment("a1").status == "started"
+
+        db._change_feed.poll()
+        assert db.get_latest_deployment("a1").status == "failed"
@@ -0,0 +1,141 @@
+"""Tests for src/resources/database/change_feed.py — SQLite in-memory backend (polling fallback)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import text
+
+from src.resources.database.db_models import Base
+
+
+# ─── Fixture ─────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def db():
+    """Database instance backed by SQLite in-memory, shared with the feed thread."""
+    from sqlalchemy import create_engine as real_create_engine
+    from sqlalchemy.pool import StaticPool
+
+    sqlite_engine = real_create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+    with patch("src.resources.database.entity.create_engine", return_value=sqlite_engine):
+        from src.resources.database.entity import Database
+
+        database = Database()
+
+    yield database
+
+    database.close()
+    Base.metadata.drop_all(bind=sqlite_engine)
+
+
+@pytest.fixture
+def changes(db):
+    """Changes reported by the feed, as ``(analysis_id, operation)`` tuples."""
+    reported = []
+    db.add_change_listener(lambda analysis_id, operation: reported.append((analysis_id, operation)))
+    return reported
+
+
+def _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", **kwargs):
+    """Insert a record with sensible defaults."""
+    defaults = dict(
+        analysis_id=analysis_id,
+        deployment_name=deployment_name,
+        project_id="proj1",
+        pod_ids=["pod-1"],
+        status="started",
+        log=None,
+        registry_url="harbor.test",
+        image_url="harbor.test/img",
+        registry_user="user",
+        registry_password="pw",
+        kong_token="token",
+        restart_counter=0,
+        progress=0,
+    )
+    defaults.update(kwargs)
+    return db.create_analysis(**defaults)
+
+
+# ─── Polling ─────────────────────────────────────────────────────────────────
+
+
+class TestPolling:
+    def test_first_poll_only_records_snapshot(self, db, changes):
+        _insert(db)
+        assert db._change_feed.poll() == 0
+        assert changes == []
+
+    def test_reports_insert_update_delete(self, db, changes):
+        _insert(db)
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        db._change_feed.poll()
+
+        _insert(db, analysis_id="a3", deployment_name="analysis-a3-0")
+        db.update_analysis_status("a1", "executing")
+        db.delete_analysis("a2")
+
+        assert db._change_feed.poll() == 3
+        assert sorted(changes) == [("a1", "UPDATE"), ("a2", "DELETE"), ("a3", "INSERT")]
+
+    def test_reports_changes_of_other_writers(self, db, changes):
+        _insert(db)
+        db._change_feed.poll()
+        with db.engine.begin() as connection:
+            connection.execute(text("UPDATE analysis SET progress = 50 WHERE analysis_id = 'a1'"))
+        db._change_feed.poll()
+        assert changes == [("a1", "UPDATE")]
+
+    def test_unchanged_state_reports_nothing(self, db, changes):
+        _insert(db)
+        db._change_feed.poll()
+        db.update_analysis("a1", pod_ids=["pod-2"])
+        assert db._change_feed.poll() == 0
+
+    def test_external_change_bumps_state_version(self, db):
+        _insert(db)
+        db._change_feed.poll()
+        version, _ = db.get_state_version()
+        with db.engine.begin() as connection:
+            connection.execute(text("UPDATE analysis SET status = 'failed' WHERE analysis_id = 'a1'"))
+        db._change_feed.poll()
+        assert db.get_state_version()[0] > version
+
+
+# ─── Feed ────────────────────────────────────────────────────────────────────
+
+
+class TestChangeFeed:
+    def test_sqlite_falls_back_to_polling(self, db):
+        assert db.get_change_feed_mode() is None
+        assert db._change_feed.install_trigger() is False
+        db._change_feed.poll_interval = 0.01
+        db.start_change_feed()
+        assert db.get_change_feed_mode() == "polling"
+        db.close()
+        assert db._change_feed._thread is None
+
+    def test_feed_thread_reports_changes(self, db):
+        import threading
+
+        reported = threading.Event()
+        db.add_change_listener(lambda analysis_id, operation: reported.set())
+        db._change_feed.poll()
+        _insert(db)
+        db._change_feed.poll_interval = 0.01
+        db.start_change_feed()
+        assert reported.wait(2)
+
+    def test_listener_errors_do_not_stop_others(self, db, changes):
+        db._change_feed._listeners.insert(0, MagicMock(side_effect=RuntimeError("boom")))
+        db._change_feed._dispatch('{"op": "INSERT", "analysis_id": "a1"}')
+        assert changes == [("a1", "INSERT")]
+
+    def test_malformed_notification_is_skipped(self, db, changes):
+        db._change_feed._dispatch("not json")
+        db._change_feed._dispatch('{"op": "INSERT"}')
+        assert changes == []
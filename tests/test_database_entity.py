@@ -2,7 +2,7 @@
 
 import json
 import time
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -55,6 +55,29 @@ def _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", **kwargs):
     return db.create_analysis(**defaults)
 
 
+# ─── connection pool ─────────────────────────────────────────────────────────
+
+
+class TestConnectionPool:
+    def _engine_kwargs(self, db):
+        with patch("src.resources.database.entity.create_engine", return_value=db.engine) as mock_engine:
+            from src.resources.database.entity import Database
+
+            Database()
+        return mock_engine.call_args.kwargs
+
+    def test_sized_from_worker_settings(self, db, monkeypatch):
+        monkeypatch.setenv("PO_DB_WORKERS", "2")
+        monkeypatch.setenv("PO_K8S_WORKERS", "3")
+        kwargs = self._engine_kwargs(db)
+        assert kwargs["pool_size"] == 2 + 3 + 16 + 4 + 4 + 3
+        assert kwargs["max_overflow"] == 10
+
+    def test_explicit_pool_size(self, db):
+        with patch("src.resources.database.entity._DB_POOL_SIZE", 7):
+            assert self._engine_kwargs(db)["pool_size"] == 7
+
+
 # ─── create_analysis ─────────────────────────────────────────────────────────
 
 
@@ -112,6 +135,41 @@ class TestGetDeployment:
         record = db.get_latest_deployment("a1")
         assert record.deployment_name == "analysis-a1-1"
 
+    def test_get_latest_deployment_defers_log(self, db):
+        from sqlalchemy import inspect
+
+        _insert(db, log="legacy")
+        assert "log" in inspect(db.get_latest_deployment("a1")).unloaded
+        assert db.get_latest_deployment("a1", with_log=True).log == "legacy"
+
+    def test_get_latest_deployment_summary(self, db):
+        _insert(db, deployment_name="analysis-a1-0")
+        _insert(db, deployment_name="analysis-a1-1", status="executing", progress=40)
+        summary = db.get_latest_deployment_summary("a1")
+        assert (summary.deployment_name, summary.status, summary.progress) == ("analysis-a1-1", "executing", 40)
+        assert db.get_latest_deployment_summary("nonexistent") is None
+
+    def test_get_latest_deployments_bulk(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-1")
+        latest = db.get_latest_deployments()
+        assert {aid: d.deployment_name for aid, d in latest.items()} == {"a1": "analysis-a1-1",
+                                                                         "a2": "analysis-a2-0"}
+
+    def test_get_latest_deployments_filtered_in_given_order(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        _insert(db, analysis_id="a3", deployment_name="analysis-a3-0")
+        assert list(db.get_latest_deployments(["a3", "missing", "a1"])) == ["a3", "a1"]
+        assert db.get_latest_deployments([]) == {}
+
+    def test_get_latest_deployment_summaries(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-1", status="executing")
+        summaries = db.get_latest_deployment_summaries(["a1"])
+        assert (summaries["a1"].deployment_name, summaries["a1"].status) == ("analysis-a1-1", "executing")
+
     def test_get_deployments_returns_all(self, db):
         _insert(db, deployment_name="analysis-a1-0")
         _insert(db, deployment_name="analysis-a1-1")
@@ -145,6 +203,13 @@ class TestAnalysisIsRunning:
     def test_no_deployment_is_not_running(self, db):
         assert db.analysis_is_running("nonexistent") is False
 
+    def test_get_running_analysis_ids(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", status="executing")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0", status="stopped")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-1", status="started")
+        _insert(db, analysis_id="a3", deployment_name="analysis-a3-0", status="executed")
+        assert db.get_running_analysis_ids() == ["a1", "a2"]
+
 
 # ─── update_analysis / update_deployment ─────────────────────────────────────
 
@@ -157,6 +222,18 @@ class TestUpdate:
         for d in db.get_deployments("a1"):
             assert d.status == "executing"
 
+    def test_update_analysis_single_statement(self, db):
+        from sqlalchemy import event
+
+        for i in range(5):
+            _insert(db, deployment_name=f"analysis-a1-{i}")
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        assert db.update_analysis("a1", status="executing") == 5
+        assert sum(statement.startswith("UPDATE") for statement in statements) == 1
+        assert db.update_analysis("nonexistent", status="executing") == 0
+
     def test_update_deployment_updates_only_one(self, db):
         _insert(db, deployment_name="analysis-a1-0")
         _insert(db, deployment_name="analysis-a1-1")
@@ -220,12 +297,553 @@ class TestIds:
         result = db.get_deployment_pod_ids("analysis-a1-0")
         assert result == json.dumps(["pod-1", "pod-2"])
 
+    def test_get_registry_credentials_distinct(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-1")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0", registry_user="other")
+        assert db.get_registry_credentials() == {("harbor.test", "user", "pw"), ("harbor.test", "other", "pw")}
+
     def test_get_analysis_pod_ids_returns_list_of_pod_lists(self, db):
         _insert(db, deployment_name="analysis-a1-0", pod_ids=["pod-1"])
         _insert(db, deployment_name="analysis-a1-1", pod_ids=["pod-2"])
         result = db.get_analysis_pod_ids("a1")
         assert len(result) == 2
 
+    def test_get_analyses_pod_ids_bulk(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", pod_ids=["pod-1"])
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-1", pod_ids=["pod-2"])
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0", pod_ids=["pod-3"])
+        result = db.get_analyses_pod_ids(["a2", "a1", "unknown"])
+        assert list(result) == ["a2", "a1", "unknown"]
+        assert [json.loads(pod_ids) for pod_ids in result["a1"]] == [["pod-1"], ["pod-2"]]
+        assert result["unknown"] == []
+
+
+# ─── query_analysis_ids ──────────────────────────────────────────────────────
+
+
+class TestQueryAnalysisIds:
+    def _seed(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", status="started", project_id="p1")
+        db.update_deployment("analysis-a1-0", time_created=1000.0)
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0", status="executing", project_id="p1")
+        db.update_deployment("analysis-a2-0", time_created=2000.0)
+        _insert(db, analysis_id="a3", deployment_name="analysis-a3-0", status="executed", project_id="p2")
+        db.update_deployment("analysis-a3-0", time_created=3000.0)
+
+    def test_no_filters_returns_all_newest_first(self, db):
+        self._seed(db)
+        assert db.query_analysis_ids() == ["a3", "a2", "a1"]
+
+    def test_filter_by_status(self, db):
+        self._seed(db)
+        assert db.query_analysis_ids(status=["started", "executed"]) == ["a3", "a1"]
+
+    def test_filter_by_project_id(self, db):
+        self._seed(db)
+        assert db.query_analysis_ids(project_id="p1") == ["a2", "a1"]
+
+    def test_filter_by_created_after(self, db):
+        self._seed(db)
+        assert db.query_analysis_ids(created_after=1500.0) == ["a3", "a2"]
+
+    def test_limit_and_offset(self, db):
+        self._seed(db)
+        assert db.query_analysis_ids(limit=2) == ["a3", "a2"]
+        assert db.query_analysis_ids(limit=2, offset=2) == ["a1"]
+
+    def test_uses_latest_deployment_per_analysis(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", status="failed")
+        db.update_deployment("analysis-a1-0", time_created=1000.0)
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-1", status="executing")
+        db.update_deployment("analysis-a1-1", time_created=2000.0)
+
+        assert db.query_analysis_ids() == ["a1"]
+        assert db.query_analysis_ids(status=["executing"]) == ["a1"]
+
+    def test_tied_creation_times_yield_one_id(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", status="failed")
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-1", status="executing")
+        db.update_deployment("analysis-a1-0", time_created=1000.0)
+        db.update_deployment("analysis-a1-1", time_created=1000.0)
+
+        assert db.query_analysis_ids() == ["a1"]
+        assert db.query_analysis_ids(status=["executing"]) == ["a1"]
+        assert db.query_analysis_ids(status=["failed"]) == []
+        assert db.query_analysis_ids(status=["failed"]) == []
+
+    def test_indexes_created(self, db):
+        from sqlalchemy import inspect
+
+        index_names = {index["name"] for index in inspect(db.engine).get_indexes("analysis")}
+        assert {"ix_analysis_analysis_id_time_created",
+                "ix_analysis_status",
+                "ix_analysis_time_created"} <= index_names
+
+
+# ─── get_state_version ───────────────────────────────────────────────────────
+
+
+class TestStateVersion:
+    def test_starts_at_zero(self, db):
+        assert db.get_state_version()[0] == 0
+
+    def test_writes_bump_version(self, db):
+        _insert(db)
+        v1, t1 = db.get_state_version()
+        db.update_deployment("analysis-a1-0", status="executing")
+        v2, t2 = db.get_state_version()
+        db.update_analysis("a1", progress=50)
+        v3, _ = db.get_state_version()
+        db.delete_deployment("analysis-a1-0")
+        v4, _ = db.get_state_version()
+        assert 0 < v1 < v2 < v3 < v4
+        assert t1 <= t2
+
+    def test_reads_and_noop_writes_do_not_bump(self, db):
+        _insert(db)
+        version = db.get_state_version()
+        db.get_latest_deployment("a1")
+        db.query_analysis_ids()
+        db.update_analysis("nonexistent", status="failed")
+        db.delete_analysis("nonexistent")
+        db.delete_deployment("nonexistent")
+        assert db.get_state_version() == version
+
+
+# ─── add_status_listener ─────────────────────────────────────────────────────
+
+
+class TestStatusListeners:
+    def test_status_and_progress_writes_notify(self, db):
+        events = []
+        db.add_status_listener(lambda *args: events.append(args))
+
+        _insert(db)
+        db.update_deployment("analysis-a1-0", status="executing")
+        db.update_analysis("a1", progress=40)
+
+        assert events == [("a1", "started", 0), ("a1", "executing", 0), ("a1", "executing", 40)]
+
+    def test_other_writes_do_not_notify(self, db):
+        _insert(db)
+        events = []
+        db.add_status_listener(lambda *args: events.append(args))
+
+        db.update_analysis("a1", log="line")
+        db.update_deployment("analysis-a1-0", pod_ids="[]")
+
+        assert events == []
+
+    def test_update_analysis_reports_latest_deployment(self, db):
+        _insert(db, deployment_name="analysis-a1-0")
+        db.update_deployment("analysis-a1-0", time_created=1000.0)
+        _insert(db, deployment_name="analysis-a1-1", progress=70)
+        db.update_deployment("analysis-a1-1", time_created=2000.0)
+        events = []
+        db.add_status_listener(lambda *args: events.append(args))
+
+        db.update_analysis("a1", status="stopped")
+
+        assert events == [("a1", "stopped", 70)]
+
+    def test_failing_listener_does_not_break_write(self, db):
+        db.add_status_listener(MagicMock(side_effect=RuntimeError("boom")))
+        record = _insert(db)
+        assert record.analysis_id == "a1"
+
+
+# ─── append_analysis_logs ────────────────────────────────────────────────────
+
+
+class TestAppendAnalysisLogs:
+    def test_appends_lines_in_order(self, db):
+        _insert(db, log="existing")
+        db.append_analysis_logs("a1", ["l1", "l2"])
+        assert db.get_analysis_log("a1") == "existing\nl1\nl2"
+
+    def test_matches_per_line_appends(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        for line in ["l1", "l2", "l3"]:
+            db.update_analysis_log("a1", line)
+        db.append_analysis_logs("a2", ["l1", "l2", "l3"])
+        assert db.get_analysis_log("a1") == db.get_analysis_log("a2")
+
+    def test_advances_valid_progress(self, db):
+        _insert(db, progress=10)
+        assert db.append_analysis_logs("a1", ["l1"], progress=40) is True
+        assert db.get_analysis_progress("a1") == 40
+
+    @pytest.mark.parametrize("progress", [None, 10, 5, 101])
+    def test_keeps_progress_when_not_advancing(self, db, progress):
+        _insert(db, progress=10)
+        assert db.append_analysis_logs("a1", ["l1"], progress=progress) is False
+        assert db.get_analysis_progress("a1") == 10
+
+    def test_single_version_bump_and_notification(self, db):
+        _insert(db, progress=10)
+        events = []
+        db.add_status_listener(lambda *args: events.append(args))
+        version = db.get_state_version()[0]
+
+        db.append_analysis_logs("a1", ["l1", "l2", "l3"], progress=30)
+
+        assert db.get_state_version()[0] == version + 1
+        assert events == [("a1", "started", 30)]
+
+    def test_unknown_analysis(self, db):
+        assert db.append_analysis_logs("nonexistent", ["l1"], progress=50) is False
+
+    def test_batch_writes_all_analyses_in_one_transaction(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0", progress=10)
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0", progress=50)
+        from sqlalchemy.orm import Session
+
+        with patch.object(Session, "commit", autospec=True, side_effect=Session.commit) as mock_commit:
+            updated = db.append_analysis_logs_batch({"a1": ["l1"], "a2": ["m1", "m2"], "unknown": ["x"]},
+                                                    {"a1": 40, "a2": 20})
+        assert updated == {"a1"}
+        assert mock_commit.call_count == 1
+        assert db.get_analysis_log("a1") == "l1"
+        assert db.get_analysis_log("a2") == "m1\nm2"
+        assert db.get_analysis_progress("a1") == 40
+        assert db.get_analysis_progress("a2") == 50
+
+
+# ─── analysis_log table ──────────────────────────────────────────────────────
+
+
+class TestAppendOnlyLog:
+    def _rows(self, db, analysis_id="a1"):
+        from src.resources.database.db_models import AnalysisLogDB
+
+        with db.SessionLocal() as session:
+            return [(row.seq, row.log) for row in
+                    session.query(AnalysisLogDB).filter_by(analysis_id=analysis_id).order_by(AnalysisLogDB.seq)]
+
+    def test_lines_numbered_per_analysis(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        db.append_analysis_logs("a1", ["l1", "l2"])
+        db.update_analysis_log("a2", "x1")
+        db.update_analysis_log("a1", "l3")
+        assert self._rows(db, "a1") == [(0, "l1"), (1, "l2"), (2, "l3")]
+        assert self._rows(db, "a2") == [(0, "x1")]
+
+    def test_deployment_log_column_untouched(self, db):
+        _insert(db)
+        db.append_analysis_logs("a1", ["l1"])
+        assert db.get_latest_deployment("a1", with_log=True).log is None
+
+    def test_log_only_append_does_not_bump_state_version(self, db):
+        _insert(db)
+        version = db.get_state_version()[0]
+        db.append_analysis_logs("a1", ["l1", "l2"])
+        assert db.get_state_version()[0] == version
+
+    def test_iter_reads_all_batches_in_order(self, db):
+        _insert(db)
+        lines = [f"l{i}" for i in range(7)]
+        db.append_analysis_logs("a1", lines)
+        assert list(db.iter_analysis_log("a1", batch_size=3)) == lines
+
+    def test_seq_resumes_from_stored_lines(self, db):
+        _insert(db)
+        db.append_analysis_logs("a1", ["l1", "l2"])
+        db._next_log_seqs.clear()  # as after a restart
+        db.update_analysis_log("a1", "l3")
+        assert self._rows(db) == [(0, "l1"), (1, "l2"), (2, "l3")]
+
+    def test_delete_analysis_removes_lines(self, db):
+        _insert(db)
+        db.append_analysis_logs("a1", ["l1", "l2"])
+        db.delete_analysis("a1")
+        assert self._rows(db) == []
+        _insert(db)
+        db.update_analysis_log("a1", "new")
+        assert self._rows(db) == [(0, "new")]
+
+
+# ─── log retention / compression ─────────────────────────────────────────────
+
+
+def _snapshot(analysis_lines, nginx_lines, analysis_id="a1"):
+    return {"analysis": {analysis_id: analysis_lines}, "nginx": {analysis_id: nginx_lines}}
+
+
+class TestLogStorage:
+    def test_streamed_lines_capped_as_ring_buffer(self, db):
+        _insert(db)
+        with patch("src.resources.database.entity._LOG_MAX_LINES", 3):
+            db.append_analysis_logs("a1", ["l0", "l1"])
+            db.append_analysis_logs("a1", ["l2", "l3", "l4"])
+        assert list(db.iter_analysis_log("a1")) == ["l2", "l3", "l4"]
+
+    def test_snapshot_round_trip_is_compressed(self, db):
+        snapshot = _snapshot(["analysis line %d" % i for i in range(1000)], ["nginx line"] * 1000)
+        db.store_log_snapshot("a1", snapshot)
+        assert db.get_log_snapshot("a1") == snapshot
+
+        stats = db.get_log_storage_stats()
+        assert stats["snapshots"] == 1
+        assert stats["snapshot_stored_bytes"] < stats["snapshot_raw_bytes"]
+        assert stats["snapshot_saved_bytes"] == stats["snapshot_raw_bytes"] - stats["snapshot_stored_bytes"]
+
+    def test_snapshot_replaced(self, db):
+        db.store_log_snapshot("a1", _snapshot(["old"], []))
+        db.store_log_snapshot("a1", _snapshot(["new"], []))
+        assert db.get_log_snapshot("a1") == _snapshot(["new"], [])
+        assert db.get_log_storage_stats()["snapshots"] == 1
+
+    def test_missing_snapshot(self, db):
+        assert db.get_log_snapshot("a1") is None
+
+    def test_oversized_snapshot_drops_oldest_lines_of_largest_log(self, db):
+        # one newline-separated string per pod, as returned by get_analysis_logs
+        with patch("src.resources.database.entity._LOG_SNAPSHOT_MAX_BYTES", 10):
+            db.store_log_snapshot("a1", _snapshot(["aa\nbb\ncc\ndd"], ["nnnnnn\nmm"]))
+        assert db.get_log_snapshot("a1") == _snapshot(["bb\ncc\ndd"], ["mm"])
+        assert db.get_log_storage_stats()["snapshot_truncated_lines"] == 2
+
+    def test_oversized_pod_log_keeps_newest_lines(self, db):
+        pod_log = "\n".join(f"line {i:03d}" for i in range(200))
+        with patch("src.resources.database.entity._LOG_SNAPSHOT_MAX_BYTES", 1000):
+            db.store_log_snapshot("a1", _snapshot([pod_log], [""]))
+        [kept] = db.get_log_snapshot("a1")["analysis"]["a1"]
+        assert kept.split("\n") == [f"line {i:03d}" for i in range(75, 200)]  # 8 bytes each
+
+    def test_snapshot_stored_as_versioned_json(self, db):
+        import zstandard
+        from src.resources.database.db_models import LogSnapshotDB
+
+        db.store_log_snapshot("a1", _snapshot(["it's"], []))
+        with db.SessionLocal() as session:
+            row = session.query(LogSnapshotDB).one()
+            assert row.format_version == 1
+            assert json.loads(zstandard.ZstdDecompressor().decompress(row.data)) == _snapshot(["it's"], [])
+
+    def test_unknown_snapshot_format_rejected(self, db):
+        from src.resources.database.db_models import LogSnapshotDB
+
+        db.store_log_snapshot("a1", _snapshot([], []))
+        with db.SessionLocal() as session:
+            session.query(LogSnapshotDB).update({LogSnapshotDB.format_version: 99})
+            session.commit()
+        with pytest.raises(ValueError):
+            db.get_log_snapshot("a1")
+
+    def test_legacy_log_column_migrated(self, db):
+        snapshot = _snapshot(["line"], ["n"])
+        _insert(db, status="stopped", log=str(snapshot))
+        db.update_deployment("analysis-a1-0", time_created=456.0)
+
+        assert db.migrate_legacy_log("a1") == snapshot
+        assert db.get_log_snapshot("a1") == snapshot
+        assert db.get_latest_deployment("a1", with_log=True).log is None
+        assert db.migrate_legacy_log("a1") is None
+
+    def test_purge_expired_logs_of_terminal_analyses(self, db):
+        _insert(db, analysis_id="old", deployment_name="analysis-old-0", status="executed", log="legacy")
+        _insert(db, analysis_id="running", deployment_name="analysis-running-0", status="executing")
+        _insert(db, analysis_id="recent", deployment_name="analysis-recent-0", status="stopped")
+        db.update_deployment("analysis-old-0", time_created=time.time() - 40 * 86400)
+        db.update_deployment("analysis-running-0", time_created=time.time() - 40 * 86400)
+        for analysis_id in ["old", "running", "recent"]:
+            db.update_analysis_log(analysis_id, "line")
+        db.store_log_snapshot("recent", _snapshot(["line"], [], "recent"))
+
+        with patch("src.resources.database.entity._LOG_RETENTION_DAYS", 30):
+            assert db.purge_expired_logs() == ["old"]
+
+        assert db.get_analysis_log("old") == ""
+        assert db.get_latest_deployment("old") is not None
+        assert db.get_analysis_log("running") == "line"
+        assert db.get_log_snapshot("recent") is not None
+
+    def test_purge_uses_snapshot_time(self, db):
+        _insert(db, status="stopped")
+        db.update_deployment("analysis-a1-0", time_created=time.time() - 40 * 86400)
+        db.store_log_snapshot("a1", _snapshot(["line"], []))
+        with patch("src.resources.database.entity._LOG_RETENTION_DAYS", 30):
+            assert db.purge_expired_logs() == []
+
+    def test_purge_disabled(self, db):
+        _insert(db, status="stopped")
+        db.update_deployment("analysis-a1-0", time_created=0.0)
+        with patch("src.resources.database.entity._LOG_RETENTION_DAYS", 0):
+            assert db.purge_expired_logs() == []
+
+    def test_delete_analysis_removes_snapshot(self, db):
+        _insert(db)
+        db.store_log_snapshot("a1", _snapshot(["line"], []))
+        db.delete_analysis("a1")
+        assert db.get_log_snapshot("a1") is None
+
+
+# ─── archive ─────────────────────────────────────────────────────────────────
+
+
+def _insert_terminated(db, analysis_id, status="stopped", days_ago=10.0, restarts=1):
+    for i in range(restarts):
+        _insert(db, analysis_id=analysis_id, deployment_name=f"analysis-{analysis_id}-{i}", status=status)
+        db.update_deployment(f"analysis-{analysis_id}-{i}", time_created=time.time() - days_ago * 86400 + i)
+
+
+class TestArchive:
+    def test_moves_old_terminal_analyses(self, db):
+        from src.resources.database.db_models import ArchiveDB
+
+        _insert_terminated(db, "old", status="executed", restarts=2)
+        _insert_terminated(db, "recent", days_ago=1)
+        _insert_terminated(db, "running", status="executing")
+
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            assert db.archive_terminal_analyses() == ["old"]
+
+        assert db.get_deployments("old") == []
+        assert db.get_analysis_ids() == ["recent", "running"]
+        with db.SessionLocal() as session:
+            archived = session.query(ArchiveDB).order_by(ArchiveDB.deployment_name).all()
+            assert [row.deployment_name for row in archived] == ["analysis-old-0", "analysis-old-1"]
+            assert all(row.status == "executed" and row.time_archived is not None for row in archived)
+
+    def test_moves_in_batches(self, db):
+        for i in range(5):
+            _insert_terminated(db, f"a{i}")
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7), \
+                patch("src.resources.database.entity._ARCHIVE_BATCH_SIZE", 2):
+            assert sorted(db.archive_terminal_analyses()) == [f"a{i}" for i in range(5)]
+        assert db.get_analysis_ids() == []
+
+    def test_analysis_restarted_during_archival_stays_hot(self, db):
+        from src.resources.database.entity import Database
+
+        _insert_terminated(db, "a1")
+        _insert_terminated(db, "a2")
+        terminated_before = Database._terminated_before
+
+        def restart_a1(self, session, cutoff, **kwargs):
+            expired = terminated_before(self, session, cutoff, **kwargs)
+            if kwargs.get("analysis_ids") is None:
+                # restarted between the selection and its batch
+                _insert(db, analysis_id="a1", deployment_name="analysis-a1-1", status="started")
+            return expired
+
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7), \
+                patch.object(Database, "_terminated_before", restart_a1):
+            assert db.archive_terminal_analyses() == ["a2"]
+
+        assert sorted(d.deployment_name for d in db.get_deployments("a1")) == ["analysis-a1-0", "analysis-a1-1"]
+        assert db.get_analysis_ids() == ["a1", "a1"]
+        assert db.query_analysis_ids(include_archived=True) == ["a1", "a2"]
+
+    def test_time_archived_added_to_existing_archive_table(self):
+        from sqlalchemy import create_engine as real_create_engine, inspect, text
+
+        engine = real_create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+        columns = ", ".join(f"{column.name} {column.type}"
+                            for column in Base.metadata.tables["archive"].columns if column.name != "time_archived")
+        with engine.begin() as connection:
+            connection.execute(text(f"CREATE TABLE archive ({columns})"))
+        with patch("src.resources.database.entity.create_engine", return_value=engine):
+            from src.resources.database.entity import Database
+
+            Database()
+
+        assert "time_archived" in {column["name"] for column in inspect(engine).get_columns("archive")}
+        Base.metadata.drop_all(bind=engine)
+
+    def test_disabled(self, db):
+        _insert_terminated(db, "old")
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 0):
+            assert db.archive_terminal_analyses() == []
+        assert db.get_analysis_ids() == ["old"]
+
+    def test_history_lookups_include_archived(self, db):
+        _insert_terminated(db, "old", status="failed")
+        _insert(db, analysis_id="hot", deployment_name="analysis-hot-0", status="stopped")
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            db.archive_terminal_analyses()
+
+        assert db.query_analysis_ids() == ["hot"]
+        assert db.query_analysis_ids(include_archived=True) == ["hot", "old"]
+        assert db.query_analysis_ids(status=["failed"], include_archived=True) == ["old"]
+        assert db.get_latest_deployments(["old"]) == {}
+        latest = db.get_latest_deployments(["old", "hot"], include_archived=True)
+        assert {aid: d.status for aid, d in latest.items()} == {"old": "failed", "hot": "stopped"}
+        assert db.get_latest_deployment_summaries(["old"]) == {}
+        summaries = db.get_latest_deployment_summaries(["old", "hot"], include_archived=True)
+        assert {aid: d.status for aid, d in summaries.items()} == {"old": "failed", "hot": "stopped"}
+
+    def test_recreated_analysis_prefers_hot_row(self, db):
+        _insert_terminated(db, "a1")
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            db.archive_terminal_analyses()
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-5", status="started")
+
+        assert db.query_analysis_ids(include_archived=True) == ["a1"]
+        assert db.get_latest_deployments(include_archived=True)["a1"].status == "started"
+
+    def test_legacy_log_of_archived_analysis_migrated(self, db):
+        _insert_terminated(db, "a1")
+        db.update_deployment("analysis-a1-0", log=str(_snapshot(["line"], [])))
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            db.archive_terminal_analyses()
+
+        assert db.migrate_legacy_log("a1") == _snapshot(["line"], [])
+        assert db.migrate_legacy_log("a1") is None
+
+    def test_purge_and_delete_cover_archived(self, db):
+        from src.resources.database.db_models import ArchiveDB
+
+        _insert_terminated(db, "a1", days_ago=40)
+        db.update_analysis_log("a1", "line")
+        with patch("src.resources.database.entity._ARCHIVE_AFTER_DAYS", 7):
+            db.archive_terminal_analyses()
+        with patch("src.resources.database.entity._LOG_RETENTION_DAYS", 30):
+            assert db.purge_expired_logs() == ["a1"]
+
+        db.delete_analysis("a1")
+        with db.SessionLocal() as session:
+            assert session.query(ArchiveDB).count() == 0
+
+
+# ─── structured log records ──────────────────────────────────────────────────
+
+
+def _record(log, level="info", created_at=1000.0, status="executing", progress=10):
+    return {"entity_id": f"id-{log}", "log": log, "level": level, "status": status, "progress": progress,
+            "created_at": created_at}
+
+
+class TestLogRecords:
+    def test_records_rendered_as_log_entities_in_compat_view(self, db):
+        _insert(db)
+        db.append_analysis_logs("a1", ["plain", _record("msg", level="warn")])
+        lines = db.get_analysis_log("a1").split("\n")
+        assert lines[0] == "plain"
+        assert lines[1].startswith("LogEntity(id=id-msg, log=msg, log_type=warn, created_at=")
+
+    def test_query_filters_by_level_and_time_range(self, db):
+        _insert(db, analysis_id="a1", deployment_name="analysis-a1-0")
+        _insert(db, analysis_id="a2", deployment_name="analysis-a2-0")
+        db.append_analysis_logs("a1", ["plain",
+                                       _record("early", created_at=100.0),
+                                       _record("error", level="error", created_at=200.0),
+                                       _record("late", created_at=300.0)])
+        db.append_analysis_logs("a2", [_record("other", level="error", created_at=200.0)])
+
+        assert [r["log"] for r in db.query_log_records(["a1"], since=200.0)["a1"]] == ["error", "late"]
+        assert [r["log"] for r in db.query_log_records(["a1"], until=300.0)["a1"]] == ["early", "error"]
+        result = db.query_log_records(["a1", "a2", "a3"], level=["error"])
+        assert {k: [r["log"] for r in v] for k, v in result.items()} == {"a1": ["error"], "a2": ["other"], "a3": []}
+        assert result["a1"][0] == {"id": "id-error", "log": "error", "log_type": "error", "status": "executing",
+                                   "progress": 10, "created_at": 200.0}
+
+    def test_query_without_ids(self, db):
+        assert db.query_log_records([]) == {}
+
 
 # ─── get_analysis_log / update_analysis_log ──────────────────────────────────
 
@@ -352,4 +970,18 @@ class TestDeleteOldDeployments:
 
         remaining = db.get_deployments("a1")
         assert len(remaining) == 1
-        assert remaining[0].deployment_name == "analysis-a1-2"
\ No newline at end of file
+        assert remaining[0].deployment_name == "analysis-a1-2"
+
+    def test_deletes_in_single_statement(self, db):
+        from sqlalchemy import event
+
+        for i in range(4):
+            _insert(db, deployment_name=f"analysis-a1-{i}")
+            db.update_deployment(f"analysis-a1-{i}", time_created=1000.0 + i)
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        db.delete_old_deployments_from_db("a1")
+
+        assert sum(statement.startswith("DELETE") for statement in statements) == 1
+        assert [d.deployment_name for d in db.get_deployments("a1")] == ["analysis-a1-3"]
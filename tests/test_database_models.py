@@ -95,7 +95,7 @@ class TestArchiveDB:
 
     def test_all_columns_exist(self):
         cols = {c.name for c in ArchiveDB.__table__.columns}
-        assert set(_SHARED_COLUMNS) == cols
+        assert set(_SHARED_COLUMNS) | {"time_archived"} == cols
 
     def test_id_is_primary_key(self):
         col = ArchiveDB.__table__.c["id"]
@@ -157,7 +157,8 @@ class TestSharedSchema:
     def test_analysis_and_archive_have_same_columns(self):
         analysis_cols = {c.name for c in AnalysisDB.__table__.columns}
         archive_cols = {c.name for c in ArchiveDB.__table__.columns}
-        assert analysis_cols == archive_cols
+        # the archive only adds the time a row was archived
+        assert analysis_cols | {"time_archived"} == archive_cols
 
     def test_analysis_and_archive_have_different_table_names(self):
         assert AnalysisDB.__tablename__ != ArchiveDB.__tablename__
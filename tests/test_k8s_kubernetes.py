@@ -5,7 +5,9 @@ Covers:
   - create_harbor_secret: success, first-call failure -> delete+retry, Conflict re-raises
   - create_analysis_deployment: full chain (deployment + service + nginx + network policy)
   - delete_deployment: all resources cleaned up, Not-Found exceptions handled silently
+  - discover_node_services: shared lookup of node-local services and pod ips
   - get_analysis_logs: structure, pod_id filtering, ApiException returns []
+  - PodLogStream / open_pod_log_stream: incremental sanitizing, pod selection, close
   - get_pod_status: ready/waiting/terminated/no pods
 """
 
@@ -17,8 +19,12 @@ from src.k8s.kubernetes import (
     create_harbor_secret,
     create_analysis_deployment,
     delete_deployment,
+    discover_node_services,
     get_analysis_logs,
     get_pod_status,
+    harbor_secret_name,
+    open_pod_log_stream,
+    PodLogStream,
 )
 
 
@@ -92,6 +98,20 @@ class TestCreateHarborSecret:
         assert call_kwargs["namespace"] == "flame-ns"
 
 
+class TestHarborSecretName:
+    def test_stable_per_credentials(self):
+        name = harbor_secret_name("harbor.test", "user", "password")
+        assert name == harbor_secret_name("harbor.test", "user", "password")
+        assert name.startswith("flame-harbor-credentials-")
+        assert len(name) <= 63  # DNS label limit for secret names
+
+    def test_differs_between_credentials(self):
+        names = {harbor_secret_name("harbor.test", "user", "password"),
+                 harbor_secret_name("harbor.test", "other", "password"),
+                 harbor_secret_name("harbor.test", "user", "rotated")}
+        assert len(names) == 3
+
+
 # ─── create_analysis_deployment ─────────────────────────────────────────────
 
 class TestCreateAnalysisDeployment:
@@ -252,6 +272,45 @@ class TestDeleteDeployment:
         )
 
 
+# ─── discover_node_services ──────────────────────────────────────────────────
+
+class TestDiscoverNodeServices:
+    def test_returns_service_names_and_pod_ips(self, mock_k8s_clients):
+        def _find(resource_type, selector_type, selector_arg, manual_name_selector=None, namespace="default"):
+            return [f"{resource_type}-{selector_arg}"]
+
+        broker_pod, po_pod = MagicMock(), MagicMock()
+        broker_pod.status.pod_ip = "10.0.0.2"
+        po_pod.status.pod_ip = "10.0.0.3"
+        mock_k8s_clients.core_v1.read_namespaced_pod.side_effect = [broker_pod, po_pod]
+
+        with (
+            patch("src.k8s.kubernetes.find_k8s_resources", side_effect=_find),
+            patch("src.k8s.kubernetes.time.sleep"),
+        ):
+            result = discover_node_services("ns")
+
+        assert result == {
+            "message_broker_service_name": "service-component=flame-message-broker",
+            "message_broker_ip": "10.0.0.2",
+            "po_service_name": "service-component=flame-po",
+            "pod_orchestration_ip": "10.0.0.3",
+            "hub_adapter_service_name": "service-component=flame-hub-adapter",
+            "kong_proxy_name": "service-app.kubernetes.io/name=kong",
+            "storage_service_name": "service-component=flame-storage-service",
+        }
+
+    def test_missing_pod_orchestration_pod_raises(self, mock_k8s_clients):
+        mock_k8s_clients.core_v1.read_namespaced_pod.side_effect = [MagicMock(), ApiException(status=404)]
+
+        with (
+            patch("src.k8s.kubernetes.find_k8s_resources", return_value=["name"]),
+            patch("src.k8s.kubernetes.time.sleep"),
+            pytest.raises(ValueError),
+        ):
+            discover_node_services()
+
+
 # ─── get_analysis_logs ───────────────────────────────────────────────────────
 
 class TestGetAnalysisLogs:
@@ -327,6 +386,92 @@ class TestGetAnalysisLogs:
         assert "healthz" not in combined
 
 
+# ─── PodLogStream / open_pod_log_stream ──────────────────────────────────────
+
+def _make_log_response(*chunks: bytes) -> MagicMock:
+    """Build a mock non-preloaded log response yielding ``chunks``."""
+    response = MagicMock()
+    response.stream.return_value = iter(chunks)
+    return response
+
+
+class TestPodLogStream:
+    def test_requests_raw_stream_with_params(self, mock_k8s_clients):
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.return_value = _make_log_response()
+
+        PodLogStream("pod-1", namespace="ns", follow=True, tail_lines=10, since_seconds=60)
+
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.assert_called_once_with(
+            "pod-1", "ns", follow=True, tail_lines=10, since_seconds=60, _preload_content=False
+        )
+
+    def test_yields_complete_sanitized_lines_across_chunk_boundaries(self, mock_k8s_clients):
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.return_value = _make_log_response(
+            b"first li",
+            b"ne\nINFO: dropped\nsec",
+            "ond \u00e4".encode()[:-1],
+            "ond \u00e4".encode()[-1:] + b"\x07\n",
+            b'x "GET /healthz HTTP/1.0" 200 OK\nlast',
+        )
+
+        chunks = list(PodLogStream("pod-1"))
+
+        assert chunks == ["first line\n", "second \n", "last"]
+
+    def test_closes_response_when_exhausted(self, mock_k8s_clients):
+        response = _make_log_response(b"line\n")
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.return_value = response
+
+        list(PodLogStream("pod-1"))
+
+        response.close.assert_called_once()
+        response.release_conn.assert_called_once()
+
+    def test_read_error_after_close_ends_stream(self, mock_k8s_clients):
+        response = MagicMock()
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.return_value = response
+        log_stream = PodLogStream("pod-1")
+
+        def _stream(amt):
+            yield b"line\n"
+            log_stream.close()
+            raise OSError("connection closed")
+
+        response.stream.side_effect = _stream
+
+        assert list(log_stream) == ["line\n"]
+        response.close.assert_called_once()
+
+    def test_read_error_while_open_raises(self, mock_k8s_clients):
+        response = MagicMock()
+        response.stream.side_effect = OSError("reset")
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.return_value = response
+
+        with pytest.raises(OSError):
+            list(PodLogStream("pod-1"))
+
+
+class TestOpenPodLogStream:
+    def test_opens_newest_allowed_pod(self, mock_k8s_clients):
+        pods = _make_pod_list("pod-old", "pod-new", "pod-other")
+        for pod, created in zip(pods.items, [1, 2, 3]):
+            pod.metadata.creation_timestamp = created
+        mock_k8s_clients.core_v1.list_namespaced_pod.return_value = pods
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.return_value = _make_log_response()
+
+        log_stream = open_pod_log_stream("dep-1", pod_ids=["pod-old", "pod-new"], namespace="ns", follow=True)
+
+        assert log_stream.pod_name == "pod-new"
+        mock_k8s_clients.core_v1.list_namespaced_pod.assert_called_once_with(namespace="ns",
+                                                                             label_selector="app=dep-1")
+
+    def test_no_pods_returns_none(self, mock_k8s_clients):
+        mock_k8s_clients.core_v1.list_namespaced_pod.return_value = _make_pod_list()
+
+        assert open_pod_log_stream("dep-1") is None
+        mock_k8s_clients.core_v1.read_namespaced_pod_log.assert_not_called()
+
+
 # ─── get_pod_status ──────────────────────────────────────────────────────────
 
 class TestGetPodStatus:
@@ -132,6 +132,13 @@ class TestFindK8sResourcesResults:
         result = find_k8s_resources("configmap")[0]
         assert result == "cm-nginx-123"
 
+    def test_secret_resource(self, mock_k8s_clients):
+        mock_k8s_clients.core_v1.list_namespaced_secret.return_value = (
+            _make_resource_list(["flame-harbor-credentials"])
+        )
+        result = find_k8s_resources("secret")[0]
+        assert result == "flame-harbor-credentials"
+
     def test_job_resource(self, mock_k8s_clients):
         mock_k8s_clients.batch_v1.list_namespaced_job.return_value = (
             _make_resource_list(["job-analysis-123"])
@@ -221,6 +228,12 @@ class TestDeleteK8sResourceTypes:
             name="my-cm", namespace="default"
         )
 
+    def test_delete_secret(self, mock_k8s_clients):
+        delete_k8s_resource("my-secret", "secret")
+        mock_k8s_clients.core_v1.delete_namespaced_secret.assert_called_once_with(
+            name="my-secret", namespace="default"
+        )
+
     def test_delete_networkpolicy(self, mock_k8s_clients):
         delete_k8s_resource("my-policy", "networkpolicy")
         mock_k8s_clients.networking_v1.delete_namespaced_network_policy.assert_called_once_with(
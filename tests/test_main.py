@@ -13,6 +13,7 @@ class TestMain:
             patch("src.main.load_dotenv"),
             patch("src.main.find_dotenv", return_value=".env"),
             patch("src.main.load_cluster_config"),
+            patch("src.main.start_keycloak_client_pool"),
             patch("src.main.Database", return_value=mock_db),
             patch("src.main.get_current_namespace", return_value="default"),
             patch("src.main.Thread", return_value=mock_thread) as mock_thread_cls,
@@ -29,6 +30,9 @@ class TestMain:
         # Thread was started
         mock_thread.start.assert_called_once()
 
+        # Change feed was started
+        mock_db.start_change_feed.assert_called_once_with()
+
         # status_loop was called with the database and default interval
         mock_status_loop.assert_called_once_with(mock_db, 10)
 
@@ -43,6 +47,7 @@ class TestMain:
             patch("src.main.load_dotenv"),
             patch("src.main.find_dotenv", return_value=".env"),
             patch("src.main.load_cluster_config"),
+            patch("src.main.start_keycloak_client_pool"),
             patch("src.main.Database", return_value=mock_db),
             patch("src.main.get_current_namespace", return_value="default"),
             patch("src.main.Thread", return_value=mock_thread),
@@ -64,6 +69,7 @@ class TestMain:
             patch("src.main.load_dotenv"),
             patch("src.main.find_dotenv", return_value=".env"),
             patch("src.main.load_cluster_config"),
+            patch("src.main.start_keycloak_client_pool"),
             patch("src.main.Database", return_value=mock_db),
             patch("src.main.get_current_namespace", return_value="default"),
             patch("src.main.Thread", return_value=mock_thread),
@@ -74,6 +80,29 @@ class TestMain:
 
         mock_status_loop.assert_called_once_with(mock_db, 10)
 
+    def test_main_uses_cached_database_when_enabled(self, monkeypatch):
+        """When PO_STATE_CACHE is set, main() serves deployment state through a CachedDatabase."""
+        monkeypatch.setenv("PO_STATE_CACHE", "true")
+
+        mock_db = MagicMock()
+
+        with (
+            patch("src.main.load_dotenv"),
+            patch("src.main.find_dotenv", return_value=".env"),
+            patch("src.main.load_cluster_config"),
+            patch("src.main.start_keycloak_client_pool"),
+            patch("src.main.Database") as mock_database_cls,
+            patch("src.main.CachedDatabase", return_value=mock_db),
+            patch("src.main.get_current_namespace", return_value="default"),
+            patch("src.main.Thread", return_value=MagicMock()),
+            patch("src.main.status_loop") as mock_status_loop,
+        ):
+            from src.main import main
+            main()
+
+        mock_database_cls.assert_not_called()
+        mock_status_loop.assert_called_once_with(mock_db, 10)
+
     def test_start_po_api_instantiates_pod_orchestration_api(self):
         """start_po_api creates a PodOrchestrationAPI with the given args."""
         mock_db = MagicMock()
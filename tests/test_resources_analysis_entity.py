@@ -4,7 +4,8 @@ import json
 import pytest
 from unittest.mock import MagicMock, patch
 
-from src.resources.analysis.entity import Analysis, CreateAnalysis, read_db_analysis
+from src.resources.analysis.entity import Analysis, AnalysisQuery, CreateAnalysis, HistoryQuery, read_db_analysis
+from src.resources.log.entity import LogQuery
 from src.status.constants import AnalysisStatus
 
 
@@ -275,6 +276,17 @@ class TestReadDbAnalysis:
         result = read_db_analysis(db_row)
         assert result.log is None
 
+    def test_deferred_log_not_loaded(self):
+        from src.resources.database.db_models import AnalysisDB
+
+        # a row loaded without its deferred log column lacks the attribute entirely
+        db_row = AnalysisDB(analysis_id="a1", deployment_name="analysis-a1-0", project_id="p1",
+                            registry_url="harbor", image_url="harbor/img", registry_user="u",
+                            registry_password="pw", status="started", pod_ids=json.dumps([]),
+                            namespace="default", kong_token="t", restart_counter=0, progress=0)
+        result = read_db_analysis(db_row)
+        assert result.log is None
+
 
 # ─── CreateAnalysis ───────────────────────────────────────────────────────────
 
@@ -318,4 +330,12 @@ class TestCreateAnalysis:
 
     def test_is_pydantic_model(self):
         from pydantic import BaseModel
-        assert issubclass(CreateAnalysis, BaseModel)
\ No newline at end of file
+        assert issubclass(CreateAnalysis, BaseModel)
+
+# ─── HistoryQuery ─────────────────────────────────────────────────────────────
+
+class TestHistoryQuery:
+    def test_split_into_listing_and_log_filters(self):
+        query = HistoryQuery(status=["stopped"], limit=5, level=["error"], since=10.0)
+        assert query.analysis_query() == AnalysisQuery(status=["stopped"], limit=5)
+        assert query.log_query() == LogQuery(level=["error"], since=10.0)
@@ -7,6 +7,7 @@ from src.resources.log.entity import (
     CreateLogEntity,
     CreateStartUpErrorLog,
     AnalysisStoppedLog,
+    LogQuery,
 )
 from src.status.constants import _MAX_RESTARTS
 
@@ -96,6 +97,35 @@ class TestCreateLogEntity:
         assert not hasattr(result, "status")
         assert not hasattr(result, "progress")
 
+    def test_to_log_record_keeps_typed_fields(self):
+        entity = CreateLogEntity(
+            log="msg",
+            log_type="warn",
+            analysis_id="analysis-42",
+            status="executing",
+            progress=99,
+        )
+        record = entity.to_log_record()
+        assert {k: record[k] for k in ("log", "level", "status", "progress")} == \
+               {"log": "msg", "level": "warn", "status": "executing", "progress": 99}
+        assert isinstance(record["created_at"], float)
+        assert record["entity_id"] != entity.to_log_record()["entity_id"]
+
+
+# ─── LogQuery ─────────────────────────────────────────────────────────────────
+
+class TestLogQuery:
+    def test_unset_by_default(self):
+        assert LogQuery().is_set() is False
+
+    @pytest.mark.parametrize("kwargs", [{"level": ["error"]}, {"since": 0.0}, {"until": 1.0}])
+    def test_any_filter_sets_query(self, kwargs):
+        assert LogQuery(**kwargs).is_set() is True
+
+    def test_rejects_unknown_level(self):
+        with pytest.raises(Exception):
+            LogQuery(level=["verbose"])
+
 
 # ─── CreateStartUpErrorLog ────────────────────────────────────────────────────
 
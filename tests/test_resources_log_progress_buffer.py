@@ -0,0 +1,108 @@
+"""Tests for src/resources/log/progress_buffer.py — write-behind status/progress buffer."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.resources.log.progress_buffer import ProgressBuffer
+
+
+@pytest.fixture
+def buffer(mock_database, mock_hub_client):
+    mock_database.append_analysis_logs.return_value = True
+    return ProgressBuffer(mock_database, mock_hub_client, "node-id", flush_interval=3600)
+
+
+# ─── TestRecord ───────────────────────────────────────────────────────────────
+
+class TestRecord:
+    def test_reports_are_coalesced(self, buffer, mock_database):
+        buffer.record("a1", "started", 10)
+        buffer.record("a1", "executing", 40)
+        buffer.record("a1", "executing", 20)
+        buffer.record("a2", "executing", 5)
+
+        assert buffer.pending_count() == 2
+        mock_database.append_analysis_logs.assert_not_called()
+
+    def test_out_of_range_progress_dropped(self, buffer, mock_database):
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.log.progress_buffer.update_hub_status"):
+                buffer.record("a1", "executing", 30)
+                buffer.record("a1", "executing", 150)
+                buffer.flush()
+
+        mock_database.append_analysis_logs.assert_called_once_with("a1", [], progress=30)
+
+    @pytest.mark.parametrize("status", ["executed", "failed", "stopped", "stuck"])
+    def test_terminal_status_flushed_immediately(self, buffer, mock_database, status):
+        buffer.record("a2", "executing", 5)
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.log.progress_buffer.update_hub_status") as mock_hub_update:
+                buffer.record("a1", "executing", 60)
+                buffer.record("a1", status, 50)
+
+        mock_database.append_analysis_logs.assert_called_once_with("a1", [], progress=60)
+        mock_hub_update.assert_called_once_with(buffer.hub_core_client, "na", run_status=status, run_progress=60)
+        assert buffer.pending_count() == 1
+
+
+# ─── TestFlush ────────────────────────────────────────────────────────────────
+
+class TestFlush:
+    def test_flush_writes_once_per_analysis(self, buffer, mock_database):
+        for progress in range(1, 50):
+            buffer.record("a1", "executing", progress)
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.log.progress_buffer.update_hub_status") as mock_hub_update:
+                assert buffer.flush() == 1
+
+        mock_database.append_analysis_logs.assert_called_once_with("a1", [], progress=49)
+        mock_hub_update.assert_called_once_with(buffer.hub_core_client, "na", run_status="executing", run_progress=49)
+        assert buffer.pending_count() == 0
+
+    def test_progress_not_advanced_sends_status_only(self, buffer, mock_database):
+        mock_database.append_analysis_logs.return_value = False
+        buffer.record("a1", "executing", 10)
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.log.progress_buffer.update_hub_status") as mock_hub_update:
+                buffer.flush()
+
+        mock_hub_update.assert_called_once_with(buffer.hub_core_client, "na", run_status="executing")
+
+    def test_node_analysis_id_cached(self, buffer):
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na") as mock_lookup:
+            with patch("src.resources.log.progress_buffer.update_hub_status"):
+                buffer.record("a1", "executing", 10)
+                buffer.flush()
+                buffer.record("a1", "executing", 20)
+                buffer.flush()
+
+        assert mock_lookup.call_count == 1
+
+    def test_failure_does_not_block_other_analyses(self, buffer, mock_database):
+        mock_database.append_analysis_logs.side_effect = [RuntimeError("db down"), True]
+        buffer.record("a1", "executing", 10)
+        buffer.record("a2", "executing", 10)
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.log.progress_buffer.update_hub_status") as mock_hub_update:
+                assert buffer.flush() == 2
+
+        assert mock_hub_update.call_count == 1
+
+    def test_background_thread_flushes_and_stop_drains(self, mock_database, mock_hub_client):
+        buffer = ProgressBuffer(mock_database, mock_hub_client, "node-id", flush_interval=0.01)
+        with patch("src.resources.log.progress_buffer.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.log.progress_buffer.update_hub_status"):
+                buffer.start()
+                buffer.record("a1", "executing", 10)
+                deadline = time.time() + 2
+                while buffer.pending_count() and time.time() < deadline:
+                    time.sleep(0.01)
+                assert buffer.pending_count() == 0
+
+                buffer.stop()
+                buffer.record("a1", "executing", 20)
+                buffer.stop()
+        assert buffer.pending_count() == 0
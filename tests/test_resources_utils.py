@@ -7,11 +7,12 @@ All external dependencies are mocked:
   - get_analysis_logs
   - init_hub_client_and_update_hub_status_with_client
   - find_k8s_resources / delete_k8s_resource
-  - _get_all_keycloak_clients / delete_keycloak_client
+  - _get_flame_keycloak_clients / delete_keycloak_client(s)
   - update_hub_status / get_node_analysis_id
   - time.sleep / resource_name_to_analysis
 """
 
+import ast
 from unittest.mock import MagicMock, patch, call
 
 import pytest
@@ -20,8 +21,8 @@ from src.resources.analysis.entity import CreateAnalysis
 from src.resources.log.entity import CreateLogEntity
 from src.status.constants import AnalysisStatus
 
-# Sample log string: a valid Python literal representing the log dict stored in the DB.
-# retrieve_history calls ast.literal_eval() on this, then reads ['analysis'][id] and ['nginx'][id].
+# Sample log string: a valid Python literal representing the log dict stored in the legacy log column.
+# retrieve_history has the database convert it (Database.migrate_legacy_log) and reads ['analysis'][id] and ['nginx'][id].
 _ANALYSIS_ID = "analysis_id"
 _SAMPLE_LOG = str({
     "analysis": {_ANALYSIS_ID: ["analysis log line"]},
@@ -86,7 +87,10 @@ class TestCreateAnalysis:
         result = create_analysis(body, mock_database)
 
         mock_harbor.assert_called_once()
-        mock_inst.start.assert_called_once_with(database=mock_database, namespace="default")
+        mock_inst.start.assert_called_once_with(database=mock_database,
+                                                namespace="default",
+                                                node_services=None,
+                                                image_pull_secret="flame-harbor-credentials")
         mock_hub.assert_called_once_with(self._VALID_UUID, AnalysisStatus.STARTED.value)
         assert result == {self._VALID_UUID: AnalysisStatus.STARTED.value}
 
@@ -125,6 +129,137 @@ class TestCreateAnalysis:
         assert result == {"status": "Analysis ID not found in database."}
 
 
+# ─── create_analyses ──────────────────────────────────────────────────────────
+
+_OTHER_UUID = "223e4567-e89b-42d3-a456-426614174000"
+
+
+@patch("src.resources.utils.init_hub_client_and_update_hub_status_with_client")
+@patch("src.resources.utils.update_hub_status_for_analysis")
+@patch("src.resources.utils.Analysis")
+@patch("src.resources.utils.discover_node_services", return_value={"po_service_name": "po"})
+@patch("src.resources.utils.create_harbor_secret")
+@patch("src.resources.utils.get_current_namespace", return_value="default")
+class TestCreateAnalyses:
+    def _body(self, analysis_id=TestCreateAnalysis._VALID_UUID, **kwargs):
+        body_kwargs = TestCreateAnalysis()._valid_body_kwargs()
+        body_kwargs.update(analysis_id=analysis_id, **kwargs)
+        return CreateAnalysis(**body_kwargs)
+
+    def test_shares_setup_and_starts_every_analysis(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        mock_analysis_cls.side_effect = lambda **kwargs: _analysis_mock(analysis_id=kwargs["analysis_id"],
+                                                                        status=AnalysisStatus.STARTED.value)
+        hub_client = MagicMock()
+
+        results = create_analyses([self._body(), self._body(_OTHER_UUID)], mock_database, hub_client, "node-id")
+
+        assert results == [
+            {"analysis_id": TestCreateAnalysis._VALID_UUID, "status": AnalysisStatus.STARTED.value},
+            {"analysis_id": _OTHER_UUID, "status": AnalysisStatus.STARTED.value},
+        ]
+        mock_ns.assert_called_once()
+        mock_discover.assert_called_once_with("default")
+        mock_harbor.assert_called_once_with("harbor.privateaim", "robot_user", "default_pw",
+                                            name="flame-harbor-credentials", namespace="default")
+        assert mock_update.call_count == 2
+        assert {c.args[2] for c in mock_update.call_args_list} == {TestCreateAnalysis._VALID_UUID, _OTHER_UUID}
+        assert all(c.args[:2] == (hub_client, "node-id") for c in mock_update.call_args_list)
+        mock_init_hub.assert_not_called()
+
+    def test_passes_shared_node_services_to_start(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        mock_inst = _analysis_mock(status=AnalysisStatus.STARTED.value)
+        mock_analysis_cls.return_value = mock_inst
+
+        create_analyses([self._body()], mock_database)
+
+        mock_inst.start.assert_called_once_with(database=mock_database,
+                                                namespace="default",
+                                                node_services={"po_service_name": "po"},
+                                                image_pull_secret="flame-harbor-credentials")
+        # without a shared client, fall back to the one-shot hub update
+        mock_init_hub.assert_called_once_with(TestCreateAnalysis._VALID_UUID, AnalysisStatus.STARTED.value)
+        mock_update.assert_not_called()
+
+    def test_secret_created_once_per_distinct_credentials(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        mock_analysis_cls.return_value = _analysis_mock()
+
+        create_analyses([self._body(),
+                         self._body(_OTHER_UUID, registry_user="other_user")], mock_database)
+
+        assert mock_harbor.call_count == 2
+
+    def test_mixed_credentials_get_separate_secrets(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        started = {}
+        mock_analysis_cls.side_effect = lambda **kwargs: started.setdefault(kwargs["registry_user"], _analysis_mock())
+
+        create_analyses([self._body(),
+                         self._body(_OTHER_UUID, registry_user="other_user")], mock_database)
+
+        secrets = {c.args[1]: c.kwargs["name"] for c in mock_harbor.call_args_list}
+        assert len(set(secrets.values())) == 2
+        assert "flame-harbor-credentials" not in secrets.values()
+        for user, analysis in started.items():
+            assert analysis.start.call_args.kwargs["image_pull_secret"] == secrets[user]
+
+    def test_invalid_and_duplicate_items_are_rejected_individually(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        mock_analysis_cls.return_value = _analysis_mock(status=AnalysisStatus.STARTED.value)
+
+        results = create_analyses([self._body(),
+                                   self._body(),
+                                   self._body("not-a-uuid", project_id="not-a-uuid")], mock_database)
+
+        assert results[0] == {"analysis_id": TestCreateAnalysis._VALID_UUID, "status": AnalysisStatus.STARTED.value}
+        assert results[1] == {"analysis_id": TestCreateAnalysis._VALID_UUID, "error": "Duplicate analysis ID in batch."}
+        assert "error" in results[2]
+        assert mock_analysis_cls.call_count == 1
+
+    def test_failing_item_does_not_affect_others(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        failing = _analysis_mock()
+        failing.start.side_effect = RuntimeError("k8s down")
+        ok = _analysis_mock(status=AnalysisStatus.STARTED.value)
+        mock_analysis_cls.side_effect = lambda **kwargs: failing if kwargs["analysis_id"] == _OTHER_UUID else ok
+
+        results = create_analyses([self._body(), self._body(_OTHER_UUID)], mock_database)
+
+        assert results[0]["status"] == AnalysisStatus.STARTED.value
+        assert "k8s down" in results[1]["error"]
+
+    def test_nothing_valid_skips_setup(
+        self, mock_ns, mock_harbor, mock_discover, mock_analysis_cls, mock_update, mock_init_hub, mock_database
+    ):
+        from src.resources.utils import create_analyses
+
+        results = create_analyses([self._body("x", project_id="y")], mock_database)
+
+        assert "error" in results[0]
+        mock_discover.assert_not_called()
+        mock_harbor.assert_not_called()
+
+
 # ─── retrieve_history ─────────────────────────────────────────────────────────
 
 class TestRetrieveHistory:
@@ -132,10 +267,13 @@ class TestRetrieveHistory:
         from src.resources.utils import retrieve_history
 
         db_row = sample_analysis_db(status=AnalysisStatus.STOPPED.value, log=_SAMPLE_LOG)
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
+        mock_database.migrate_legacy_log.return_value = ast.literal_eval(_SAMPLE_LOG)
 
         result = retrieve_history(_ANALYSIS_ID, mock_database)
 
+        mock_database.get_latest_deployments.assert_called_once_with([_ANALYSIS_ID], include_archived=True)
+        mock_database.migrate_legacy_log.assert_called_once_with(_ANALYSIS_ID)
         assert result["analysis"][_ANALYSIS_ID] == ["analysis log line"]
         assert result["nginx"][_ANALYSIS_ID] == ["nginx log line"]
 
@@ -143,18 +281,65 @@ class TestRetrieveHistory:
         from src.resources.utils import retrieve_history
 
         db_row = sample_analysis_db(status=AnalysisStatus.EXECUTED.value, log=_SAMPLE_LOG)
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
 
         result = retrieve_history(_ANALYSIS_ID, mock_database)
 
         assert _ANALYSIS_ID in result["analysis"]
 
+    def test_snapshot_preferred_over_log_column(self, mock_database, sample_analysis_db):
+        from src.resources.utils import retrieve_history
+
+        db_row = sample_analysis_db(status=AnalysisStatus.STOPPED.value, log="")
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
+        mock_database.get_log_snapshot.return_value = {"analysis": {_ANALYSIS_ID: ["snap"]},
+                                                       "nginx": {_ANALYSIS_ID: []}}
+
+        result = retrieve_history(_ANALYSIS_ID, mock_database)
+
+        assert result == {"analysis": {_ANALYSIS_ID: ["snap"]}, "nginx": {_ANALYSIS_ID: []}}
+
+    def test_log_query_adds_filtered_records(self, mock_database, sample_analysis_db):
+        from src.resources.log.entity import LogQuery
+        from src.resources.utils import retrieve_history
+
+        db_row = sample_analysis_db(status=AnalysisStatus.STOPPED.value, log=_SAMPLE_LOG)
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
+        mock_database.query_log_records.return_value = {_ANALYSIS_ID: [{"log": "boom"}]}
+
+        result = retrieve_history(_ANALYSIS_ID, mock_database, None, LogQuery(level=["error"], since=5.0))
+
+        mock_database.query_log_records.assert_called_once_with([_ANALYSIS_ID], level=["error"], since=5.0, until=None)
+        assert result["logs"] == {_ANALYSIS_ID: [{"log": "boom"}]}
+
+    def test_unset_log_query_skips_records(self, mock_database, sample_analysis_db):
+        from src.resources.log.entity import LogQuery
+        from src.resources.utils import retrieve_history
+
+        db_row = sample_analysis_db(status=AnalysisStatus.STOPPED.value, log=_SAMPLE_LOG)
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
+
+        result = retrieve_history(_ANALYSIS_ID, mock_database, None, LogQuery())
+
+        assert "logs" not in result
+        mock_database.query_log_records.assert_not_called()
+
+    def test_purged_logs_reported_empty(self, mock_database, sample_analysis_db):
+        from src.resources.utils import retrieve_history
+
+        db_row = sample_analysis_db(status=AnalysisStatus.STOPPED.value, log=None)
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
+
+        result = retrieve_history(_ANALYSIS_ID, mock_database)
+
+        assert result == {"analysis": {_ANALYSIS_ID: []}, "nginx": {_ANALYSIS_ID: []}}
+
     def test_running_analysis_excluded(self, mock_database, sample_analysis_db):
         """A running (started) analysis is not included in history."""
         from src.resources.utils import retrieve_history
 
         db_row = sample_analysis_db(status=AnalysisStatus.STARTED.value)
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
 
         result = retrieve_history(_ANALYSIS_ID, mock_database)
 
@@ -164,18 +349,38 @@ class TestRetrieveHistory:
         from src.resources.utils import retrieve_history
 
         db_row = sample_analysis_db(status=AnalysisStatus.STOPPED.value, log=_SAMPLE_LOG)
-        mock_database.get_analysis_ids.return_value = [_ANALYSIS_ID]
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.query_analysis_ids.return_value = [_ANALYSIS_ID]
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: db_row}
 
         result = retrieve_history("all", mock_database)
 
-        mock_database.get_analysis_ids.assert_called_once()
+        mock_database.query_analysis_ids.assert_called_once_with(status=None,
+                                                                 project_id=None,
+                                                                 created_after=None,
+                                                                 limit=None,
+                                                                 offset=0,
+                                                                 include_archived=True)
         assert _ANALYSIS_ID in result["analysis"]
 
+    def test_all_analyses_forwards_query(self, mock_database):
+        from src.resources.analysis.entity import AnalysisQuery
+        from src.resources.utils import retrieve_history
+
+        mock_database.query_analysis_ids.return_value = []
+
+        retrieve_history("all", mock_database, AnalysisQuery(project_id="p1", limit=5, offset=10))
+
+        mock_database.query_analysis_ids.assert_called_once_with(status=None,
+                                                                 project_id="p1",
+                                                                 created_after=None,
+                                                                 limit=5,
+                                                                 offset=10,
+                                                                 include_archived=True)
+
     def test_not_found_excluded(self, mock_database):
         from src.resources.utils import retrieve_history
 
-        mock_database.get_latest_deployment.return_value = None
+        mock_database.get_latest_deployments.return_value = {}
 
         result = retrieve_history(_ANALYSIS_ID, mock_database)
 
@@ -193,7 +398,7 @@ class TestRetrieveLogs:
             status=AnalysisStatus.EXECUTING.value,
             deployment_name="analysis-analysis_id-0",
         )
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployment_summaries.return_value = {_ANALYSIS_ID: db_row}
 
         retrieve_logs(_ANALYSIS_ID, mock_database)
 
@@ -207,7 +412,7 @@ class TestRetrieveLogs:
         from src.resources.utils import retrieve_logs
 
         db_row = sample_analysis_db(status=AnalysisStatus.STARTED.value)
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployment_summaries.return_value = {_ANALYSIS_ID: db_row}
 
         retrieve_logs(_ANALYSIS_ID, mock_database)
 
@@ -218,12 +423,61 @@ class TestRetrieveLogs:
         from src.resources.utils import retrieve_logs
 
         db_row = sample_analysis_db(status=AnalysisStatus.EXECUTING.value)
-        mock_database.get_analysis_ids.return_value = [_ANALYSIS_ID]
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployment_summaries.return_value = {_ANALYSIS_ID: db_row}
 
         retrieve_logs("all", mock_database)
 
-        mock_database.get_analysis_ids.assert_called_once()
+        mock_database.get_latest_deployment_summaries.assert_called_once_with(None)
+        mock_database.get_latest_deployment.assert_not_called()
+
+
+# ─── open_log_stream ──────────────────────────────────────────────────────────
+
+class TestOpenLogStream:
+    @patch("src.resources.utils.open_pod_log_stream")
+    def test_analysis_source_uses_recorded_pods(self, mock_open, mock_database, sample_analysis_db):
+        from src.resources.utils import open_log_stream
+
+        mock_database.get_latest_deployment.return_value = sample_analysis_db(
+            deployment_name="analysis-analysis_id-0", namespace="ns"
+        )
+        mock_database.get_deployment_pod_ids.return_value = '["pod-1"]'
+
+        result = open_log_stream(_ANALYSIS_ID, mock_database, follow=True, tail_lines=5)
+
+        assert result is mock_open.return_value
+        mock_open.assert_called_once_with("analysis-analysis_id-0",
+                                          pod_ids='["pod-1"]',
+                                          namespace="ns",
+                                          follow=True,
+                                          tail_lines=5,
+                                          since_seconds=None)
+
+    @patch("src.resources.utils.open_pod_log_stream")
+    def test_nginx_source(self, mock_open, mock_database, sample_analysis_db):
+        from src.resources.utils import open_log_stream
+
+        mock_database.get_latest_deployment.return_value = sample_analysis_db(
+            deployment_name="analysis-analysis_id-0"
+        )
+
+        open_log_stream(_ANALYSIS_ID, mock_database, source="nginx", since_seconds=30)
+
+        mock_open.assert_called_once_with("nginx-analysis-analysis_id-0",
+                                          pod_ids=None,
+                                          namespace="default",
+                                          follow=False,
+                                          tail_lines=None,
+                                          since_seconds=30)
+
+    @patch("src.resources.utils.open_pod_log_stream")
+    def test_unknown_analysis_returns_none(self, mock_open, mock_database):
+        from src.resources.utils import open_log_stream
+
+        mock_database.get_latest_deployment.return_value = None
+
+        assert open_log_stream(_ANALYSIS_ID, mock_database) is None
+        mock_open.assert_not_called()
 
 
 # ─── get_status_and_progress ──────────────────────────────────────────────────
@@ -233,29 +487,31 @@ class TestGetStatusAndProgress:
         from src.resources.utils import get_status_and_progress
 
         db_row = sample_analysis_db(status="executing", progress=50)
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.get_latest_deployment_summaries.return_value = {_ANALYSIS_ID: db_row}
 
         result = get_status_and_progress(_ANALYSIS_ID, mock_database)
 
         assert result[_ANALYSIS_ID]["status"] == "executing"
         assert result[_ANALYSIS_ID]["progress"] == 50
+        mock_database.get_latest_deployment_summaries.assert_called_once_with([_ANALYSIS_ID], include_archived=True)
 
     def test_all_analyses(self, mock_database, sample_analysis_db):
         from src.resources.utils import get_status_and_progress
 
         db_row = sample_analysis_db(status="started")
-        mock_database.get_analysis_ids.return_value = [_ANALYSIS_ID]
-        mock_database.get_latest_deployment.return_value = db_row
+        mock_database.query_analysis_ids.return_value = [_ANALYSIS_ID]
+        mock_database.get_latest_deployment_summaries.return_value = {_ANALYSIS_ID: db_row}
 
         result = get_status_and_progress("all", mock_database)
 
-        mock_database.get_analysis_ids.assert_called_once()
+        mock_database.query_analysis_ids.assert_called_once()
+        mock_database.get_latest_deployment_summaries.assert_called_once_with([_ANALYSIS_ID], include_archived=False)
         assert _ANALYSIS_ID in result
 
     def test_not_found_excluded(self, mock_database):
         from src.resources.utils import get_status_and_progress
 
-        mock_database.get_latest_deployment.return_value = None
+        mock_database.get_latest_deployment_summaries.return_value = {}
 
         result = get_status_and_progress(_ANALYSIS_ID, mock_database)
 
@@ -268,21 +524,24 @@ class TestGetPods:
     def test_single_analysis(self, mock_database):
         from src.resources.utils import get_pods
 
-        mock_database.get_analysis_pod_ids.return_value = ["pod-1", "pod-2"]
+        mock_database.get_analyses_pod_ids.return_value = {_ANALYSIS_ID: ["pod-1", "pod-2"]}
 
         result = get_pods(_ANALYSIS_ID, mock_database)
 
+        mock_database.get_analyses_pod_ids.assert_called_once_with([_ANALYSIS_ID])
         assert result == {_ANALYSIS_ID: ["pod-1", "pod-2"]}
 
     def test_all_analyses(self, mock_database):
         from src.resources.utils import get_pods
 
-        mock_database.get_analysis_ids.return_value = [_ANALYSIS_ID]
-        mock_database.get_analysis_pod_ids.return_value = ["pod-1"]
+        mock_database.query_analysis_ids.return_value = [_ANALYSIS_ID, "other"]
+        mock_database.get_analyses_pod_ids.return_value = {_ANALYSIS_ID: ["pod-1"], "other": []}
 
         result = get_pods("all", mock_database)
 
-        mock_database.get_analysis_ids.assert_called_once()
+        mock_database.query_analysis_ids.assert_called_once()
+        mock_database.get_analyses_pod_ids.assert_called_once_with([_ANALYSIS_ID, "other"])
+        mock_database.get_analysis_pod_ids.assert_not_called()
         assert _ANALYSIS_ID in result
 
 
@@ -303,6 +562,8 @@ class TestStopAnalysis:
         # STARTED status is preserved to avoid signaling failure to partner nodes
         mock_deployment.stop.assert_called_once()
         assert mock_deployment.stop.call_args.kwargs["status"] == AnalysisStatus.STARTED.value
+        mock_database.store_log_snapshot.assert_called_once_with(_ANALYSIS_ID, {"analysis": {}, "nginx": {}})
+        assert mock_deployment.stop.call_args.kwargs["log"] == ""
         mock_hub.assert_called_once_with(_ANALYSIS_ID, AnalysisStatus.STARTED.value)
 
     @patch("src.resources.utils.init_hub_client_and_update_hub_status_with_client")
@@ -343,17 +604,17 @@ class TestStopAnalysis:
 
         mock_deployment = _analysis_mock(status=AnalysisStatus.STARTED.value)
         mock_read.return_value = mock_deployment
-        mock_database.get_analysis_ids.return_value = [_ANALYSIS_ID]
 
         result = stop_analysis("all", mock_database)
 
-        mock_database.get_analysis_ids.assert_called_once()
+        mock_database.get_latest_deployments.assert_called_once_with(None)
+        mock_database.get_latest_deployment.assert_not_called()
         assert _ANALYSIS_ID in result
 
     def test_not_found_returns_empty(self, mock_database):
         from src.resources.utils import stop_analysis
 
-        mock_database.get_latest_deployment.return_value = None
+        mock_database.get_latest_deployments.return_value = {}
 
         result = stop_analysis(_ANALYSIS_ID, mock_database)
 
@@ -363,6 +624,12 @@ class TestStopAnalysis:
 # ─── delete_analysis ──────────────────────────────────────────────────────────
 
 class TestDeleteAnalysis:
+    @pytest.fixture(autouse=True)
+    def mock_secrets(self):
+        """No per-credential pull secrets unless a test lists some."""
+        with patch("src.resources.utils.find_k8s_resources", return_value=[None]) as mock_find:
+            yield mock_find
+
     @patch("src.resources.utils.delete_keycloak_client")
     @patch("src.resources.utils.read_db_analysis")
     def test_stopped_analysis_also_stopped(self, mock_read, mock_keycloak, mock_database):
@@ -395,7 +662,7 @@ class TestDeleteAnalysis:
     def test_not_found_returns_empty(self, mock_database):
         from src.resources.utils import delete_analysis
 
-        mock_database.get_latest_deployment.return_value = None
+        mock_database.get_latest_deployments.return_value = {}
 
         result = delete_analysis(_ANALYSIS_ID, mock_database)
 
@@ -408,13 +675,62 @@ class TestDeleteAnalysis:
 
         mock_deployment = _analysis_mock(status=AnalysisStatus.STOPPED.value)
         mock_read.return_value = mock_deployment
-        mock_database.get_analysis_ids.return_value = [_ANALYSIS_ID]
 
         delete_analysis("all", mock_database)
 
-        mock_database.get_analysis_ids.assert_called_once()
+        mock_database.get_latest_deployments.assert_called_once_with(None, include_archived=True)
         mock_database.delete_analysis.assert_called_once_with(_ANALYSIS_ID)
 
+    @patch("src.resources.utils.delete_keycloak_client")
+    @patch("src.resources.utils.read_db_analysis")
+    def test_archived_analysis_removed_without_stop(self, mock_read, mock_keycloak, mock_database):
+        from src.resources.database.db_models import ArchiveDB
+        from src.resources.utils import delete_analysis
+
+        mock_database.get_latest_deployments.return_value = {_ANALYSIS_ID: ArchiveDB(analysis_id=_ANALYSIS_ID,
+                                                                                      status="executed")}
+
+        result = delete_analysis(_ANALYSIS_ID, mock_database)
+
+        assert result == {_ANALYSIS_ID: None}
+        mock_database.get_latest_deployments.assert_called_once_with([_ANALYSIS_ID], include_archived=True)
+        mock_read.assert_not_called()
+        mock_keycloak.assert_called_once_with(_ANALYSIS_ID)
+        mock_database.delete_analysis.assert_called_once_with(_ANALYSIS_ID)
+
+
+    @patch("src.resources.utils.delete_k8s_resource")
+    @patch("src.resources.utils.delete_keycloak_client")
+    @patch("src.resources.utils.read_db_analysis")
+    def test_unused_credential_secret_deleted(self, mock_read, mock_keycloak, mock_delete, mock_secrets,
+                                              mock_database):
+        from src.k8s.kubernetes import HARBOR_SECRET_NAME, harbor_secret_name
+        from src.resources.utils import delete_analysis
+
+        own_secret = harbor_secret_name("harbor.privateaim", "robot_user", "default_pw")
+        other_secret = harbor_secret_name("harbor.privateaim", "other_user", "other_pw")
+        mock_secrets.return_value = [HARBOR_SECRET_NAME, own_secret, other_secret]
+        mock_database.get_registry_credentials.return_value = set()
+
+        delete_analysis(_ANALYSIS_ID, mock_database)
+
+        mock_delete.assert_called_once_with(own_secret, "secret", namespace="default")
+
+    @patch("src.resources.utils.delete_k8s_resource")
+    @patch("src.resources.utils.delete_keycloak_client")
+    @patch("src.resources.utils.read_db_analysis")
+    def test_credential_secret_kept_while_in_use(self, mock_read, mock_keycloak, mock_delete, mock_secrets,
+                                                 mock_database):
+        from src.k8s.kubernetes import harbor_secret_name
+        from src.resources.utils import delete_analysis
+
+        mock_secrets.return_value = [harbor_secret_name("harbor.privateaim", "robot_user", "default_pw")]
+        mock_database.get_registry_credentials.return_value = {("harbor.privateaim", "robot_user", "default_pw")}
+
+        delete_analysis(_ANALYSIS_ID, mock_database)
+
+        mock_delete.assert_not_called()
+
 
 # ─── unstuck_analysis_deployments ─────────────────────────────────────────────
 
@@ -490,22 +806,25 @@ class TestCleanup:
         assert result["rs"] == "Reset storage service"
 
     @patch("src.resources.utils.clean_up_the_rest", return_value="")
-    @patch("src.resources.utils.delete_keycloak_client")
-    @patch("src.resources.utils._get_all_keycloak_clients")
+    @patch("src.resources.utils.delete_keycloak_clients", return_value=1)
+    @patch("src.resources.utils._get_flame_keycloak_clients")
     def test_keycloak_deletes_orphaned_clients(self, mock_get_clients, mock_delete, mock_cztr, mock_database):
         from src.resources.utils import cleanup
 
         mock_database.get_analysis_ids.return_value = ["existing_analysis"]
-        mock_get_clients.return_value = [
-            {"clientId": "orphaned_analysis", "name": "flame-orphaned_analysis"},
-            {"clientId": "existing_analysis", "name": "flame-existing_analysis"},
-            {"clientId": "non_flame_client", "name": "other-client"},
-        ]
+        mock_get_clients.return_value = iter([
+            {"id": "uuid-1", "clientId": "orphaned_analysis", "name": "flame-orphaned_analysis"},
+            {"id": "uuid-2", "clientId": "existing_analysis", "name": "flame-existing_analysis"},
+            {"id": "uuid-3", "clientId": "flame-pool-1234", "name": "flame-pool-1234"},
+        ])
 
-        cleanup("keycloak", mock_database)
+        result = cleanup("keycloak", mock_database)
 
-        # Only the orphaned flame client should be deleted; existing and non-flame skipped.
-        mock_delete.assert_called_once_with("orphaned_analysis")
+        # Only the orphaned flame client should be deleted; existing and pooled clients are skipped.
+        mock_delete.assert_called_once_with(
+            [{"id": "uuid-1", "clientId": "orphaned_analysis", "name": "flame-orphaned_analysis"}]
+        )
+        assert result["keycloak"] == "Deleted 1 orphaned keycloak clients"
 
     @patch("src.resources.utils.clean_up_the_rest", return_value="")
     def test_unknown_type_returns_error_message(self, mock_cztr, mock_database):
@@ -572,6 +891,23 @@ class TestCleanUpTheRest:
 
         mock_delete.assert_not_called()
 
+    @patch("src.resources.utils.delete_k8s_resource")
+    @patch("src.resources.utils.find_k8s_resources")
+    def test_deletes_unused_harbor_secrets(self, mock_find, mock_delete, mock_database):
+        from src.k8s.kubernetes import HARBOR_SECRET_NAME, harbor_secret_name
+        from src.resources.utils import clean_up_the_rest
+
+        used, unused = harbor_secret_name("h", "u1", "p1"), harbor_secret_name("h", "u2", "p2")
+        mock_find.side_effect = lambda res, *args, **kwargs: \
+            [HARBOR_SECRET_NAME, used, unused] if res == "secret" else [None]
+        mock_database.get_analysis_ids.return_value = []
+        mock_database.get_registry_credentials.return_value = {("h", "u1", "p1")}
+
+        result = clean_up_the_rest(mock_database)
+
+        mock_delete.assert_called_once_with(unused, "secret", namespace="default")
+        assert "Deleted 1 zombie harbor secrets" in result
+
     @patch("src.resources.utils.delete_k8s_resource")
     @patch("src.resources.utils.find_k8s_resources", return_value=[None])
     def test_handles_none_resources(self, mock_find, mock_delete, mock_database):
@@ -627,8 +963,23 @@ class TestStreamLogs:
         mock_database.update_analysis_log.assert_called_once()
         args, _ = mock_database.update_analysis_log.call_args
         assert args[0] == _ANALYSIS_ID
-        assert "test log message" in args[1]
-        assert "log_type=info" in args[1]
+        assert args[1]["log"] == "test log message"
+        assert args[1]["level"] == "info"
+        assert args[1]["status"] == "executing"
+        assert args[1]["progress"] == 50
+
+    def test_progress_buffer_defers_status_and_progress(self, mock_database, mock_hub_client):
+        from src.resources.utils import stream_logs
+
+        buffer = MagicMock()
+
+        with patch("src.resources.utils.update_hub_status") as mock_hub_update:
+            stream_logs(self._make_log_entity(progress=40), "node-id", False, mock_database, mock_hub_client, buffer)
+
+        mock_database.update_analysis_log.assert_called_once()
+        buffer.record.assert_called_once_with(_ANALYSIS_ID, "executing", 40)
+        mock_database.progress_valid.assert_not_called()
+        mock_hub_update.assert_not_called()
 
     def test_hub_logging_disabled_skips_hub_log(self, mock_database, mock_hub_client):
         from src.resources.utils import stream_logs
@@ -693,4 +1044,82 @@ class TestStreamLogs:
             mock_hub_client,
             "node_analysis_id",
             run_status="executing",
-        )
\ No newline at end of file
+        )
+
+
+# ─── stream_logs_batch ────────────────────────────────────────────────────────
+
+class TestStreamLogsBatch:
+    def _entity(self, analysis_id=_ANALYSIS_ID, log="line", progress=50, status="executing"):
+        return CreateLogEntity(analysis_id=analysis_id, log=log, log_type="info", status=status, progress=progress)
+
+    def test_one_write_and_status_update_per_analysis(self, mock_database, mock_hub_client):
+        from src.resources.utils import stream_logs_batch
+
+        mock_database.append_analysis_logs_batch.return_value = {_ANALYSIS_ID, "other"}
+        batch = [self._entity(log="l1", progress=10),
+                 self._entity(log="l2", progress=30),
+                 self._entity("other", log="o1", progress=5, status="started"),
+                 self._entity(log="l3", progress=20, status="executed")]
+
+        with patch("src.resources.utils.get_node_analysis_id", return_value="na") as mock_lookup:
+            with patch("src.resources.utils.update_hub_status") as mock_hub_update:
+                result = stream_logs_batch(batch, "node-id", False, mock_database, mock_hub_client)
+
+        assert result == {_ANALYSIS_ID: 3, "other": 1}
+        mock_database.append_analysis_logs_batch.assert_called_once()
+        logs, progress = mock_database.append_analysis_logs_batch.call_args.args
+        assert [record["log"] for record in logs[_ANALYSIS_ID]] == ["l1", "l2", "l3"]
+        assert [record["log"] for record in logs["other"]] == ["o1"]
+        assert progress == {_ANALYSIS_ID: 30, "other": 5}
+        assert mock_lookup.call_count == 2
+        mock_hub_update.assert_any_call(mock_hub_client, "na", run_status="executed", run_progress=30)
+        mock_hub_update.assert_any_call(mock_hub_client, "na", run_status="started", run_progress=5)
+        mock_database.update_analysis_log.assert_not_called()
+
+    def test_progress_not_advanced_skips_hub_progress(self, mock_database, mock_hub_client):
+        from src.resources.utils import stream_logs_batch
+
+        mock_database.append_analysis_logs_batch.return_value = set()
+
+        with patch("src.resources.utils.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.utils.update_hub_status") as mock_hub_update:
+                stream_logs_batch([self._entity()], "node-id", False, mock_database, mock_hub_client)
+
+        mock_hub_update.assert_called_once_with(mock_hub_client, "na", run_status="executing")
+
+    def test_out_of_range_progress_ignored(self, mock_database, mock_hub_client):
+        from src.resources.utils import stream_logs_batch
+
+        mock_database.append_analysis_logs_batch.return_value = set()
+
+        with patch("src.resources.utils.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.utils.update_hub_status"):
+                stream_logs_batch([self._entity(progress=150)], "node-id", False, mock_database, mock_hub_client)
+
+        assert mock_database.append_analysis_logs_batch.call_args.args[1] == {_ANALYSIS_ID: None}
+
+    def test_hub_logging_forwards_every_line(self, mock_database, mock_hub_client):
+        from src.resources.utils import stream_logs_batch
+
+        mock_database.append_analysis_logs_batch.return_value = set()
+
+        with patch("src.resources.utils.get_node_analysis_id", return_value="na"):
+            with patch("src.resources.utils.update_hub_status"):
+                stream_logs_batch([self._entity(log="a"), self._entity(log="b")],
+                                  "node-id", True, mock_database, mock_hub_client)
+
+        assert [c.kwargs["message"] for c in mock_hub_client.create_analysis_node_log.call_args_list] == ["a", "b"]
+
+    def test_progress_buffer_defers_status_and_progress(self, mock_database, mock_hub_client):
+        from src.resources.utils import stream_logs_batch
+
+        buffer = MagicMock()
+        batch = [self._entity(log="l1", progress=10), self._entity(log="l2", progress=30, status="executed")]
+
+        with patch("src.resources.utils.update_hub_status") as mock_hub_update:
+            stream_logs_batch(batch, "node-id", False, mock_database, mock_hub_client, buffer)
+
+        assert len(mock_database.append_analysis_logs_batch.call_args.args) == 1
+        buffer.record.assert_called_once_with(_ANALYSIS_ID, "executed", 30)
+        mock_hub_update.assert_not_called()
@@ -74,12 +74,12 @@ class TestDecideStatusAction:
 
 class TestGetAnalysisStatus:
     def test_not_found_returns_none(self, mock_database):
-        mock_database.get_latest_deployment.return_value = None
+        mock_database.get_latest_deployment_summary.return_value = None
         assert _get_analysis_status("analysis_id", mock_database) is None
 
     def test_already_executed_skips_internal_check(self, mock_database, sample_analysis_db):
         analysis = sample_analysis_db(status=AnalysisStatus.EXECUTED.value)
-        mock_database.get_latest_deployment.return_value = analysis
+        mock_database.get_latest_deployment_summary.return_value = analysis
 
         result = _get_analysis_status("analysis_id", mock_database)
 
@@ -89,7 +89,7 @@ class TestGetAnalysisStatus:
     @patch("src.status.status._get_internal_deployment_status")
     def test_found_non_executed_calls_internal_check(self, mock_internal, mock_database, sample_analysis_db):
         analysis = sample_analysis_db(status=AnalysisStatus.EXECUTING.value, deployment_name="dep-name")
-        mock_database.get_latest_deployment.return_value = analysis
+        mock_database.get_latest_deployment_summary.return_value = analysis
         mock_internal.return_value = AnalysisStatus.EXECUTING.value
 
         result = _get_analysis_status("analysis_id", mock_database)
@@ -172,7 +172,7 @@ class TestInformAnalysisOfPartnerStatuses:
     def test_success_returns_response_json(
         self, mock_client_cls, mock_get_partners, mock_database, mock_hub_client, sample_analysis_db
     ):
-        mock_database.get_latest_deployment.return_value = sample_analysis_db(deployment_name="analysis-id-0")
+        mock_database.get_latest_deployment_summary.return_value = sample_analysis_db(deployment_name="analysis-id-0")
         mock_get_partners.return_value = {"node-1": "running"}
         mock_response = MagicMock()
         mock_response.json.return_value = {"ok": True}
@@ -189,7 +189,7 @@ class TestInformAnalysisOfPartnerStatuses:
     def test_connect_error_returns_none(
         self, mock_client_cls, mock_get_partners, mock_database, mock_hub_client, sample_analysis_db
     ):
-        mock_database.get_latest_deployment.return_value = sample_analysis_db(deployment_name="analysis-id-0")
+        mock_database.get_latest_deployment_summary.return_value = sample_analysis_db(deployment_name="analysis-id-0")
         mock_get_partners.return_value = {}
         mock_client_cls.return_value.post.side_effect = ConnectError("refused")
 
@@ -204,7 +204,7 @@ class TestInformAnalysisOfPartnerStatuses:
     def test_connect_timeout_returns_none(
         self, mock_client_cls, mock_get_partners, mock_database, mock_hub_client, sample_analysis_db
     ):
-        mock_database.get_latest_deployment.return_value = sample_analysis_db(deployment_name="analysis-id-0")
+        mock_database.get_latest_deployment_summary.return_value = sample_analysis_db(deployment_name="analysis-id-0")
         mock_get_partners.return_value = {}
         mock_client_cls.return_value.post.side_effect = ConnectTimeout("timed out")
 
@@ -263,7 +263,7 @@ class TestFixStuckStatus:
 class TestUpdateRunningStatus:
     def test_updates_deployment_to_executing(self, mock_database, sample_analysis_db):
         analysis = sample_analysis_db(deployment_name="dep-name", status=AnalysisStatus.STARTED.value)
-        mock_database.get_latest_deployment.return_value = analysis
+        mock_database.get_latest_deployment_summary.return_value = analysis
 
         _update_running_status(
             mock_database,
@@ -273,7 +273,7 @@ class TestUpdateRunningStatus:
         mock_database.update_deployment_status.assert_called_once_with("dep-name", AnalysisStatus.EXECUTING.value)
 
     def test_no_update_when_deployment_not_found(self, mock_database):
-        mock_database.get_latest_deployment.return_value = None
+        mock_database.get_latest_deployment_summary.return_value = None
         _update_running_status(mock_database, {"analysis_id": "analysis_id"})
         mock_database.update_deployment_status.assert_not_called()
 
@@ -284,7 +284,7 @@ class TestUpdateFinishedStatus:
     @patch("src.status.status.delete_analysis")
     def test_executed_deletes_analysis(self, mock_delete, mock_database, sample_analysis_db):
         analysis = sample_analysis_db(deployment_name="dep-name")
-        mock_database.get_latest_deployment.return_value = analysis
+        mock_database.get_latest_deployment_summary.return_value = analysis
 
         _update_finished_status(
             mock_database,
@@ -297,7 +297,7 @@ class TestUpdateFinishedStatus:
     @patch("src.status.status.stop_analysis")
     def test_failed_stops_analysis(self, mock_stop, mock_database, sample_analysis_db):
         analysis = sample_analysis_db(deployment_name="dep-name")
-        mock_database.get_latest_deployment.return_value = analysis
+        mock_database.get_latest_deployment_summary.return_value = analysis
 
         _update_finished_status(
             mock_database,
@@ -319,6 +319,33 @@ class TestUpdateHubStatus:
         update_hub_status(mock_hub_client, "na-id", "started")
 
 
+# ─── TestUpdateHubStatusForAnalysis ───────────────────────────────────────────
+
+class TestUpdateHubStatusForAnalysis:
+    def test_looks_up_node_analysis_and_updates(self, mock_hub_client):
+        from src.utils.hub_client import update_hub_status_for_analysis
+
+        with (
+            patch("src.utils.hub_client.get_node_analysis_id", return_value="na-id") as mock_lookup,
+            patch("src.utils.hub_client.update_hub_status") as mock_update,
+        ):
+            update_hub_status_for_analysis(mock_hub_client, "node-id", "analysis-1", "started")
+
+        mock_lookup.assert_called_once_with(mock_hub_client, "analysis-1", "node-id")
+        mock_update.assert_called_once_with(mock_hub_client, "na-id", run_status="started")
+
+    def test_missing_node_analysis_skips_update(self, mock_hub_client):
+        from src.utils.hub_client import update_hub_status_for_analysis
+
+        with (
+            patch("src.utils.hub_client.get_node_analysis_id", return_value=None),
+            patch("src.utils.hub_client.update_hub_status") as mock_update,
+        ):
+            update_hub_status_for_analysis(mock_hub_client, "node-id", "analysis-1", "started")
+
+        mock_update.assert_not_called()
+
+
 # ─── TestGetPartnerNodeStatuses ───────────────────────────────────────────────
 
 class TestGetPartnerNodeStatuses:
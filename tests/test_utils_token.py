@@ -2,6 +2,33 @@ import pytest
 from unittest.mock import patch, MagicMock
 import requests
 
+from src.utils.token import _KEYCLOAK_TIMEOUT
+
+
+class TestKeycloakSession:
+    def test_session_mounts_pooled_adapter_with_retries(self):
+        from src.utils.token import _init_keycloak_session
+        session = _init_keycloak_session()
+        adapter = session.get_adapter("https://kc:8443")
+        assert adapter.max_retries.total >= 0
+        assert "GET" in adapter.max_retries.allowed_methods
+        assert "DELETE" in adapter.max_retries.allowed_methods
+        assert "POST" not in adapter.max_retries.allowed_methods
+
+    def test_token_request_passes_timeout(self):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"access_token": "tok"}
+
+        with (
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response) as mock_post,
+            patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
+            patch("src.utils.token._KEYCLOAK_REALM", "flame"),
+        ):
+            from src.utils.token import _get_keycloak_admin_token
+            _get_keycloak_admin_token()
+
+        assert mock_post.call_args[1]["timeout"] == _KEYCLOAK_TIMEOUT
+
 
 class TestCreateAnalysisTokens:
     def test_returns_both_keys(self):
@@ -20,7 +47,7 @@ class TestCreateAnalysisTokens:
         with patch("src.utils.token.get_keycloak_token", return_value="kc-abc") as mock_get:
             from src.utils.token import create_analysis_tokens
             result = create_analysis_tokens("tok", "aid")
-        mock_get.assert_called_once_with("aid")
+        mock_get.assert_called_once_with("aid", None)
         assert result["KEYCLOAK_TOKEN"] == "kc-abc"
 
 
@@ -31,7 +58,7 @@ class TestGetKeycloakToken:
 
         with (
             patch("src.utils.token._get_keycloak_client_secret", return_value="secret-123"),
-            patch("src.utils.token.requests.post", return_value=mock_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
         ):
             from src.utils.token import get_keycloak_token
@@ -43,7 +70,7 @@ class TestGetKeycloakToken:
         with (
             patch("src.utils.token._get_keycloak_client_secret", return_value="sec"),
             patch(
-                "src.utils.token.requests.post",
+                "src.utils.token._KEYCLOAK_SESSION.post",
                 side_effect=requests.exceptions.RequestException("conn refused"),
             ),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
@@ -59,7 +86,7 @@ class TestGetKeycloakToken:
 
         with (
             patch("src.utils.token._get_keycloak_client_secret", return_value="sec"),
-            patch("src.utils.token.requests.post", return_value=mock_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
         ):
             from src.utils.token import get_keycloak_token
@@ -75,7 +102,7 @@ class TestGetKeycloakToken:
 
         with (
             patch("src.utils.token._get_keycloak_client_secret", return_value="sec"),
-            patch("src.utils.token.requests.post", return_value=mock_response) as mock_post,
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response) as mock_post,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
         ):
             from src.utils.token import get_keycloak_token
@@ -91,7 +118,7 @@ class TestGetKeycloakAdminToken:
         mock_response.json.return_value = {"access_token": "admin-bearer"}
 
         with (
-            patch("src.utils.token.requests.post", return_value=mock_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -108,7 +135,7 @@ class TestGetKeycloakAdminToken:
         mock_response.json.return_value = {"access_token": "tok"}
 
         with (
-            patch("src.utils.token.requests.post", return_value=mock_response) as mock_post,
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response) as mock_post,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -127,7 +154,7 @@ class TestKeycloakClientExists:
         mock_response.json.return_value = [{"clientId": "analysis-1", "id": "uuid-1"}]
 
         with (
-            patch("src.utils.token.requests.get", return_value=mock_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -141,7 +168,7 @@ class TestKeycloakClientExists:
         mock_response.json.return_value = []
 
         with (
-            patch("src.utils.token.requests.get", return_value=mock_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -155,7 +182,7 @@ class TestKeycloakClientExists:
         mock_response.json.return_value = []
 
         with (
-            patch("src.utils.token.requests.get", return_value=mock_response) as mock_get,
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_response) as mock_get,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "testrealm"),
         ):
@@ -165,6 +192,7 @@ class TestKeycloakClientExists:
         mock_get.assert_called_once_with(
             "http://kc:8080/admin/realms/testrealm/clients?clientId=my-analysis",
             headers={"Authorization": "Bearer my-admin-token"},
+            timeout=_KEYCLOAK_TIMEOUT,
         )
 
 
@@ -173,7 +201,7 @@ class TestCreateKeycloakClient:
         mock_response = MagicMock()
 
         with (
-            patch("src.utils.token.requests.post", return_value=mock_response) as mock_post,
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response) as mock_post,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -191,6 +219,7 @@ class TestCreateKeycloakClient:
                 "name": "flame-analysis-abc",
                 "serviceAccountsEnabled": "true",
             },
+            timeout=_KEYCLOAK_TIMEOUT,
         )
 
     def test_raises_on_http_error(self):
@@ -198,7 +227,7 @@ class TestCreateKeycloakClient:
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("409")
 
         with (
-            patch("src.utils.token.requests.post", return_value=mock_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.post", return_value=mock_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -216,7 +245,7 @@ class TestGetKeycloakClientSecret:
             patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
             patch("src.utils.token._keycloak_client_exists", return_value=True),
             patch("src.utils.token._create_keycloak_client") as mock_create,
-            patch("src.utils.token.requests.get", return_value=mock_get_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_get_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -234,7 +263,7 @@ class TestGetKeycloakClientSecret:
             patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
             patch("src.utils.token._keycloak_client_exists", return_value=False),
             patch("src.utils.token._create_keycloak_client") as mock_create,
-            patch("src.utils.token.requests.get", return_value=mock_get_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_get_response),
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -253,9 +282,9 @@ class TestDeleteKeycloakClient:
 
         with (
             patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
-            patch("src.utils.token.requests.get", return_value=mock_get_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_get_response),
             patch(
-                "src.utils.token.requests.delete", return_value=mock_delete_response
+                "src.utils.token._KEYCLOAK_SESSION.delete", return_value=mock_delete_response
             ) as mock_delete,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
@@ -266,6 +295,7 @@ class TestDeleteKeycloakClient:
         mock_delete.assert_called_once_with(
             "http://kc:8080/admin/realms/flame/clients/uuid-abc",
             headers={"Authorization": "Bearer admin-tok"},
+            timeout=_KEYCLOAK_TIMEOUT,
         )
 
     def test_client_not_found_skips_delete(self):
@@ -274,8 +304,8 @@ class TestDeleteKeycloakClient:
 
         with (
             patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
-            patch("src.utils.token.requests.get", return_value=mock_get_response),
-            patch("src.utils.token.requests.delete") as mock_delete,
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_get_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.delete") as mock_delete,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
@@ -292,12 +322,215 @@ class TestDeleteKeycloakClient:
 
         with (
             patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
-            patch("src.utils.token.requests.get", return_value=mock_get_response),
-            patch("src.utils.token.requests.delete") as mock_delete,
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=mock_get_response),
+            patch("src.utils.token._KEYCLOAK_SESSION.delete") as mock_delete,
             patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
             patch("src.utils.token._KEYCLOAK_REALM", "flame"),
         ):
             from src.utils.token import delete_keycloak_client
             delete_keycloak_client("analysis-1")
 
-        mock_delete.assert_not_called()
\ No newline at end of file
+        mock_delete.assert_not_called()
+
+
+class TestGetFlameKeycloakClients:
+    def test_pages_until_short_page_and_filters_prefix(self):
+        page_1 = MagicMock()
+        page_1.json.return_value = [{"id": "u1", "clientId": "a1", "name": "flame-a1"},
+                                    {"id": "u2", "clientId": "other", "name": "other-client"}]
+        page_2 = MagicMock()
+        page_2.json.return_value = [{"id": "u3", "clientId": "a3", "name": "flame-a3"}]
+
+        with (
+            patch("src.utils.token._KEYCLOAK_SESSION.get", side_effect=[page_1, page_2]) as mock_get,
+            patch("src.utils.token._KEYCLOAK_PAGE_SIZE", 2),
+            patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
+            patch("src.utils.token._KEYCLOAK_REALM", "flame"),
+        ):
+            from src.utils.token import _get_flame_keycloak_clients
+            result = list(_get_flame_keycloak_clients("admin-tok"))
+
+        assert [c["clientId"] for c in result] == ["a1", "a3"]
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[0][1]["params"] == {"first": 0, "max": 2}
+        assert mock_get.call_args_list[1][1]["params"] == {"first": 2, "max": 2}
+
+    def test_handles_clients_without_name(self):
+        page = MagicMock()
+        page.json.return_value = [{"id": "u1", "clientId": "realm-management", "name": None}]
+
+        with (
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=page),
+            patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
+            patch("src.utils.token._KEYCLOAK_REALM", "flame"),
+        ):
+            from src.utils.token import _get_flame_keycloak_clients
+            assert list(_get_flame_keycloak_clients("admin-tok")) == []
+
+
+class TestDeleteKeycloakClients:
+    def test_deletes_by_listed_uuid_with_single_admin_token(self):
+        clients = [{"id": "uuid-1", "clientId": "a1"}, {"id": "uuid-2", "clientId": "a2"}]
+
+        with (
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok") as mock_admin,
+            patch("src.utils.token._KEYCLOAK_SESSION.get") as mock_get,
+            patch("src.utils.token._KEYCLOAK_SESSION.delete") as mock_delete,
+            patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
+            patch("src.utils.token._KEYCLOAK_REALM", "flame"),
+        ):
+            from src.utils.token import delete_keycloak_clients
+            result = delete_keycloak_clients(clients)
+
+        assert result == 2
+        mock_admin.assert_called_once()
+        mock_get.assert_not_called()
+        deleted_urls = sorted(call[0][0] for call in mock_delete.call_args_list)
+        assert deleted_urls == ["http://kc:8080/admin/realms/flame/clients/uuid-1",
+                                "http://kc:8080/admin/realms/flame/clients/uuid-2"]
+
+    def test_failed_deletion_is_not_counted(self):
+        failing = MagicMock()
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError("404")
+
+        with (
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
+            patch("src.utils.token._KEYCLOAK_SESSION.delete", side_effect=[MagicMock(), failing]),
+        ):
+            from src.utils.token import delete_keycloak_clients
+            result = delete_keycloak_clients([{"id": "uuid-1", "clientId": "a1"},
+                                              {"id": "uuid-2", "clientId": "a2"}])
+
+        assert result == 1
+
+    def test_empty_list_skips_admin_token(self):
+        with patch("src.utils.token._get_keycloak_admin_token") as mock_admin:
+            from src.utils.token import delete_keycloak_clients
+            assert delete_keycloak_clients([]) == 0
+        mock_admin.assert_not_called()
+
+
+class TestKeycloakClientPool:
+    def test_bind_on_empty_pool_returns_none(self):
+        from src.utils.token import KeycloakClientPool
+        pool = KeycloakClientPool(size=2)
+        assert pool.bind("analysis-1") is None
+
+    def test_bind_renames_pooled_client_and_returns_secret(self):
+        from src.utils.token import KeycloakClientPool
+        pool = KeycloakClientPool(size=2)
+        pool._clients.append(("uuid-1", "pool-secret"))
+
+        with (
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
+            patch("src.utils.token._KEYCLOAK_SESSION.put", return_value=MagicMock()) as mock_put,
+            patch("src.utils.token._KEYCLOAK_URL", "http://kc:8080"),
+            patch("src.utils.token._KEYCLOAK_REALM", "flame"),
+        ):
+            result = pool.bind("analysis-1")
+
+        assert result == "pool-secret"
+        assert pool.available() == 0
+        assert pool._refill_event.is_set()
+        mock_put.assert_called_once_with(
+            "http://kc:8080/admin/realms/flame/clients/uuid-1",
+            headers={"Authorization": "Bearer admin-tok", "Content-Type": "application/json"},
+            json={"clientId": "analysis-1", "name": "flame-analysis-1"},
+            timeout=_KEYCLOAK_TIMEOUT,
+        )
+
+    def test_failed_bind_returns_client_to_pool(self):
+        from src.utils.token import KeycloakClientPool
+        pool = KeycloakClientPool(size=2)
+        pool._clients.append(("uuid-1", "pool-secret"))
+        conflict = MagicMock()
+        conflict.raise_for_status.side_effect = requests.exceptions.HTTPError("409")
+
+        with (
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
+            patch("src.utils.token._KEYCLOAK_SESSION.put", return_value=conflict),
+        ):
+            result = pool.bind("analysis-1")
+
+        assert result is None
+        assert list(pool._clients) == [("uuid-1", "pool-secret")]
+        assert not pool._refill_event.is_set()  # nothing to refill, the client is back
+
+    def test_refill_creates_clients_until_full(self):
+        from src.utils.token import KeycloakClientPool
+        pool = KeycloakClientPool(size=2)
+        get_response = MagicMock()
+        get_response.json.side_effect = [[{"id": "uuid-1", "secret": "s1"}],
+                                         [{"id": "uuid-2", "secret": "s2"}]]
+
+        with (
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
+            patch("src.utils.token._create_keycloak_client") as mock_create,
+            patch("src.utils.token._KEYCLOAK_SESSION.get", return_value=get_response),
+        ):
+            pool._refill()
+
+        assert list(pool._clients) == [("uuid-1", "s1"), ("uuid-2", "s2")]
+        assert mock_create.call_count == 2
+        created_id = mock_create.call_args[0][1]
+        assert created_id.startswith("flame-pool-")
+        assert mock_create.call_args[1] == {"name": created_id}
+
+    def test_refill_thread_survives_unexpected_errors(self):
+        import threading
+        from src.utils.token import KeycloakClientPool
+        pool = KeycloakClientPool(size=1)
+        refilled = threading.Event()
+
+        with (
+            patch.object(pool, "_adopt", side_effect=[KeyError("secret"), None]),
+            patch.object(pool, "_refill", side_effect=refilled.set),
+            patch("src.utils.token.time.sleep") as mock_sleep,
+        ):
+            pool.start()
+            assert refilled.wait(2)
+        mock_sleep.assert_called_once()
+
+    def test_disabled_pool_does_not_start(self):
+        from src.utils.token import KeycloakClientPool
+        pool = KeycloakClientPool(size=0)
+        pool.start()
+        assert pool._thread is None
+
+    def test_create_analysis_tokens_prefers_pooled_client(self):
+        with (
+            patch("src.utils.token._KEYCLOAK_CLIENT_POOL.available", return_value=1),
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok"),
+            patch("src.utils.token._keycloak_client_exists", return_value=False),
+            patch("src.utils.token._KEYCLOAK_CLIENT_POOL.bind", return_value="pool-secret") as mock_bind,
+            patch("src.utils.token._request_keycloak_token", return_value="kc-pooled") as mock_request,
+            patch("src.utils.token.get_keycloak_token") as mock_get,
+        ):
+            from src.utils.token import create_analysis_tokens
+            result = create_analysis_tokens("kong", "analysis-1")
+
+        mock_bind.assert_called_once_with("analysis-1", "admin-tok")
+        mock_request.assert_called_once_with("analysis-1", "pool-secret")
+        mock_get.assert_not_called()
+        assert result["KEYCLOAK_TOKEN"] == "kc-pooled"
+
+    def test_restarted_analysis_keeps_existing_client(self):
+        with (
+            patch("src.utils.token._KEYCLOAK_CLIENT_POOL.available", return_value=1),
+            patch("src.utils.token._get_keycloak_admin_token", return_value="admin-tok") as mock_admin,
+            patch("src.utils.token._keycloak_client_exists", return_value=True),
+            patch("src.utils.token._KEYCLOAK_CLIENT_POOL.bind") as mock_bind,
+            patch("src.utils.token.get_keycloak_token", return_value="kc-own") as mock_get,
+        ):
+            from src.utils.token import create_analysis_tokens
+            result = create_analysis_tokens("kong", "analysis-1")
+
+        mock_bind.assert_not_called()
+        mock_admin.assert_called_once()
+        mock_get.assert_called_once_with("analysis-1", "admin-tok")
+        assert result["KEYCLOAK_TOKEN"] == "kc-own"
+
+    def test_is_pool_client(self):
+        from src.utils.token import is_pool_client
+        assert is_pool_client({"clientId": "flame-pool-1234"})
+        assert not is_pool_client({"clientId": "analysis-1"})